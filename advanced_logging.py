@@ -8,9 +8,18 @@ import os
 import sys
 import io
 import asyncio
+import time
+from collections import deque
+from console_buffer import console_buffer
+from global_log_channels import global_log_channels
+from log_dispatcher import log_dispatcher
+from message_store import message_store, MESSAGE_STORE_GUILD_BYTES
+from log_webhooks import log_webhooks
 
-# Global console output queue
-console_output_queue = asyncio.Queue() if asyncio.get_event_loop() else None
+# Live console: flush interval, Discord sends allowed per minute, characters per embed
+CONSOLE_FLUSH_SECONDS = float(os.getenv('CONSOLE_FLUSH_SECONDS', '2'))
+CONSOLE_SENDS_PER_MINUTE = int(os.getenv('CONSOLE_SENDS_PER_MINUTE', '20'))
+CONSOLE_EMBED_CHARS = 4000
 
 LOG_CHANNEL_TYPES = [
     "general", "moderation", "security",
@@ -22,9 +31,15 @@ LOG_CHANNEL_TYPES = [
 
 GLOBAL_LOG_TYPES = ["live-console", "dm-sent", "command-errors", "system-log"]
 
-async def create_log_channels(guild, category):
-    """Auto-create all log channels in a category"""
+async def create_log_channels(guild, category, use_webhooks=True):
+    """Auto-create all log channels in a category (each with a delivery webhook unless disabled)"""
     created_channels = {}
+    avatar = None
+    if use_webhooks:
+        try:
+            avatar = await guild.me.display_avatar.read()
+        except Exception:
+            pass
     for channel_type in LOG_CHANNEL_TYPES:
         try:
             channel = await guild.create_text_channel(
@@ -33,6 +48,8 @@ async def create_log_channels(guild, category):
                 topic=f"RXT ENGINE {channel_type.title()} Logs"
             )
             created_channels[channel_type] = str(channel.id)
+            if use_webhooks:
+                await log_webhooks.create(channel, avatar)
         except Exception as e:
             print(f"Error creating {channel_type} channel: {e}")
     return created_channels
@@ -83,86 +100,112 @@ async def initialize_global_logging():
         else:
             print(f"✅ All global log channels exist in category {global_category_id}")
         
+        # Load guild -> per-server channel mappings once
+        await global_log_channels.load(db)
+
         # Start console output logging task
-        asyncio.create_task(console_output_logger())
+        start_console_output_logger()
             
     except Exception as e:
         print(f"❌ Error initializing global logging: {e}")
 
+_console_logger_task = None
+
 async def console_output_logger():
-    """Background task to process and log console outputs"""
-    buffer = []
-    last_send_time = datetime.now()
-    
+    """Single consumer of console_buffer: packs lines into embeds within the sends-per-minute budget"""
+    send_times = deque()
+
     while True:
         try:
-            await asyncio.sleep(2)  # Check every 2 seconds
-            
-            if buffer:
-                # Batch send buffered outputs every 2 seconds or when buffer is full
-                combined = "\n".join(buffer[:5])
-                await log_console_output(combined)
-                buffer = buffer[5:] if len(buffer) > 5 else []
-                last_send_time = datetime.now()
-                
+            await asyncio.sleep(CONSOLE_FLUSH_SECONDS)
+
+            while len(console_buffer):
+                now = time.monotonic()
+                while send_times and now - send_times[0] >= 60:
+                    send_times.popleft()
+                if len(send_times) >= CONSOLE_SENDS_PER_MINUTE:
+                    break  # Over budget - keep buffering; the ring buffer drops the oldest lines
+
+                if not await log_console_output(console_buffer.take(CONSOLE_EMBED_CHARS)):
+                    # No live-console channel - don't let output pile up for nothing
+                    console_buffer.discard()
+                    break
+                send_times.append(now)
+
         except Exception as e:
             print(f"Console logger error: {e}")
 
-def queue_console_output(message):
-    """Queue console output to be logged"""
-    try:
-        if message and message.strip():
-            asyncio.create_task(log_console_output(message))
-    except Exception as e:
-        print(f"Failed to queue console output: {e}")
+def start_console_output_logger():
+    """Start the live-console consumer once"""
+    global _console_logger_task
+    if _console_logger_task is None or _console_logger_task.done():
+        _console_logger_task = asyncio.create_task(console_output_logger())
+    return _console_logger_task
 
 async def get_or_create_server_channel(global_category, guild):
     """Get or create per-server channel in global category"""
+    channel = global_log_channels.server_channel(bot, guild.id)
+    if channel:
+        return channel
+
+    # One lookup/creation per guild at a time - concurrent log calls wait and reuse the result
+    lock = global_log_channels.creation_lock(guild.id)
     try:
-        # Check if we already have this channel stored in database
-        if db is not None:
-            server_data = await db.global_logging.find_one({'guild_id': str(guild.id)})
-            if server_data and server_data.get('log_channel_id'):
-                try:
-                    channel = bot.get_channel(int(server_data['log_channel_id']))
-                    if channel:
-                        return channel
-                except:
-                    pass
-        
-        server_channel_name = f"server-{guild.name[:25]}".lower().replace(" ", "-").replace("'", "").replace("ᴀ", "a").replace("ᴡ", "w").replace("ᴅ", "d").replace("ᴇ", "e").replace("ɴ", "n").replace("'", "")
-        
-        # Look for any existing channel with similar name
-        for ch in global_category.text_channels:
-            if ch.topic and str(guild.id) in ch.topic:
-                # Found existing channel for this server
+        async with lock:
+            try:
+                channel = global_log_channels.server_channel(bot, guild.id)
+                if channel:
+                    return channel
+
+                # Registry not loaded yet (early startup) - fall back to the stored mapping
+                if db is not None and not global_log_channels.loaded:
+                    server_data = await db.global_logging.find_one({'guild_id': str(guild.id)})
+                    if server_data and server_data.get('log_channel_id'):
+                        try:
+                            channel = bot.get_channel(int(server_data['log_channel_id']))
+                            if channel:
+                                global_log_channels.set_server_channel(guild.id, channel.id)
+                                return channel
+                        except (TypeError, ValueError):
+                            pass
+            
+                server_channel_name = f"server-{guild.name[:25]}".lower().replace(" ", "-").replace("'", "").replace("ᴀ", "a").replace("ᴡ", "w").replace("ᴅ", "d").replace("ᴇ", "e").replace("ɴ", "n").replace("'", "")
+            
+                # Look for any existing channel with similar name
+                for ch in global_category.text_channels:
+                    if ch.topic and str(guild.id) in ch.topic:
+                        # Found existing channel for this server
+                        if db is not None:
+                            await db.global_logging.update_one(
+                                {'guild_id': str(guild.id)},
+                                {'$set': {'log_channel_id': str(ch.id), 'guild_name': guild.name}},
+                                upsert=True
+                            )
+                        global_log_channels.set_server_channel(guild.id, ch.id)
+                        return ch
+            
+                # Create new channel if doesn't exist
+                server_channel = await global_category.create_text_channel(
+                    name=server_channel_name,
+                    topic=f"Logs for {guild.name} (ID: {guild.id})"
+                )
+                global_log_channels.set_server_channel(guild.id, server_channel.id)
+            
+                # Store in database
                 if db is not None:
                     await db.global_logging.update_one(
                         {'guild_id': str(guild.id)},
-                        {'$set': {'log_channel_id': str(ch.id), 'guild_name': guild.name}},
+                        {'$set': {'log_channel_id': str(server_channel.id), 'guild_name': guild.name}},
                         upsert=True
                     )
-                return ch
-        
-        # Create new channel if doesn't exist
-        server_channel = await global_category.create_text_channel(
-            name=server_channel_name,
-            topic=f"Logs for {guild.name} (ID: {guild.id})"
-        )
-        
-        # Store in database
-        if db is not None:
-            await db.global_logging.update_one(
-                {'guild_id': str(guild.id)},
-                {'$set': {'log_channel_id': str(server_channel.id), 'guild_name': guild.name}},
-                upsert=True
-            )
-        
-        print(f"✅ Created global per-server channel: {server_channel_name}")
-        return server_channel
-    except Exception as e:
-        print(f"❌ Error getting/creating server channel: {e}")
-        return None
+            
+                print(f"✅ Created global per-server channel: {server_channel_name}")
+                return server_channel
+            except Exception as e:
+                print(f"❌ Error getting/creating server channel: {e}")
+                return None
+    finally:
+        global_log_channels.release_creation_lock(guild.id)
 
 async def send_global_log(log_type, message, guild=None):
     """Send ALL server logs to bot owner's central global logging category - creates per-server channels"""
@@ -194,7 +237,7 @@ async def send_global_log(log_type, message, guild=None):
         embed.set_footer(text=f"{BOT_FOOTER} • {guild.name}", icon_url=bot.user.display_avatar.url)
         
         try:
-            await server_channel.send(embed=embed)
+            log_dispatcher.submit(server_channel, embed)
         except Exception as e:
             print(f"Error sending per-server global log: {e}")
             
@@ -213,7 +256,7 @@ async def log_dm_received(user, message_content, guild=None):
             return
         
         # Get dm-received channel
-        dm_channel = discord.utils.get(global_category.text_channels, name="dm-received")
+        dm_channel = global_log_channels.named_channel(bot, "dm-received")
         if not dm_channel:
             return
         
@@ -228,7 +271,7 @@ async def log_dm_received(user, message_content, guild=None):
         embed.set_footer(text=f"{BOT_FOOTER} • DM Received", icon_url=bot.user.display_avatar.url)
         
         try:
-            await dm_channel.send(embed=embed)
+            log_dispatcher.submit(dm_channel, embed)
         except Exception as e:
             print(f"Error logging DM received: {e}")
             
@@ -247,7 +290,7 @@ async def log_dm_sent(recipient, message_content, guild=None):
             return
         
         # Always log to dm-sent channel
-        dm_channel = discord.utils.get(global_category.text_channels, name="dm-sent")
+        dm_channel = global_log_channels.named_channel(bot, "dm-sent")
         if dm_channel:
             embed = discord.Embed(
                 title="💬 **DM Sent**",
@@ -259,7 +302,7 @@ async def log_dm_sent(recipient, message_content, guild=None):
             embed.set_footer(text=f"{BOT_FOOTER} • DM Sent", icon_url=bot.user.display_avatar.url)
             
             try:
-                await dm_channel.send(embed=embed)
+                log_dispatcher.submit(dm_channel, embed)
             except Exception as e:
                 print(f"Error logging DM sent to dm-sent channel: {e}")
         
@@ -283,7 +326,7 @@ async def log_dm_sent(recipient, message_content, guild=None):
                         embed.add_field(name="📝 Message Content", value=f"```{message_content[:500]}```" if message_content else "No message content", inline=False)
                         embed.add_field(name="🏢 Server", value=f"**{guild.name}**\n`{guild.id}`", inline=True)
                         embed.set_footer(text=f"{BOT_FOOTER} • DM Sent from Server", icon_url=bot.user.display_avatar.url)
-                        await comm_channel.send(embed=embed)
+                        log_dispatcher.submit(comm_channel, embed)
                 except Exception as e:
                     print(f"Error logging DM sent to per-server communication channel: {e}")
             
@@ -301,7 +344,7 @@ async def log_dm_sent(recipient, message_content, guild=None):
                 embed.set_footer(text=f"{BOT_FOOTER} • DM Sent", icon_url=bot.user.display_avatar.url)
                 
                 try:
-                    await server_channel.send(embed=embed)
+                    log_dispatcher.submit(server_channel, embed)
                 except Exception as e:
                     print(f"Error logging DM sent to global server channel: {e}")
             
@@ -336,12 +379,12 @@ async def log_command_error(error_message, command_name=None, user=None, guild=N
                 embed.set_footer(text=f"{BOT_FOOTER} • Command Error", icon_url=bot.user.display_avatar.url)
                 
                 try:
-                    await server_channel.send(embed=embed)
+                    log_dispatcher.submit(server_channel, embed)
                 except Exception as e:
                     print(f"Error logging command error to server channel: {e}")
         
         # Also log to command-errors channel
-        error_channel = discord.utils.get(global_category.text_channels, name="command-errors")
+        error_channel = global_log_channels.named_channel(bot, "command-errors")
         if error_channel:
             embed = discord.Embed(
                 title="⚠️ **Command Error**",
@@ -358,7 +401,7 @@ async def log_command_error(error_message, command_name=None, user=None, guild=N
             embed.set_footer(text=f"{BOT_FOOTER} • Command Error", icon_url=bot.user.display_avatar.url)
             
             try:
-                await error_channel.send(embed=embed)
+                log_dispatcher.submit(error_channel, embed)
             except Exception as e:
                 print(f"Error logging to command-errors channel: {e}")
             
@@ -389,12 +432,12 @@ async def log_system_message(message_text, guild=None):
                 embed.set_footer(text=f"{BOT_FOOTER} • System", icon_url=bot.user.display_avatar.url)
                 
                 try:
-                    await server_channel.send(embed=embed)
+                    log_dispatcher.submit(server_channel, embed)
                 except Exception as e:
                     print(f"Error logging system message to server channel: {e}")
         
         # Also log to system-log channel
-        system_channel = discord.utils.get(global_category.text_channels, name="system-log")
+        system_channel = global_log_channels.named_channel(bot, "system-log")
         if system_channel:
             embed = discord.Embed(
                 title="⚙️ **System Log**",
@@ -407,7 +450,7 @@ async def log_system_message(message_text, guild=None):
             embed.set_footer(text=f"{BOT_FOOTER} • System", icon_url=bot.user.display_avatar.url)
             
             try:
-                await system_channel.send(embed=embed)
+                log_dispatcher.submit(system_channel, embed)
             except Exception as e:
                 print(f"Error logging to system-log channel: {e}")
             
@@ -415,23 +458,23 @@ async def log_system_message(message_text, guild=None):
         print(f"System logging error: {e}")
 
 async def log_console_output(output_text):
-    """Log console output to live-console channel"""
+    """Log console output to live-console channel. Returns False when there is no channel to send to."""
     try:
         global_category_id = os.getenv('GLOBAL_LOG_CATEGORY_ID')
         if not global_category_id:
-            return
+            return False
         
         global_category = bot.get_channel(int(global_category_id))
         if not global_category or not isinstance(global_category, discord.CategoryChannel):
-            return
+            return False
         
-        live_console = discord.utils.get(global_category.text_channels, name="live-console")
+        live_console = global_log_channels.named_channel(bot, "live-console")
         if not live_console:
-            return
+            return False
         
         # Truncate long outputs
-        if len(output_text) > 1000:
-            output_text = output_text[:1000] + "\n... (truncated)"
+        if len(output_text) > CONSOLE_EMBED_CHARS:
+            output_text = output_text[:CONSOLE_EMBED_CHARS] + "\n... (truncated)"
         
         embed = discord.Embed(
             description=f"```{output_text}```",
@@ -444,9 +487,11 @@ async def log_console_output(output_text):
             await live_console.send(embed=embed)
         except Exception as e:
             print(f"Error logging to live-console: {e}")
+        return True
             
     except Exception as e:
         print(f"Console logging error: {e}")
+        return True
 
 @bot.tree.command(name="log-channel", description="Set single log channel for all server logs")
 @app_commands.describe(channel="Channel to send all logs to")
@@ -473,9 +518,34 @@ async def log_channel(interaction: discord.Interaction, channel: discord.TextCha
     embed.set_footer(text=BOT_FOOTER)
     await interaction.response.send_message(embed=embed)
 
+@bot.tree.command(name="message-store", description="Keep recent message content so deletes/edits of old messages are logged")
+@app_commands.describe(enabled="Store recent message content for delete/edit logs")
+async def message_store_command(interaction: discord.Interaction, enabled: bool):
+    """Opt this server in or out of the compact message content store"""
+    if not await has_permission(interaction, "main_moderator"):
+        await interaction.response.send_message("❌ You need Main Moderator permissions!", ephemeral=True)
+        return
+    
+    await update_server_data(interaction.guild.id, {'message_store_enabled': enabled})
+    if not enabled:
+        message_store.discard_guild(interaction.guild.id)
+    
+    if enabled:
+        description = (f"**◆ Status:** Enabled\n**◆ Budget:** {MESSAGE_STORE_GUILD_BYTES // 1024} KiB of recent messages\n\n"
+                       "*Deleted and edited messages are logged with their content even after they leave the bot's cache*")
+    else:
+        description = "**◆ Status:** Disabled\n\n*Stored message content for this server has been erased*"
+    embed = discord.Embed(
+        title="🗄️ **Message Store Updated**",
+        description=description,
+        color=BrandColors.SUCCESS if enabled else BrandColors.WARNING
+    )
+    embed.set_footer(text=BOT_FOOTER)
+    await interaction.response.send_message(embed=embed)
+
 @bot.tree.command(name="log-category", description="Auto-create organized log channels in a category")
-@app_commands.describe(category="Category to create log channels in")
-async def log_category(interaction: discord.Interaction, category: discord.CategoryChannel):
+@app_commands.describe(category="Category to create log channels in", webhooks="Deliver logs through per-channel webhooks (keeps log volume off the bot's rate limits)")
+async def log_category(interaction: discord.Interaction, category: discord.CategoryChannel, webhooks: bool = True):
     """Auto-create all log channels in a category"""
     if not await has_permission(interaction, "main_moderator"):
         await interaction.response.send_message("❌ You need Main Moderator permissions!", ephemeral=True)
@@ -488,7 +558,7 @@ async def log_category(interaction: discord.Interaction, category: discord.Categ
             await interaction.followup.send("❌ Category must be in this server!", ephemeral=True)
             return
         
-        created = await create_log_channels(interaction.guild, category)
+        created = await create_log_channels(interaction.guild, category, use_webhooks=webhooks)
         
         await update_server_data(interaction.guild.id, {
             'organized_log_channels': created,
@@ -8,6 +8,9 @@ from google import genai
 from google.genai import types
 
 from brand_config import BrandColors, BOT_FOOTER, VisualElements, create_info_embed, create_error_embed as brand_error_embed, create_warning_embed
+from bot_logging import get_logger
+
+log = get_logger('ai_chat')
 
 # IMPORTANT: KEEP THIS COMMENT
 # Integration: blueprint:python_gemini
@@ -135,14 +138,14 @@ async def get_ai_response(prompt: str) -> str:
             print(f"❌ [AI TEXT ERROR] Gemini client is None")
             return "**✗ AI CORE OFFLINE**\nThe quantum AI core is currently unavailable. Please contact a server admin."
         
-        print(f"💬 [AI TEXT] Calling Gemini API for text generation...")
+        log.debug("💬 [AI TEXT] Calling Gemini API for text generation...")
         response = gemini_client.models.generate_content(
             model="gemini-2.5-flash",
             contents=prompt
         )
         
         result = response.text or "I couldn't generate a response. Please try again."
-        print(f"✅ [AI TEXT] Got response: {result[:100]}...")
+        log.debug("✅ [AI TEXT] Got response: %.100s...", result)
         return result
     except Exception as e:
         error_str = str(e)
@@ -225,29 +228,29 @@ async def handle_ai_message(message):
     
     # Check if AI is enabled for this server
     if db is None:
-        print(f"⚠️ [AI CHAT] DB is None, skipping message from {message.author}")
+        log.warning("⚠️ [AI CHAT] DB is None, skipping message from %s", message.author, sample=100)
         return
     
     try:
         ai_settings = await db.ai_settings.find_one({'guild_id': str(message.guild.id)})
-        print(f"🔍 [AI CHAT DEBUG] Guild ID: {message.guild.id}, Channel ID: {message.channel.id}, AI Settings: {ai_settings}")
+        log.debug("🔍 [AI CHAT DEBUG] Guild ID: %s, Channel ID: %s, AI channel: %s", message.guild.id, message.channel.id, ai_settings.get('ai_channel_id') if ai_settings else None, sample=100)
         
         # No AI channel set
         if not ai_settings or not ai_settings.get('ai_channel_id'):
-            print(f"⚠️ [AI CHAT] No AI settings found for guild {message.guild.id}")
+            log.debug("⚠️ [AI CHAT] No AI settings found for guild %s", message.guild.id, sample=1000)
             return
         
         # Check if message is in the AI channel
         if str(message.channel.id) != ai_settings.get('ai_channel_id'):
-            print(f"⚠️ [AI CHAT] Message in wrong channel: {message.channel.id} != {ai_settings.get('ai_channel_id')}")
+            log.debug("⚠️ [AI CHAT] Message in wrong channel: %s != %s", message.channel.id, ai_settings.get('ai_channel_id'), sample=1000)
             return
         
-        print(f"✅ [AI CHAT] Processing message in AI channel: {message.content[:100]}")
-        print(f"🔍 [AI CHAT] Gemini client status: {gemini_client is not None}")
+        log.info("✅ [AI CHAT] Processing message in AI channel: %.100s", message.content)
+        log.debug("🔍 [AI CHAT] Gemini client status: %s", gemini_client is not None)
         
         # Check if Gemini client is initialized
         if not gemini_client:
-            print(f"❌ [AI CHAT] Gemini client is None!")
+            log.error("❌ [AI CHAT] Gemini client is None!")
             embed = discord.Embed(
                 title="✗ AI SERVICE OFFLINE",
                 description=f"The AI core is currently unavailable.\n\n**Action Required:** Server admin needs to configure the API key.\n{VisualElements.CIRCUIT_LINE}",
@@ -261,7 +264,7 @@ async def handle_ai_message(message):
         async with message.channel.typing():
             # Check if this is an image generation request
             if is_image_request(message.content):
-                print(f"🎨 [AI CHAT] Detected image request: {message.content[:50]}")
+                log.debug("🎨 [AI CHAT] Detected image request: %.50s", message.content)
                 # Image generation disabled - show simple themed message
                 embed = discord.Embed(
                     title="◆ IMAGE GENERATION UNAVAILABLE",
@@ -269,12 +272,12 @@ async def handle_ai_message(message):
                 )
                 embed.set_footer(text=BOT_FOOTER)
                 await message.reply(embed=embed)
-                print(f"🎨 [AI CHAT] Sent unavailable message for image request")
+                log.debug("🎨 [AI CHAT] Sent unavailable message for image request")
             else:
                 # Generate text response
-                print(f"💬 [AI CHAT] Generating text response for: {message.content[:50]}")
+                log.debug("💬 [AI CHAT] Generating text response for: %.50s", message.content)
                 response_text = await get_ai_response(message.content)
-                print(f"💬 [AI CHAT] Got response ({len(response_text)} chars): {response_text[:100]}...")
+                log.debug("💬 [AI CHAT] Got response (%d chars): %.100s...", len(response_text), response_text)
                 
                 # Split response if too long (Discord limit is 2000 chars)
                 if len(response_text) > 2000:
@@ -282,10 +285,10 @@ async def handle_ai_message(message):
                     chunks = [response_text[i:i+2000] for i in range(0, len(response_text), 2000)]
                     for chunk in chunks:
                         await message.reply(chunk)
-                    print(f"✅ [AI CHAT] Sent {len(chunks)} message chunks")
+                    log.debug("✅ [AI CHAT] Sent %d message chunks", len(chunks))
                 else:
                     await message.reply(response_text)
-                    print(f"✅ [AI CHAT] Sent text response")
+                    log.debug("✅ [AI CHAT] Sent text response")
                 
                 # Log the interaction
                 await log_action(
@@ -306,7 +309,7 @@ async def handle_ai_message(message):
                     pass
                     
     except Exception as e:
-        print(f"❌ [AI CHAT ERROR] {e}")
+        log.error("❌ [AI CHAT ERROR] %s", e)
         embed = discord.Embed(
             title="✗ PROCESSING ERROR",
             description=f"The quantum core encountered an anomaly while processing your request.\n\nPlease try again.\n{VisualElements.CIRCUIT_LINE}",
@@ -0,0 +1,174 @@
+"""Shared audit-log feed for RXT Security - resolves who did what from memory instead of per-event API calls"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+# Entries older than this are never matched (an unrelated earlier action is not the actor)
+AUDIT_FEED_WINDOW = float(os.getenv('AUDIT_FEED_WINDOW', '30'))
+AUDIT_FEED_MAX_PER_GUILD = 500
+# How long a listener waits for the gateway entry before polling
+AUDIT_FEED_WAIT = float(os.getenv('AUDIT_FEED_WAIT', '2'))
+# An entry may predate the event it explains by gateway latency plus clock skew, no more
+AUDIT_EVENT_SKEW = float(os.getenv('AUDIT_EVENT_SKEW', '5'))
+# One audit_logs() call per guild per interval serves every waiting listener
+AUDIT_POLL_INTERVAL = 1.0
+AUDIT_POLL_LIMIT = 50
+
+
+class _GuildFeed:
+    __slots__ = ('entries', 'index', 'waiters', 'poll_lock', 'last_poll')
+
+    def __init__(self):
+        self.entries = OrderedDict()  # entry id -> (created timestamp, entry), oldest first
+        self.index = {}  # (action, target_id) and (action, None) -> newest entry
+        self.waiters = {}  # (action, target_id) -> [(earliest created timestamp, future)]
+        self.poll_lock = asyncio.Lock()
+        self.last_poll = 0.0
+
+
+def _target_id(entry):
+    target = getattr(entry, 'target', None)
+    return getattr(target, 'id', None)
+
+
+def _entry_time(entry):
+    created_at = getattr(entry, 'created_at', None)
+    return created_at.timestamp() if created_at is not None else time.time()
+
+
+class AuditLogFeed:
+    """Per-guild window of recent audit-log entries, indexed by action and target ID.
+
+    Entries arrive through the gateway (on_audit_log_entry_create). A listener that
+    asks before its entry has arrived waits up to AUDIT_FEED_WAIT seconds for it, then
+    falls back to polling guild.audit_logs(); polls are serialised per guild and
+    rate-limited, so a burst of 50 deletes costs a handful of API calls at most.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+        self.gateway_entries = 0
+        self.hits = 0
+        self.waits = 0
+        self.polls = 0
+        self.misses = 0
+
+    def _feed(self, guild_id):
+        feed = self._guilds.get(guild_id)
+        if feed is None:
+            feed = self._guilds[guild_id] = _GuildFeed()
+        return feed
+
+    def _prune(self, feed, now):
+        cutoff = now - AUDIT_FEED_WINDOW
+        while feed.entries:
+            entry_id, (seen_at, entry) = next(iter(feed.entries.items()))
+            if seen_at >= cutoff and len(feed.entries) <= AUDIT_FEED_MAX_PER_GUILD:
+                break
+            del feed.entries[entry_id]
+            for key in ((entry.action, _target_id(entry)), (entry.action, None)):
+                if feed.index.get(key) is entry:
+                    del feed.index[key]
+
+    def _add(self, guild_id, entry):
+        now = time.time()
+        created = _entry_time(entry)
+        if created < now - AUDIT_FEED_WINDOW:
+            return
+        feed = self._feed(guild_id)
+        if entry.id in feed.entries:
+            return
+        feed.entries[entry.id] = (created, entry)
+        target_key = (entry.action, _target_id(entry))
+        for key in (target_key, (entry.action, None)):
+            current = feed.index.get(key)
+            if current is None or current.id < entry.id:
+                feed.index[key] = entry
+            waiters = feed.waiters.get(key)
+            if not waiters:
+                continue
+            for since, waiter in waiters:
+                if created >= since and not waiter.done():
+                    waiter.set_result(entry)
+        self._prune(feed, now)
+
+    def record(self, entry):
+        """Add an entry delivered by the gateway"""
+        self.gateway_entries += 1
+        self._add(entry.guild.id, entry)
+
+    def _lookup(self, guild_id, action, target_id, since):
+        feed = self._guilds.get(guild_id)
+        if feed is None:
+            return None
+        self._prune(feed, time.time())
+        entry = feed.index.get((action, target_id))
+        if entry is None or _entry_time(entry) < since:
+            return None  # Only an earlier action of the same kind - not this event's
+        return entry
+
+    async def _poll(self, guild):
+        feed = self._feed(guild.id)
+        async with feed.poll_lock:
+            # Callers that queued behind an in-flight poll reuse its result
+            if time.monotonic() - feed.last_poll < AUDIT_POLL_INTERVAL:
+                return
+            feed.last_poll = time.monotonic()
+            self.polls += 1
+            entries = [entry async for entry in guild.audit_logs(limit=AUDIT_POLL_LIMIT)]
+        for entry in reversed(entries):
+            self._add(guild.id, entry)
+
+    async def resolve(self, guild, action, target_id=None, event_time=None):
+        """Return the newest recent entry for action (and target), or None.
+
+        target_id=None matches the newest entry of the action on any target.
+        event_time is when the listener saw the event (defaults to now); entries
+        created more than AUDIT_EVENT_SKEW seconds before it are never matched.
+        """
+        since = (event_time if event_time is not None else time.time()) - AUDIT_EVENT_SKEW
+        entry = self._lookup(guild.id, action, target_id, since)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        feed = self._feed(guild.id)
+        key = (action, target_id)
+        waiter = asyncio.get_running_loop().create_future()
+        item = (since, waiter)
+        feed.waiters.setdefault(key, []).append(item)
+        self.waits += 1
+        try:
+            return await asyncio.wait_for(waiter, timeout=AUDIT_FEED_WAIT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = feed.waiters.get(key)
+            if waiters is not None and item in waiters:
+                waiters.remove(item)
+                if not waiters:
+                    del feed.waiters[key]
+
+        await self._poll(guild)
+        entry = self._lookup(guild.id, action, target_id, since)
+        if entry is None:
+            self.misses += 1
+        return entry
+
+    def stats(self):
+        return {
+            'guilds': len(self._guilds),
+            'entries': sum(len(feed.entries) for feed in self._guilds.values()),
+            'gateway_entries': self.gateway_entries,
+            'hits': self.hits,
+            'waits': self.waits,
+            'polls': self.polls,
+            'misses': self.misses,
+        }
+
+
+# Shared instance - lives in its own module so every importer of rxt_security sees the same feed
+audit_feed = AuditLogFeed()
@@ -0,0 +1,137 @@
+"""Leveled logging for RXT ENGINE bot - per-module runtime levels and per-call-site sampling"""
+
+import os
+import sys
+
+from console_buffer import console_buffer
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+
+
+def parse_level(value, default=INFO):
+    """Level from a name ('debug') or number; default if unrecognised"""
+    if isinstance(value, int):
+        return value
+    value = str(value or '').strip().lower()
+    if value.isdigit():
+        return int(value)
+    return LEVEL_NAMES.get(value, default)
+
+
+def level_name(level):
+    for name, value in LEVEL_NAMES.items():
+        if value == level:
+            return name
+    return str(level)
+
+
+def _parse_module_levels(spec):
+    """'main=debug,ai_chat=warning' -> {'main': DEBUG, 'ai_chat': WARNING}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = parse_level(level)
+    return levels
+
+
+DEFAULT_LEVEL = parse_level(os.getenv('LOG_LEVEL', 'info'))
+# Lines below this level are printed locally but kept out of the live-console mirror
+CONSOLE_MIRROR_LEVEL = parse_level(os.getenv('CONSOLE_MIRROR_LEVEL', 'info'))
+
+_loggers = {}
+_module_levels = _parse_module_levels(os.getenv('LOG_LEVELS'))
+
+
+class BotLogger:
+    """Logger for one module. Messages use %-style args so disabled calls never format.
+
+    `sample=N` on a call emits only every Nth call with the same message template,
+    which keeps per-message debug lines usable on busy guilds.
+    """
+
+    __slots__ = ('name', 'level', '_sample_counts')
+
+    def __init__(self, name):
+        self.name = name
+        self.level = _module_levels.get(name, DEFAULT_LEVEL)
+        self._sample_counts = {}
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    def _log(self, level, message, args, sample):
+        if sample > 1:
+            count = self._sample_counts.get(message, 0) + 1
+            self._sample_counts[message] = count
+            if count % sample != 1:
+                return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args}"
+        if sample > 1:
+            message = f"{message} (1/{sample})"
+        _emit(level, message)
+
+    def debug(self, message, *args, sample=1):
+        if DEBUG >= self.level:
+            self._log(DEBUG, message, args, sample)
+
+    def info(self, message, *args, sample=1):
+        if INFO >= self.level:
+            self._log(INFO, message, args, sample)
+
+    def warning(self, message, *args, sample=1):
+        if WARNING >= self.level:
+            self._log(WARNING, message, args, sample)
+
+    def error(self, message, *args, sample=1):
+        if ERROR >= self.level:
+            self._log(ERROR, message, args, sample)
+
+
+def _emit(level, message):
+    stdout = sys.stdout
+    # Write past ConsoleCapture so the mirror decision is made here, by level
+    raw = getattr(stdout, 'original', stdout)
+    try:
+        raw.write(message + "\n")
+    except Exception:
+        pass
+    if level >= CONSOLE_MIRROR_LEVEL and raw is not stdout:
+        console_buffer.append(message)
+
+
+def get_logger(name):
+    """Return the shared logger for a module name"""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = BotLogger(name)
+    return logger
+
+
+def set_level(name, level):
+    """Set a module's level at runtime ('*' sets every module and the default)"""
+    global DEFAULT_LEVEL
+    level = parse_level(level)
+    if name == '*':
+        DEFAULT_LEVEL = level
+        _module_levels.clear()
+        for logger in _loggers.values():
+            logger.level = level
+        return
+    _module_levels[name] = level
+    get_logger(name).level = level
+
+
+def levels():
+    """Return {module: level name} for every known logger"""
+    return {name: level_name(logger.level) for name, logger in sorted(_loggers.items())}
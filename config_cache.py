@@ -0,0 +1,297 @@
+"""Read-through guild configuration cache for RXT ENGINE bot - serves db.servers documents from memory"""
+
+import asyncio
+import copy
+import os
+import time
+from collections import OrderedDict
+
+try:
+    import bson
+except ImportError:
+    bson = None
+
+DEFAULT_TTL_SECONDS = int(os.getenv('CONFIG_CACHE_TTL', '300'))
+DEFAULT_MAX_BYTES = int(os.getenv('CONFIG_CACHE_MAX_MB', '64')) * 1024 * 1024
+
+# Fixed per-entry overhead (entry object, dict slot, key string) added to the document size
+ENTRY_OVERHEAD_BYTES = 256
+
+# Fields read through get_cached_server_data / partial_ok lookups. Startup preload projects to
+# these, so a hot-path reader of any other field must be added here.
+HOT_CONFIG_FIELDS = (
+    'guild_id', 'config_version',
+    'log_channel', 'organized_log_channels', 'log_routes', 'message_store_enabled',
+    'main_moderator_role', 'junior_moderator_role',
+    'auto_role', 'welcome_channel', 'welcome_message', 'welcome_title', 'welcome_image',
+    'security_config', 'voice_tracker_enabled',
+    'karma_channels', 'ticket_support_role', 'security_settings',
+)
+
+
+def estimate_document_size(document):
+    """Estimate the in-memory footprint of a config document in bytes"""
+    if bson is not None:
+        try:
+            return len(bson.encode(document)) + ENTRY_OVERHEAD_BYTES
+        except Exception:
+            pass
+    return len(repr(document)) + ENTRY_OVERHEAD_BYTES
+
+
+class _CacheEntry:
+    __slots__ = ('data', 'size', 'expires_at', 'version', 'fields')
+
+    def __init__(self, data, size, expires_at, version, fields=None):
+        self.data = data
+        self.size = size
+        self.expires_at = expires_at
+        self.version = version
+        # None for a full document, else the projected top-level fields
+        self.fields = fields
+
+
+class GuildConfigCache:
+    """LRU cache of guild config documents with per-entry TTL and a total memory cap"""
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._loader = None
+        self._loading = {}
+        self._preloading = set()
+        self._stale_loads = set()
+        self._clock = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.warmup = None
+
+    def set_loader(self, loader):
+        """Set the coroutine function used to load a guild document on a miss"""
+        self._loader = loader
+
+    def _next_version(self):
+        self._clock += 1
+        return self._clock
+
+    def _remove(self, guild_id):
+        entry = self._entries.pop(guild_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _evict_to_budget(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def _live_entry(self, guild_id, touch):
+        entry = self._entries.get(guild_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(guild_id)
+            self.expirations += 1
+            return None
+        if touch:
+            self._entries.move_to_end(guild_id)
+        return entry
+
+    def peek(self, guild_id, touch=True):
+        """Return the cached (possibly projected) document without loading, or None on a miss"""
+        entry = self._live_entry(str(guild_id), touch)
+        return entry.data if entry is not None else None
+
+    def items(self):
+        """Snapshot of (guild_id, document) pairs currently cached"""
+        return [(guild_id, entry.data) for guild_id, entry in self._entries.items()]
+
+    def version(self, guild_id):
+        """Return the version stamp of a cached document (0 when not cached)"""
+        entry = self._entries.get(str(guild_id))
+        return entry.version if entry is not None else 0
+
+    async def get(self, guild_id, loader=None, partial_ok=False):
+        """Return the guild document, loading it once through the loader on a miss.
+
+        A preloaded projection (HOT_CONFIG_FIELDS) only counts as a hit when partial_ok is set;
+        otherwise the full document is loaded and replaces it. The returned document is shared
+        with the cache and must be treated as read-only.
+        """
+        guild_id = str(guild_id)
+        entry = self._live_entry(guild_id, True)
+        if entry is not None and (entry.fields is None or partial_ok):
+            self.hits += 1
+            return entry.data
+
+        self.misses += 1
+        pending = self._loading.get(guild_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loader = loader or self._loader
+        if loader is None:
+            return {}
+
+        pending = asyncio.ensure_future(loader(guild_id))
+        self._loading[guild_id] = pending
+        try:
+            data = await asyncio.shield(pending)
+        finally:
+            self._loading.pop(guild_id, None)
+            stale = guild_id in self._stale_loads
+            self._stale_loads.discard(guild_id)
+
+        data = data or {}
+        # A write landed while this load was in flight - do not cache what may be stale
+        if not stale:
+            self.put(guild_id, data)
+        return data
+
+    def put(self, guild_id, data, fields=None):
+        """Store a guild document (fields: the projection it was loaded with, None if full)"""
+        guild_id = str(guild_id)
+        self._remove(guild_id)
+        size = estimate_document_size(data)
+        self._entries[guild_id] = _CacheEntry(data, size, time.monotonic() + self.ttl, self._next_version(), fields)
+        self._bytes += size
+        self._evict_to_budget()
+
+    async def preload(self, guild_ids, bulk_loader, fields=None):
+        """Warm the cache for many guilds with one bulk_loader(ids) -> {guild_id: document} call.
+
+        Guilds already cached or loading are skipped; guilds written to while the bulk read
+        was in flight are left uncached. Documents not found are cached as empty configs.
+        Returns the number of guilds loaded and records the timing in self.warmup.
+        """
+        started = time.perf_counter()
+        guild_ids = [g for g in dict.fromkeys(map(str, guild_ids))
+                     if g not in self._loading and self._live_entry(g, False) is None]
+        self._preloading.update(guild_ids)
+        try:
+            documents = await bulk_loader(guild_ids) if guild_ids else {}
+        finally:
+            self._preloading.difference_update(guild_ids)
+            stale = self._stale_loads.intersection(guild_ids)
+            self._stale_loads.difference_update(stale)
+
+        loaded = 0
+        for guild_id in guild_ids:
+            if guild_id in stale or guild_id in self._loading or guild_id in self._entries:
+                continue
+            document = documents.get(guild_id)
+            # A missing document is complete as-is; a found one only holds the projected fields
+            self.put(guild_id, document or {}, fields if document else None)
+            loaded += 1
+
+        self.warmup = {
+            'guilds': loaded,
+            'seconds': round(time.perf_counter() - started, 3),
+            'at': time.time(),
+        }
+        return loaded
+
+    def patch(self, guild_id, fields):
+        """Apply $set fields to a cached document (write-through)"""
+        self.apply_update(guild_id, set_fields=fields)
+
+    def apply_update(self, guild_id, set_fields=None, unset_fields=(), inc_fields=None):
+        """Apply $set/$unset/$inc (top-level or dotted paths) to a cached document.
+
+        Containers along each path are copied, so documents already handed out are never
+        mutated and untouched subdocuments keep their identity. Paths that cannot be
+        applied to the cached copy (e.g. through a list) invalidate the entry instead.
+        """
+        guild_id = str(guild_id)
+        if guild_id in self._loading or guild_id in self._preloading:
+            self._stale_loads.add(guild_id)
+
+        entry = self._entries.get(guild_id)
+        if entry is None:
+            return
+
+        data = dict(entry.data)
+        copied = {id(data)}
+
+        def parent_of(path, create):
+            parts = path.split('.')
+            node = data
+            for part in parts[:-1]:
+                child = node.get(part)
+                if child is None:
+                    if not create:
+                        return None, None
+                    child = {}
+                elif not isinstance(child, dict):
+                    raise TypeError(path)
+                elif id(child) not in copied:
+                    child = dict(child)
+                copied.add(id(child))
+                node[part] = child
+                node = child
+            return node, parts[-1]
+
+        try:
+            for path, value in (set_fields or {}).items():
+                node, key = parent_of(path, True)
+                node[key] = copy.deepcopy(value)
+            for path in unset_fields or ():
+                node, key = parent_of(path, False)
+                if node is not None:
+                    node.pop(key, None)
+            for path, amount in (inc_fields or {}).items():
+                node, key = parent_of(path, True)
+                node[key] = node.get(key, 0) + amount
+        except TypeError:
+            self.invalidate(guild_id)
+            return
+
+        fields = entry.fields
+        if fields is not None:
+            written = {path.split('.')[0] for path in list(set_fields or ()) + list(inc_fields or ())}
+            fields = tuple(set(fields) | written)
+        self.put(guild_id, data, fields)
+
+    def invalidate(self, guild_id):
+        """Drop a guild document so the next read reloads it"""
+        guild_id = str(guild_id)
+        if guild_id in self._loading or guild_id in self._preloading:
+            self._stale_loads.add(guild_id)
+        if self._remove(guild_id) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached document"""
+        self._stale_loads.update(self._loading)
+        self._stale_loads.update(self._preloading)
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        """Return cache counters and current occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'partial_entries': sum(1 for entry in self._entries.values() if entry.fields is not None),
+            'warmup': self.warmup,
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same cache
+server_cache = GuildConfigCache()
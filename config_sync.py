@@ -0,0 +1,211 @@
+"""Cross-process guild config invalidation for RXT ENGINE bot - keeps config_cache in sync with db.servers"""
+
+import asyncio
+import os
+from datetime import datetime
+
+from config_cache import server_cache
+
+try:
+    from pymongo.errors import OperationFailure, PyMongoError
+except ImportError:
+    OperationFailure = PyMongoError = Exception
+
+# off = single process (default), auto = change stream with polling fallback, changestream, poll
+CONFIG_SYNC_MODE = os.getenv('CONFIG_SYNC_MODE', 'off').lower()
+CONFIG_SYNC_POLL_SECONDS = float(os.getenv('CONFIG_SYNC_POLL_SECONDS', '5'))
+
+# Server error codes meaning change streams are not available on this deployment
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573, 40324, 20, 115}
+
+VERSION_FIELD = 'config_version'
+STAMP_FIELD = 'updated_at'
+
+sync_state = {
+    'mode': 'off',
+    'events': 0,
+    'invalidations': 0,
+    'patches': 0,
+    'polls': 0,
+    'restarts': 0,
+    'last_error': None,
+}
+
+_sync_task = None
+
+
+def stamp_update(update):
+    """Add the version stamp to a db.servers update document.
+
+    Every writer stamps `config_version`/`updated_at` so that pollers in other processes
+    can detect changes. Stamp fields are dropped from $set to avoid update path conflicts
+    (whole-document rewrites carry the previous stamp along).
+    """
+    update = dict(update)
+    if '$set' in update:
+        update['$set'] = {k: v for k, v in update['$set'].items() if k not in (VERSION_FIELD, STAMP_FIELD)}
+        if not update['$set']:
+            del update['$set']
+    update['$inc'] = dict(update.get('$inc', {}), **{VERSION_FIELD: 1})
+    update['$currentDate'] = dict(update.get('$currentDate', {}), **{STAMP_FIELD: True})
+    return update
+
+
+def apply_local_write(guild_id, set_fields=None, unset_fields=(), inc_fields=None):
+    """Write-through a local update into the cache, advancing the cached version stamp.
+
+    If another process wrote in between, the poller sees a version mismatch and reloads.
+    """
+    guild_id = str(guild_id)
+    cached = server_cache.peek(guild_id, touch=False)
+    set_fields = {k: v for k, v in (set_fields or {}).items() if k not in (VERSION_FIELD, STAMP_FIELD)}
+    if cached is not None:
+        set_fields[VERSION_FIELD] = cached.get(VERSION_FIELD, 0) + 1
+    server_cache.apply_update(guild_id, set_fields, unset_fields, inc_fields)
+
+
+def _handle_change(change):
+    """Evict or patch the cache entry touched by a change stream event"""
+    sync_state['events'] += 1
+    operation = change.get('operationType')
+
+    if operation in ('drop', 'rename', 'dropDatabase', 'invalidate'):
+        server_cache.clear()
+        sync_state['invalidations'] += 1
+        return
+
+    document = change.get('fullDocument')
+    if document and document.get('guild_id'):
+        guild_id = str(document['guild_id'])
+        if server_cache.peek(guild_id, touch=False) is not None:
+            server_cache.put(guild_id, document)
+            sync_state['patches'] += 1
+        return
+
+    # Deletes (and updates whose lookup found nothing) only carry the _id
+    document_id = (change.get('documentKey') or {}).get('_id')
+    for guild_id, cached in server_cache.items():
+        if cached.get('_id') == document_id:
+            server_cache.invalidate(guild_id)
+            sync_state['invalidations'] += 1
+            break
+
+
+async def _watch_change_stream(db):
+    """Follow the db.servers change stream, resuming after transient errors"""
+    resume_token = None
+    while True:
+        try:
+            async with db.servers.watch(full_document='updateLookup', resume_after=resume_token) as stream:
+                sync_state['mode'] = 'changestream'
+                print("✅ Config sync: watching db.servers change stream")
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    _handle_change(change)
+        except OperationFailure as e:
+            if getattr(e, 'code', None) in CHANGE_STREAM_UNSUPPORTED_CODES:
+                raise
+            sync_state['last_error'] = str(e)
+            print(f"⚠️ Config sync change stream error: {e}")
+            resume_token = None
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            sync_state['last_error'] = str(e)
+            print(f"⚠️ Config sync change stream interrupted: {e}")
+        except Exception as e:
+            # A bad event or driver bug must not end invalidation for good
+            sync_state['last_error'] = str(e)
+            print(f"⚠️ Config sync change stream failed: {type(e).__name__}: {e}")
+
+        # Events may have been missed while disconnected
+        server_cache.clear()
+        sync_state['restarts'] += 1
+        await asyncio.sleep(5)
+
+
+async def _backfill_stamps(db):
+    """Stamp documents never written through stamp_update (legacy, or written by old code).
+
+    The poller only sees documents by `updated_at`; once stamped, the version bump also
+    makes any copy cached before the stamp look stale, so it is evicted on the next poll.
+    """
+    result = await db.servers.update_many({STAMP_FIELD: {'$exists': False}}, stamp_update({}))
+    return result.modified_count
+
+
+async def _poll_versions(db):
+    """Fallback when change streams are unavailable - poll version stamps and evict stale entries"""
+    sync_state['mode'] = 'poll'
+    print(f"✅ Config sync: polling db.servers version stamps every {CONFIG_SYNC_POLL_SECONDS}s")
+
+    newest = await db.servers.find_one({STAMP_FIELD: {'$exists': True}}, {STAMP_FIELD: 1}, sort=[(STAMP_FIELD, -1)])
+    watermark = newest[STAMP_FIELD] if newest else datetime.min
+    backfilled = await _backfill_stamps(db)
+    if backfilled:
+        print(f"✅ Config sync: stamped {backfilled} unversioned servers document(s)")
+
+    while True:
+        await asyncio.sleep(CONFIG_SYNC_POLL_SECONDS)
+        try:
+            # Documents inserted since by writers that do not stamp
+            await _backfill_stamps(db)
+            cursor = db.servers.find(
+                {STAMP_FIELD: {'$gte': watermark}},
+                {'guild_id': 1, VERSION_FIELD: 1, STAMP_FIELD: 1}
+            )
+            async for stamp in cursor:
+                watermark = max(watermark, stamp[STAMP_FIELD])
+                guild_id = str(stamp.get('guild_id'))
+                cached = server_cache.peek(guild_id, touch=False)
+                if cached is not None and cached.get(VERSION_FIELD) != stamp.get(VERSION_FIELD):
+                    server_cache.invalidate(guild_id)
+                    sync_state['invalidations'] += 1
+            sync_state['polls'] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            sync_state['last_error'] = str(e)
+            print(f"⚠️ Config sync poll error: {e}")
+
+
+async def _sync_once(db, mode):
+    if mode in ('auto', 'changestream'):
+        try:
+            await _watch_change_stream(db)
+            return
+        except OperationFailure as e:
+            if mode == 'changestream':
+                sync_state['last_error'] = str(e)
+                print(f"❌ Config sync: change streams unavailable: {e}")
+                return
+            print(f"⚠️ Config sync: change streams unavailable ({e.code}), falling back to polling")
+    await _poll_versions(db)
+
+
+async def _run_sync(db, mode):
+    """Run the sync loop, restarting it (with a cleared cache) after any unexpected error"""
+    while True:
+        try:
+            await _sync_once(db, mode)
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            sync_state['last_error'] = str(e)
+            print(f"⚠️ Config sync stopped ({type(e).__name__}: {e}) - restarting in 5s")
+        # Changes made while nothing was watching are unknown
+        server_cache.clear()
+        sync_state['restarts'] += 1
+        await asyncio.sleep(5)
+
+
+def start_config_sync(db):
+    """Start the invalidation task once (no-op when CONFIG_SYNC_MODE=off or there is no database)"""
+    global _sync_task
+    if db is None or CONFIG_SYNC_MODE == 'off':
+        return None
+    if _sync_task is not None and not _sync_task.done():
+        return _sync_task
+    _sync_task = asyncio.create_task(_run_sync(db, CONFIG_SYNC_MODE))
+    return _sync_task
@@ -0,0 +1,80 @@
+"""Live-console line buffer for RXT ENGINE bot - bounded, appended to synchronously by ConsoleCapture"""
+
+import os
+import threading
+from collections import deque
+
+CONSOLE_BUFFER_LINES = int(os.getenv('CONSOLE_BUFFER_LINES', '2000'))
+CONSOLE_LINE_MAX = 500
+
+
+class ConsoleRingBuffer:
+    """Fixed-size line buffer with a drop-oldest policy.
+
+    append() never blocks or schedules work, so it is safe to call from print() on any
+    thread. Lines pushed out before a consumer read them are counted and reported as a
+    marker at the start of the next chunk.
+    """
+
+    def __init__(self, max_lines=CONSOLE_BUFFER_LINES):
+        self.max_lines = max_lines
+        self._lines = deque()
+        self._lock = threading.Lock()
+        self._dropped = 0
+
+        self.appended = 0
+        self.dropped_total = 0
+
+    def append(self, text):
+        """Add printed text (split into lines, blank lines skipped)"""
+        lines = [line[:CONSOLE_LINE_MAX] for line in text.splitlines() if line.strip()]
+        if not lines:
+            return
+        with self._lock:
+            for line in lines:
+                if len(self._lines) >= self.max_lines:
+                    self._lines.popleft()
+                    self._dropped += 1
+                    self.dropped_total += 1
+                self._lines.append(line)
+            self.appended += len(lines)
+
+    def __len__(self):
+        return len(self._lines)
+
+    def take(self, max_chars):
+        """Remove and return as many whole lines as fit in max_chars, joined by newlines"""
+        with self._lock:
+            parts = []
+            size = 0
+            if self._dropped:
+                marker = f"... {self._dropped} line(s) dropped ..."
+                parts.append(marker)
+                size = len(marker)
+                self._dropped = 0
+            while self._lines:
+                line = self._lines[0]
+                if parts and size + 1 + len(line) > max_chars:
+                    break
+                parts.append(self._lines.popleft())
+                size += len(line) + 1
+            return "\n".join(parts)
+
+    def discard(self):
+        """Drop everything buffered, counting it as dropped"""
+        with self._lock:
+            self._dropped += len(self._lines)
+            self.dropped_total += len(self._lines)
+            self._lines.clear()
+
+    def stats(self):
+        """Return buffer counters"""
+        return {
+            'buffered': len(self._lines),
+            'appended': self.appended,
+            'dropped': self.dropped_total,
+        }
+
+
+# Shared instance - written by main.ConsoleCapture, drained by advanced_logging.console_output_logger
+console_buffer = ConsoleRingBuffer()
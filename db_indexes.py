@@ -0,0 +1,256 @@
+"""MongoDB index registry for RXT ENGINE bot - declares and verifies the indexes behind every hot query"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+try:
+    from pymongo import ASCENDING, DESCENDING
+    from pymongo.errors import OperationFailure
+except ImportError:
+    ASCENDING, DESCENDING = 1, -1
+    OperationFailure = Exception
+
+# Rejoin records older than this are forgotten (0 disables the TTL index)
+MEMBER_REJOIN_TTL_DAYS = int(os.getenv('MEMBER_REJOIN_TTL_DAYS', '365'))
+
+# Run explain() on every hot query after the indexes are applied
+VERIFY_DB_INDEXES = os.getenv('VERIFY_DB_INDEXES', '').lower() in ('1', 'true', 'yes')
+
+# Server error codes for an existing index with the same name/keys but different options
+INDEX_CONFLICT_CODES = {85, 86}
+# IndexNotFound / NamespaceNotFound when dropping an index that is already gone
+INDEX_NOT_FOUND_CODES = {26, 27}
+DUPLICATE_KEY_CODE = 11000
+
+# collection -> list of (keys, options). Names are fixed so re-applying is a no-op.
+INDEXES = {
+    'servers': [
+        ([('guild_id', ASCENDING)], {'name': 'guild_id_unique', 'unique': True}),
+        ([('updated_at', ASCENDING)], {'name': 'updated_at'}),
+    ],
+    'karma': [
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'guild_user_unique', 'unique': True}),
+        ([('guild_id', ASCENDING), ('karma', DESCENDING)], {'name': 'guild_karma_leaderboard'}),
+    ],
+    'voice_tracker': [
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'guild_user_unique', 'unique': True}),
+    ],
+    'timed_roles': [
+        ([('expires_at', ASCENDING)], {'name': 'expires_at'}),
+        ([('guild_id', ASCENDING), ('expires_at', ASCENDING)], {'name': 'guild_expires_at'}),
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING), ('role_id', ASCENDING)], {'name': 'guild_user_role'}),
+    ],
+    'custom_vcs': [
+        ([('channel_id', ASCENDING)], {'name': 'channel_id_unique', 'unique': True}),
+        ([('last_activity', ASCENDING)], {'name': 'last_activity'}),
+    ],
+    'custom_vc_hubs': [
+        ([('hub_channel_id', ASCENDING)], {'name': 'hub_channel_id_unique', 'unique': True}),
+        ([('guild_id', ASCENDING)], {'name': 'guild_id'}),
+    ],
+    'events': [
+        ([('guild_id', ASCENDING), ('event_name', ASCENDING)], {'name': 'guild_event_unique', 'unique': True}),
+    ],
+    'youtube_channels': [
+        ([('guild_id', ASCENDING), ('yt_channel_id', ASCENDING)], {'name': 'guild_yt_channel_unique', 'unique': True}),
+    ],
+    'member_rejoin': [
+        ([('guild_id', ASCENDING), ('member_id', ASCENDING)], {'name': 'guild_member_unique', 'unique': True}),
+    ] + ([
+        ([('timestamp', ASCENDING)], {'name': 'timestamp_ttl', 'expireAfterSeconds': MEMBER_REJOIN_TTL_DAYS * 86400}),
+    ] if MEMBER_REJOIN_TTL_DAYS > 0 else []),
+    'invite_data': [
+        ([('guild_id', ASCENDING)], {'name': 'guild_id_unique', 'unique': True}),
+    ],
+    'global_logging': [
+        ([('guild_id', ASCENDING)], {'name': 'guild_id_unique', 'unique': True}),
+    ],
+    'ai_settings': [
+        ([('guild_id', ASCENDING)], {'name': 'guild_id_unique', 'unique': True}),
+    ],
+    # Per-guild records split out of the servers document (guild_records.py)
+    'ticket_cooldowns': [
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'guild_user_unique', 'unique': True}),
+        ([('expires_at', ASCENDING)], {'name': 'expires_at_ttl', 'expireAfterSeconds': 0}),
+    ],
+    'quarantine_data': [
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'guild_user_unique', 'unique': True}),
+        ([('quarantine_until', ASCENDING)], {'name': 'quarantine_until'}),
+    ],
+    'violation_history': [
+        ([('guild_id', ASCENDING), ('user_id', ASCENDING)], {'name': 'guild_user_unique', 'unique': True}),
+        ([('expires_at', ASCENDING)], {'name': 'expires_at_ttl', 'expireAfterSeconds': 0}),
+    ],
+    'reaction_roles': [
+        ([('guild_id', ASCENDING), ('message_id', ASCENDING)], {'name': 'guild_message_unique', 'unique': True}),
+    ],
+    'ticket_categories': [
+        ([('guild_id', ASCENDING), ('category', ASCENDING)], {'name': 'guild_category_unique', 'unique': True}),
+    ],
+}
+
+# Indexes earlier versions created that must not exist any more (collection, index name)
+RETIRED_INDEXES = [
+    # Quarantine records hold members' stored roles and must survive until restoration
+    ('quarantine_data', 'expires_at_ttl'),
+]
+
+# (collection, filter, sort) for each query on a hot path - verified with explain()
+HOT_QUERIES = [
+    ('servers', {'guild_id': '0'}, None),
+    ('servers', {'updated_at': {'$gte': datetime(1970, 1, 1)}}, None),
+    ('karma', {'user_id': '0', 'guild_id': '0'}, None),
+    ('karma', {'guild_id': '0'}, [('karma', DESCENDING)]),
+    ('voice_tracker', {'guild_id': '0', 'user_id': '0'}, None),
+    ('voice_tracker', {'guild_id': '0'}, None),
+    ('timed_roles', {'expires_at': {'$lte': datetime(1970, 1, 1)}}, None),
+    ('timed_roles', {'guild_id': '0'}, [('expires_at', ASCENDING)]),
+    ('timed_roles', {'guild_id': '0', 'user_id': '0', 'role_id': '0'}, None),
+    ('custom_vcs', {'channel_id': '0'}, None),
+    ('custom_vcs', {'last_activity': {'$lt': datetime(1970, 1, 1)}}, None),
+    ('custom_vc_hubs', {'hub_channel_id': '0'}, None),
+    ('custom_vc_hubs', {'guild_id': '0'}, None),
+    ('events', {'guild_id': '0', 'event_name': '0'}, None),
+    ('youtube_channels', {'guild_id': '0'}, None),
+    ('youtube_channels', {'guild_id': '0', 'yt_channel_id': '0'}, None),
+    ('member_rejoin', {'guild_id': '0', 'member_id': '0'}, None),
+    ('invite_data', {'guild_id': '0'}, None),
+    ('global_logging', {'guild_id': '0'}, None),
+    ('ai_settings', {'guild_id': '0'}, None),
+    ('ticket_cooldowns', {'guild_id': '0', 'user_id': '0'}, None),
+    ('quarantine_data', {'guild_id': '0', 'user_id': '0'}, None),
+    ('quarantine_data', {'quarantine_until': {'$lte': 0}}, None),
+    ('violation_history', {'guild_id': '0', 'user_id': '0'}, None),
+    ('reaction_roles', {'guild_id': '0'}, None),
+    ('ticket_categories', {'guild_id': '0'}, None),
+]
+
+
+class IndexVerificationError(RuntimeError):
+    """Raised when a hot query is planned as a collection scan"""
+
+
+_indexes_applied = False
+
+
+async def _sync_ttl(db, collection, keys, options):
+    """Update expireAfterSeconds in place when a TTL index exists with another value"""
+    await db.command('collMod', collection, index={
+        'keyPattern': dict(keys),
+        'expireAfterSeconds': options['expireAfterSeconds'],
+    })
+
+
+async def ensure_indexes(db):
+    """Create every registered index. Safe to call repeatedly; existing indexes are left alone."""
+    global _indexes_applied
+    if db is None:
+        return 0
+
+    created = 0
+    for collection, specs in INDEXES.items():
+        for keys, options in specs:
+            try:
+                await db[collection].create_index(keys, **options)
+                created += 1
+            except OperationFailure as e:
+                code = getattr(e, 'code', None)
+                if code in INDEX_CONFLICT_CODES and 'expireAfterSeconds' in options:
+                    try:
+                        await _sync_ttl(db, collection, keys, options)
+                        created += 1
+                        print(f"✅ Updated TTL of {collection}.{options['name']}")
+                        continue
+                    except OperationFailure as ttl_error:
+                        e = ttl_error
+                if code == DUPLICATE_KEY_CODE:
+                    print(f"❌ Index {collection}.{options['name']} not created - collection has duplicate keys: {e}")
+                else:
+                    print(f"⚠️ Index {collection}.{options['name']} not applied: {e}")
+            except Exception as e:
+                print(f"⚠️ Index {collection}.{options['name']} not applied: {e}")
+
+    for collection, name in RETIRED_INDEXES:
+        try:
+            await db[collection].drop_index(name)
+            print(f"✅ Dropped retired index {collection}.{name}")
+        except OperationFailure as e:
+            if getattr(e, 'code', None) not in INDEX_NOT_FOUND_CODES:
+                print(f"⚠️ Retired index {collection}.{name} not dropped: {e}")
+        except Exception as e:
+            print(f"⚠️ Retired index {collection}.{name} not dropped: {e}")
+
+    _indexes_applied = True
+    total = sum(len(specs) for specs in INDEXES.values())
+    print(f"✅ Database indexes applied ({created}/{total})")
+    return created
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def verify_indexes(db, raise_on_scan=True):
+    """Explain every hot query and report the ones that would scan the whole collection.
+
+    Returns a list of (collection, filter, sort) entries planned as COLLSCAN and raises
+    IndexVerificationError when raise_on_scan is set and any were found.
+    """
+    if db is None:
+        return []
+
+    scans = []
+    for collection, query, sort in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get('queryPlanner', {}).get('winningPlan', {})
+        if 'COLLSCAN' in set(_plan_stages(winning_plan)):
+            scans.append((collection, query, sort))
+            print(f"❌ [INDEX CHECK] COLLSCAN on {collection}: filter={query} sort={sort}")
+
+    if scans:
+        if raise_on_scan:
+            raise IndexVerificationError(f"{len(scans)} hot queries would scan a full collection")
+    else:
+        print(f"✅ [INDEX CHECK] All {len(HOT_QUERIES)} hot queries use an index")
+    return scans
+
+
+async def setup_indexes(db):
+    """Apply the registry once per process, then verify when VERIFY_DB_INDEXES is set"""
+    if db is None or _indexes_applied:
+        return
+    await ensure_indexes(db)
+    if VERIFY_DB_INDEXES:
+        await verify_indexes(db)
+
+
+if __name__ == '__main__':
+    # python db_indexes.py [--verify]  - apply indexes (and check plans) against MONGO_URI
+    import motor.motor_asyncio
+
+    async def _main():
+        client = motor.motor_asyncio.AsyncIOMotorClient(os.environ['MONGO_URI'])
+        db = client.rxt_engine_bot
+        await ensure_indexes(db)
+        if '--verify' in sys.argv:
+            try:
+                await verify_indexes(db)
+            except IndexVerificationError as e:
+                print(f"❌ {e}")
+                return 1
+        return 0
+
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,191 @@
+"""MongoDB command monitoring for RXT ENGINE bot - per-collection latency histograms and slow-query log"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    from pymongo import monitoring
+    _ListenerBase = monitoring.CommandListener
+except ImportError:
+    monitoring = None
+    _ListenerBase = object
+
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '100'))
+# Port for the JSON stats endpoint inside the bot process (unset = disabled)
+DB_STATS_PORT = os.getenv('DB_STATS_PORT')
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Commands that do not target a collection
+_NON_COLLECTION_COMMANDS = {'ping', 'hello', 'ismaster', 'isMaster', 'endSessions', 'buildInfo', 'saslStart', 'saslContinue'}
+
+
+class _LatencyHistogram:
+    __slots__ = ('buckets', 'count', 'failures', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms, failed=False):
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if failed:
+            self.failures += 1
+
+    def percentile(self, fraction):
+        """Upper bucket bound containing the given fraction of samples (capped at the max seen)"""
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min(float(LATENCY_BUCKETS_MS[i]), self.max_ms) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'total_ms': round(self.total_ms, 2),
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 2),
+            'buckets': dict(zip([f"le_{b}" for b in LATENCY_BUCKETS_MS] + ['inf'], self.buckets)),
+        }
+
+
+class CommandStatsListener(_ListenerBase):
+    """pymongo command listener recording latency per (collection, operation).
+
+    Callbacks run on the driver's threads, so all shared state is guarded by a lock.
+    """
+
+    def __init__(self, slow_ms=DB_SLOW_QUERY_MS, slow_log_size=50):
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._histograms = {}
+        self.events = {'started': 0, 'succeeded': 0, 'failed': 0}
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self.since = time.time()
+        self.loop = None
+
+    def started(self, event):
+        command_name = event.command_name
+        target = event.command.get(command_name)
+        if command_name == 'getMore':
+            target = event.command.get('collection')
+        collection = target if isinstance(target, str) and command_name not in _NON_COLLECTION_COMMANDS else '-'
+        query = event.command.get('filter') or event.command.get('query')
+        statements = event.command.get('updates') or event.command.get('deletes')
+        if query is None and statements:
+            query = statements[0].get('q')
+        with self._lock:
+            self.events['started'] += 1
+            self._inflight[(event.connection_id, event.request_id)] = (collection, query)
+
+    def _finish(self, event, failed):
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            self.events['failed' if failed else 'succeeded'] += 1
+            collection, query = self._inflight.pop((event.connection_id, event.request_id), ('?', None))
+            key = (collection, event.command_name)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _LatencyHistogram()
+            histogram.record(duration_ms, failed)
+            slow = duration_ms >= self.slow_ms
+            if slow:
+                self.slow_queries.append({
+                    'at': time.time(),
+                    'collection': collection,
+                    'operation': event.command_name,
+                    'duration_ms': round(duration_ms, 2),
+                    'filter': repr(query)[:200] if query is not None else None,
+                    'failed': failed,
+                })
+        if slow:
+            message = (f"🐢 [SLOW QUERY] {collection}.{event.command_name} took {duration_ms:.1f}ms"
+                       + (f" filter={repr(query)[:200]}" if query is not None else ""))
+            # Print on the event loop: the captured stdout schedules tasks and must not run on driver threads
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(print, message)
+            else:
+                sys.__stdout__.write(message + "\n")
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.events = {'started': 0, 'succeeded': 0, 'failed': 0}
+            self.slow_queries.clear()
+            self.since = time.time()
+
+    def snapshot(self):
+        """Return a JSON-serialisable copy of every counter"""
+        with self._lock:
+            operations = [
+                dict(collection=collection, operation=operation, **histogram.to_dict())
+                for (collection, operation), histogram in self._histograms.items()
+            ]
+            events = dict(self.events)
+            slow_queries = list(self.slow_queries)
+        operations.sort(key=lambda op: op['total_ms'], reverse=True)
+        return {
+            'since': self.since,
+            'uptime_seconds': round(time.time() - self.since, 1),
+            'slow_query_ms': self.slow_ms,
+            'events': events,
+            'operations': operations,
+            'slow_queries': slow_queries,
+        }
+
+
+# Shared instance registered on the motor client in main.py
+command_stats = CommandStatsListener()
+
+_stats_runner = None
+
+
+async def start_stats_server(port=DB_STATS_PORT):
+    """Bind the listener to the running loop and serve GET /dbstats as JSON when DB_STATS_PORT is set"""
+    global _stats_runner
+    command_stats.loop = asyncio.get_running_loop()
+    if not port or _stats_runner is not None:
+        return
+    from aiohttp import web
+
+    async def dbstats(request):
+        return web.json_response(command_stats.snapshot())
+
+    app = web.Application()
+    app.router.add_get('/dbstats', dbstats)
+    _stats_runner = web.AppRunner(app)
+    await _stats_runner.setup()
+    await web.TCPSite(_stats_runner, '0.0.0.0', int(port)).start()
+    print(f"✅ DB stats endpoint on port {port} (/dbstats)")
@@ -0,0 +1,138 @@
+"""Cross-channel duplicate-content flood detection for RXT Security"""
+
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+
+# Fingerprints remembered per guild; the least recently seen are evicted beyond this
+DUPLICATE_TRACKED_PER_GUILD = int(os.getenv('DUPLICATE_TRACKED_PER_GUILD', '512'))
+# Distinct authors/channels remembered per fingerprint (enough to pass any threshold)
+DUPLICATE_MAX_MEMBERS = 32
+# Shorter normalized text ("hi", "thanks everyone") is too common to be a raid signature
+DUPLICATE_MIN_CHARS = 20
+DUPLICATE_MAX_CHARS = 2000
+
+_MENTION_PATTERN = re.compile(r'<(?:@[!&]?|#)\d+>|@(?:everyone|here)')
+_NOISE_PATTERN = re.compile(r'[\W\d_]+')
+
+
+def fingerprint(content: str):
+    """Hash of the text with mentions, digits, punctuation, case and spacing removed.
+
+    Raid bots vary exactly those between copies, so near-duplicates share a fingerprint.
+    Returns None for text too short to be meaningful.
+    """
+    text = _MENTION_PATTERN.sub(' ', content[:DUPLICATE_MAX_CHARS]).casefold()
+    text = _NOISE_PATTERN.sub('', text)
+    if len(text) < DUPLICATE_MIN_CHARS:
+        return None
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class _Fingerprint:
+    __slots__ = ('first_seen', 'last_seen', 'count', 'authors', 'channels', 'flagged')
+
+    def __init__(self, now):
+        self.first_seen = now
+        self.last_seen = now
+        self.count = 0
+        self.authors = {}  # author_id -> (channel_id, time) of their latest copy, oldest first
+        self.channels = {}  # channel_id -> time of its latest copy, oldest first
+        self.flagged = False
+
+    def expire(self, cutoff):
+        """Forget authors and channels whose latest copy is older than cutoff"""
+        while self.authors:
+            author_id = next(iter(self.authors))
+            if self.authors[author_id][1] > cutoff:
+                break
+            del self.authors[author_id]
+        while self.channels:
+            channel_id = next(iter(self.channels))
+            if self.channels[channel_id] > cutoff:
+                break
+            del self.channels[channel_id]
+
+
+class DuplicateFlood:
+    """Result of a message that belongs to a flagged flood"""
+
+    __slots__ = ('new', 'count', 'authors', 'channels', 'seconds')
+
+    def __init__(self, new, entry, now):
+        self.new = new
+        self.count = entry.count
+        self.authors = {author_id: channel_id for author_id, (channel_id, _) in entry.authors.items()}
+        self.channels = len(entry.channels)
+        self.seconds = now - entry.first_seen
+
+
+class DuplicateFloodDetector:
+    """Counts copies of the same (normalized) message per guild across users and channels.
+
+    Each guild keeps at most DUPLICATE_TRACKED_PER_GUILD fingerprints in last-seen order,
+    and each fingerprint at most DUPLICATE_MAX_MEMBERS authors and channels, so memory per
+    guild is fixed and a message costs one hash, one dict lookup and one reorder.
+    The window slides: only authors and channels whose latest copy is within `window`
+    seconds count, and a fingerprint not seen for `window` seconds starts over. It is
+    flagged once those span enough distinct channels or authors; later copies keep
+    matching until it goes quiet for a whole window.
+    """
+
+    def __init__(self, max_per_guild=DUPLICATE_TRACKED_PER_GUILD):
+        self.max_per_guild = max_per_guild
+        self._guilds = {}
+
+        self.floods = 0
+
+    def check(self, guild_id, author_id, channel_id, content, window, channel_threshold, author_threshold, now=None):
+        """Record a message; return a DuplicateFlood when it is part of a flood, else None"""
+        digest = fingerprint(content or '')
+        if digest is None:
+            return None
+        if now is None:
+            now = time.time()
+        entries = self._guilds.get(guild_id)
+        if entries is None:
+            entries = self._guilds[guild_id] = OrderedDict()
+
+        entry = entries.get(digest)
+        if entry is None or now - entry.last_seen > window:
+            entry = entries[digest] = _Fingerprint(now)
+            while len(entries) > self.max_per_guild:
+                entries.popitem(last=False)
+        entries.move_to_end(digest)
+
+        entry.expire(now - window)
+        entry.last_seen = now
+        entry.count += 1
+        # Re-insert so both maps stay in latest-copy order; beyond the cap the oldest goes
+        entry.authors.pop(author_id, None)
+        if len(entry.authors) >= DUPLICATE_MAX_MEMBERS:
+            del entry.authors[next(iter(entry.authors))]
+        entry.authors[author_id] = (channel_id, now)
+        entry.channels.pop(channel_id, None)
+        if len(entry.channels) >= DUPLICATE_MAX_MEMBERS:
+            del entry.channels[next(iter(entry.channels))]
+        entry.channels[channel_id] = now
+
+        if entry.flagged:
+            return DuplicateFlood(False, entry, now)
+        if len(entry.channels) >= channel_threshold or len(entry.authors) >= author_threshold:
+            entry.flagged = True
+            self.floods += 1
+            return DuplicateFlood(True, entry, now)
+        return None
+
+    def stats(self):
+        return {
+            'guilds': len(self._guilds),
+            'fingerprints': sum(len(entries) for entries in self._guilds.values()),
+            'floods': self.floods,
+        }
+
+
+# Shared instance - lives in its own module so every importer of rxt_security sees the same detector
+duplicate_flood = DuplicateFloodDetector()
@@ -0,0 +1,107 @@
+"""Global log channel registry for RXT ENGINE bot - resolves global logging channels from memory"""
+
+import asyncio
+import os
+
+import discord
+
+
+class GlobalLogChannelRegistry:
+    """Channel IDs of the owner's global logging category, kept in memory.
+
+    - guild_id -> per-server `server-*` channel, loaded once from the global_logging
+      collection and updated as channels are created
+    - channel name -> channel ID for the fixed channels (live-console, system-log, ...)
+
+    Creation of a per-server channel is serialised per guild so concurrent log calls
+    for a new guild create one channel. Entries are dropped when the channel is deleted.
+    """
+
+    def __init__(self):
+        self._server_channels = {}
+        self._named_channels = {}
+        self._creation_locks = {}
+        self.loaded = False
+
+    @staticmethod
+    def category_id():
+        value = os.getenv('GLOBAL_LOG_CATEGORY_ID')
+        try:
+            return int(value) if value else None
+        except ValueError:
+            return None
+
+    def category(self, bot):
+        """Return the global logging category, or None if unset/missing"""
+        category_id = self.category_id()
+        if not category_id:
+            return None
+        category = bot.get_channel(category_id)
+        if not isinstance(category, discord.CategoryChannel):
+            return None
+        return category
+
+    async def load(self, db):
+        """Read every stored guild -> channel mapping (once per process)"""
+        if db is None or self.loaded:
+            return
+        async for document in db.global_logging.find({}, {'guild_id': 1, 'log_channel_id': 1}):
+            try:
+                self._server_channels[int(document['guild_id'])] = int(document['log_channel_id'])
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.loaded = True
+        print(f"✅ Global log registry loaded ({len(self._server_channels)} server channels)")
+
+    def named_channel(self, bot, name):
+        """Return a fixed channel of the global category by name, scanning the category only on a miss"""
+        channel_id = self._named_channels.get(name)
+        if channel_id is not None:
+            channel = bot.get_channel(channel_id)
+            if channel is not None:
+                return channel
+            del self._named_channels[name]
+
+        category = self.category(bot)
+        if category is None:
+            return None
+        for channel in category.text_channels:
+            if channel.name == name:
+                self._named_channels[name] = channel.id
+                return channel
+        return None
+
+    def server_channel(self, bot, guild_id):
+        """Return the cached per-server channel of a guild, or None"""
+        channel_id = self._server_channels.get(int(guild_id))
+        if channel_id is None:
+            return None
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            self._server_channels.pop(int(guild_id), None)
+        return channel
+
+    def set_server_channel(self, guild_id, channel_id):
+        self._server_channels[int(guild_id)] = int(channel_id)
+
+    def creation_lock(self, guild_id):
+        """Lock held while looking up or creating a guild's per-server channel"""
+        return self._creation_locks.setdefault(int(guild_id), asyncio.Lock())
+
+    def release_creation_lock(self, guild_id):
+        lock = self._creation_locks.get(int(guild_id))
+        if lock is not None and not lock.locked():
+            del self._creation_locks[int(guild_id)]
+
+    def forget_channel(self, channel_id):
+        """Drop any entry pointing at a deleted channel"""
+        for name, cached_id in list(self._named_channels.items()):
+            if cached_id == channel_id:
+                del self._named_channels[name]
+        for guild_id, cached_id in list(self._server_channels.items()):
+            if cached_id == channel_id:
+                del self._server_channels[guild_id]
+
+
+# Shared instance - lives in its own module so every importer of main sees the same registry
+global_log_channels = GlobalLogChannelRegistry()
@@ -6,6 +6,8 @@ import os
 import asyncio
 from datetime import datetime
 from brand_config import BOT_FOOTER, BrandColors
+from global_log_channels import global_log_channels
+from log_dispatcher import log_dispatcher
 
 
 async def log_global_activity(activity_type, guild_id, user_id, description):
@@ -24,7 +26,7 @@ async def log_global_activity(activity_type, guild_id, user_id, description):
             return
         
         # Find system-log channel
-        system_channel = discord.utils.get(global_category.text_channels, name="system-log")
+        system_channel = global_log_channels.named_channel(bot, "system-log")
         if not system_channel:
             return
         
@@ -49,7 +51,7 @@ async def log_global_activity(activity_type, guild_id, user_id, description):
         embed.set_footer(text=f"{BOT_FOOTER} • Global Activity", icon_url=bot.user.display_avatar.url)
         
         try:
-            await system_channel.send(embed=embed)
+            log_dispatcher.submit(system_channel, embed)
         except Exception as e:
             print(f"Error sending global activity log: {e}")
             
@@ -75,15 +77,11 @@ async def log_per_server_activity(guild_id, activity_type, description):
         if not guild:
             return
         
-        # Create per-server channel if it doesn't exist
-        channel_name = f"server-{guild.name[:20]}".lower().replace(" ", "-")
-        
-        server_channel = discord.utils.get(global_category.text_channels, name=channel_name)
+        # Same per-server channel as send_global_log (registry lookup, created once per guild)
+        from advanced_logging import get_or_create_server_channel
+        server_channel = await get_or_create_server_channel(global_category, guild)
         if not server_channel:
-            server_channel = await global_category.create_text_channel(
-                name=channel_name,
-                topic=f"Global logs for {guild.name} (ID: {guild_id})"
-            )
+            return
         
         # Send log
         embed = discord.Embed(
@@ -96,7 +94,7 @@ async def log_per_server_activity(guild_id, activity_type, description):
         embed.set_footer(text=f"{BOT_FOOTER} • Server Activity", icon_url=bot.user.display_avatar.url)
         
         try:
-            await server_channel.send(embed=embed)
+            log_dispatcher.submit(server_channel, embed)
         except Exception as e:
             print(f"Error sending per-server log: {e}")
             
@@ -119,7 +117,7 @@ async def on_bot_dm_send(recipient, message_content):
             return
         
         # Find dm-sent channel
-        dm_channel = discord.utils.get(global_category.text_channels, name="dm-sent")
+        dm_channel = global_log_channels.named_channel(bot, "dm-sent")
         if not dm_channel:
             return
         
@@ -133,7 +131,7 @@ async def on_bot_dm_send(recipient, message_content):
         embed.set_footer(text=f"{BOT_FOOTER} • DM Sent", icon_url=bot.user.display_avatar.url)
         
         try:
-            await dm_channel.send(embed=embed)
+            log_dispatcher.submit(dm_channel, embed)
         except Exception as e:
             print(f"Error logging DM sent: {e}")
             
@@ -182,7 +180,7 @@ async def log_to_global(log_type, message, guild=None):
         }
         
         channel_name = channel_mapping.get(log_type.lower(), "system-log")
-        channel = discord.utils.get(global_category.text_channels, name=channel_name)
+        channel = global_log_channels.named_channel(bot, channel_name)
         
         if channel:
             embed = discord.Embed(
@@ -197,7 +195,7 @@ async def log_to_global(log_type, message, guild=None):
             embed.set_footer(text=f"{BOT_FOOTER} • {log_type}", icon_url=bot.user.display_avatar.url)
             
             try:
-                await channel.send(embed=embed)
+                log_dispatcher.submit(channel, embed)
             except Exception as e:
                 print(f"Error sending {log_type} log: {e}")
     except Exception as e:
@@ -0,0 +1,262 @@
+"""Per-guild record collections for RXT ENGINE bot - maps that used to grow inside the servers document"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from config_cache import GuildConfigCache, server_cache
+from config_sync import stamp_update, apply_local_write
+
+try:
+    from pymongo import ReturnDocument, UpdateOne
+except ImportError:
+    ReturnDocument = UpdateOne = None
+
+TICKET_COOLDOWN = timedelta(minutes=10)
+VIOLATION_HISTORY_TTL = timedelta(days=int(os.getenv('VIOLATION_HISTORY_TTL_DAYS', '90')))
+RECORD_CACHE_TTL = int(os.getenv('RECORD_CACHE_TTL', '60'))
+
+# Bookkeeping fields that are not part of the record as callers see it
+_INTERNAL_FIELDS = ('_id', 'guild_id', 'expires_at')
+
+db = None
+
+
+class GuildRecordStore:
+    """Records keyed by (guild_id, key) in a dedicated collection.
+
+    `legacy_field` names the servers subdocument the records used to live in; a guild is
+    migrated the first time its records are touched (see migrate_guild). Small config
+    maps can be cached per guild; returned records from a cached store are shared and
+    must be treated as read-only.
+    """
+
+    def __init__(self, collection, key_field, legacy_field, from_legacy=None, cached=False):
+        self.collection = collection
+        self.key_field = key_field
+        self.legacy_field = legacy_field
+        self.from_legacy = from_legacy or (lambda value: dict(value))
+        self.cache = GuildConfigCache(ttl=RECORD_CACHE_TTL) if cached else None
+
+    def _filter(self, guild_id, key):
+        return {'guild_id': str(guild_id), self.key_field: str(key)}
+
+    def _strip(self, document):
+        return {k: v for k, v in document.items() if k not in _INTERNAL_FIELDS and k != self.key_field}
+
+    async def _load_all(self, guild_id):
+        records = {}
+        async for document in db[self.collection].find({'guild_id': str(guild_id)}):
+            records[document[self.key_field]] = self._strip(document)
+        return records
+
+    async def all(self, guild_id):
+        """Return {key: record} for every record of a guild"""
+        if db is None:
+            return {}
+        await ensure_migrated(guild_id)
+        if self.cache is not None:
+            return await self.cache.get(str(guild_id), self._load_all)
+        return await self._load_all(guild_id)
+
+    async def get(self, guild_id, key):
+        """Return one record, or None"""
+        if db is None:
+            return None
+        if self.cache is not None:
+            return (await self.all(guild_id)).get(str(key))
+        await ensure_migrated(guild_id)
+        document = await db[self.collection].find_one(self._filter(guild_id, key))
+        return self._strip(document) if document else None
+
+    async def find(self, query):
+        """Yield (guild_id, key, record) for records across all guilds matching query"""
+        if db is None:
+            return
+        async for document in db[self.collection].find(query):
+            yield document['guild_id'], document[self.key_field], self._strip(document)
+
+    async def update(self, guild_id, key, set_fields=None, inc_fields=None, expires_at=None, upsert=True):
+        """Atomically $set/$inc fields of one record and return the record after the update"""
+        if db is None:
+            return None
+        await ensure_migrated(guild_id)
+        update = {}
+        set_fields = dict(set_fields or {})
+        if expires_at is not None:
+            set_fields['expires_at'] = expires_at
+        if set_fields:
+            update['$set'] = set_fields
+        if inc_fields:
+            update['$inc'] = inc_fields
+        document = await db[self.collection].find_one_and_update(
+            self._filter(guild_id, key),
+            update,
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER
+        )
+        record = self._strip(document) if document else None
+        if self.cache is not None and record is not None:
+            self.cache.apply_update(str(guild_id), set_fields={str(key): record})
+        return record
+
+    async def delete(self, guild_id, key):
+        """Delete one record"""
+        if db is None:
+            return
+        await ensure_migrated(guild_id)
+        await db[self.collection].delete_one(self._filter(guild_id, key))
+        if self.cache is not None:
+            self.cache.apply_update(str(guild_id), unset_fields=[str(key)])
+
+
+def _cooldown_from_legacy(value):
+    last_ticket = datetime.fromisoformat(value)
+    return {'last_ticket': last_ticket, 'expires_at': last_ticket + TICKET_COOLDOWN}
+
+
+def _quarantine_from_legacy(value):
+    # No expiry: the record holds the member's roles and is deleted only once they are restored
+    return dict(value)
+
+
+def _violations_from_legacy(value):
+    record = dict(value)
+    record['expires_at'] = datetime.utcfromtimestamp(value.get('last_violation_time', 0)) + VIOLATION_HISTORY_TTL
+    return record
+
+
+ticket_cooldowns = GuildRecordStore('ticket_cooldowns', 'user_id', 'ticket_cooldowns', _cooldown_from_legacy)
+quarantine_records = GuildRecordStore('quarantine_data', 'user_id', 'quarantine_data', _quarantine_from_legacy)
+violation_history = GuildRecordStore('violation_history', 'user_id', 'violation_history', _violations_from_legacy)
+reaction_roles = GuildRecordStore('reaction_roles', 'message_id', 'reaction_roles', cached=True)
+ticket_categories = GuildRecordStore('ticket_categories', 'category', 'ticket_categories', cached=True)
+
+STORES = (ticket_cooldowns, quarantine_records, violation_history, reaction_roles, ticket_categories)
+
+# ═══════════════════════════════════════════════════════════════
+# ONLINE MIGRATION FROM SERVERS SUBDOCUMENTS
+# ═══════════════════════════════════════════════════════════════
+
+_migration_locks = {}
+_migration_task = None
+migration_state = {'guilds': 0, 'records': 0, 'retries': 0, 'unmigrated': 0, 'done': False}
+
+
+async def migrate_guild(guild_id, server_data):
+    """Copy legacy subdocuments of one servers document into their collections, then unset them.
+
+    Records are inserted with $setOnInsert so anything already written through a store wins.
+    The $unset only applies if the subdocument is unchanged since it was read, so keys added
+    meanwhile by a process still running old code are copied on the next pass instead of lost.
+    Entries that cannot be converted (or a legacy value that is not a map at all) are kept
+    raw in `<legacy_field>_unmigrated` on the servers document and logged, never dropped.
+    """
+    guild_id = str(guild_id)
+    for store in STORES:
+        if store.legacy_field not in server_data:
+            continue
+        legacy = server_data[store.legacy_field]
+        unmigrated = {}
+        if isinstance(legacy, dict) and legacy:
+            operations = []
+            for key, value in legacy.items():
+                try:
+                    record = store.from_legacy(value)
+                except (TypeError, ValueError, AttributeError) as e:
+                    unmigrated[str(key)] = (value, e)
+                    continue
+                operations.append(UpdateOne(
+                    {'guild_id': guild_id, store.key_field: str(key)},
+                    {'$setOnInsert': record},
+                    upsert=True
+                ))
+            if operations:
+                await db[store.collection].bulk_write(operations, ordered=False)
+                migration_state['records'] += len(operations)
+        elif legacy:
+            unmigrated[''] = (legacy, TypeError(f"expected a map, got {type(legacy).__name__}"))
+
+        update = {'$unset': {store.legacy_field: ''}}
+        backup_field = f"{store.legacy_field}_unmigrated"
+        if unmigrated:
+            if '' in unmigrated or any('.' in key or key.startswith('$') for key in unmigrated):
+                # Not addressable per key - keep the whole legacy value
+                update['$set'] = {backup_field: legacy}
+            else:
+                update['$set'] = {f"{backup_field}.{key}": value for key, (value, _) in unmigrated.items()}
+            for key, (_, error) in unmigrated.items():
+                print(f"⚠️ Guild {guild_id}: {store.legacy_field}{'.' + key if key else ''} could not be migrated "
+                      f"({type(error).__name__}: {error}) - kept in servers.{backup_field}")
+
+        result = await db.servers.update_one(
+            {'guild_id': guild_id, store.legacy_field: legacy},
+            stamp_update(update)
+        )
+        if result.modified_count and unmigrated:
+            migration_state['unmigrated'] += len(unmigrated)
+            server_cache.invalidate(guild_id)
+        elif result.modified_count:
+            apply_local_write(guild_id, unset_fields=[store.legacy_field])
+        else:
+            migration_state['retries'] += 1
+            server_cache.invalidate(guild_id)
+        if store.cache is not None:
+            store.cache.invalidate(guild_id)
+    migration_state['guilds'] += 1
+
+
+async def ensure_migrated(guild_id):
+    """Migrate a guild before its records are read or written (no-op once the fields are gone)"""
+    guild_id = str(guild_id)
+    server_data = await server_cache.get(guild_id)
+    if not any(store.legacy_field in server_data for store in STORES):
+        return
+    lock = _migration_locks.setdefault(guild_id, asyncio.Lock())
+    async with lock:
+        server_data = await server_cache.get(guild_id)
+        if any(store.legacy_field in server_data for store in STORES):
+            await migrate_guild(guild_id, server_data)
+    _migration_locks.pop(guild_id, None)
+
+
+async def _migrate_all():
+    """Background sweep (one pass in _id order) over every guild still carrying legacy subdocuments"""
+    legacy_query = {'$or': [{store.legacy_field: {'$exists': True}} for store in STORES]}
+    projection = {'guild_id': 1, **{store.legacy_field: 1 for store in STORES}}
+    last_id = None
+    while True:
+        query = legacy_query if last_id is None else {'$and': [legacy_query, {'_id': {'$gt': last_id}}]}
+        batch = await db.servers.find(query, projection).sort('_id', 1).to_list(length=100)
+        if not batch:
+            break
+        for server_data in batch:
+            last_id = server_data['_id']
+            guild_id = str(server_data.get('guild_id'))
+            lock = _migration_locks.setdefault(guild_id, asyncio.Lock())
+            async with lock:
+                await migrate_guild(guild_id, server_data)
+            _migration_locks.pop(guild_id, None)
+            await asyncio.sleep(0.05)
+    migration_state['done'] = True
+    print(f"✅ Guild record migration complete ({migration_state['guilds']} guilds, {migration_state['records']} records)")
+    if migration_state['unmigrated']:
+        print(f"⚠️ Guild record migration: {migration_state['unmigrated']} legacy entries kept raw in *_unmigrated fields")
+    if migration_state['retries']:
+        # Subdocuments rewritten mid-migration (old code still running) are retried on next access
+        print(f"⚠️ Guild record migration: {migration_state['retries']} subdocument(s) changed during migration")
+
+
+def start_record_migration():
+    """Start the background migration sweep once"""
+    global _migration_task
+    if db is None:
+        return None
+    if _migration_task is None or _migration_task.done():
+        _migration_task = asyncio.create_task(_migrate_all())
+    return _migration_task
+
+
+def setup(database):
+    global db
+    db = database
@@ -0,0 +1,147 @@
+"""Link scanning for RXT Security anti-link - host extraction and domain-suffix matching"""
+
+import re
+from typing import Iterable, Optional
+
+# Scheme + authority of every http(s) URL; the host is parsed out of the authority
+URL_AUTHORITY_PATTERN = re.compile(r'(?i)\bhttps?://([^\s/?#<>"\'`|\\]+)')
+
+
+def normalize_host(host: str) -> Optional[str]:
+    """Lowercase, strip userinfo/port/trailing dots and convert IDNs to punycode"""
+    host = host.rpartition('@')[2]
+    if host.startswith('['):
+        return None  # IPv6 literal
+    host = host.partition(':')[0].strip('.').lower()
+    if not host:
+        return None
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            return None
+    return host
+
+
+def _normalize_domains(domains: Iterable[str]) -> frozenset:
+    normalized = set()
+    for domain in domains or ():
+        if not isinstance(domain, str):
+            continue
+        # Entries may be stored as bare domains or full URLs
+        domain = domain.strip()
+        match = URL_AUTHORITY_PATTERN.match(domain)
+        host = normalize_host(match.group(1) if match else domain.split('/', 1)[0])
+        if host:
+            normalized.add(host)
+    return frozenset(normalized)
+
+
+class DomainSuffixSet:
+    """Set of domains matched by label suffix: 'discord.gg' matches 'discord.gg' and
+    'www.discord.gg' but not 'notdiscord.gg'. A lookup costs one set probe per label
+    of the host, independent of how many domains are listed.
+    """
+
+    __slots__ = ('_domains',)
+
+    def __init__(self, domains: Iterable[str]):
+        self._domains = _normalize_domains(domains)
+
+    def match(self, host: str) -> Optional[str]:
+        """Return the listed domain that host equals or is a subdomain of"""
+        domains = self._domains
+        if host in domains:
+            return host
+        index = host.find('.')
+        while index != -1:
+            suffix = host[index + 1:]
+            if suffix in domains:
+                return suffix
+            index = host.find('.', index + 1)
+        return None
+
+    def __len__(self):
+        return len(self._domains)
+
+    def __bool__(self):
+        return bool(self._domains)
+
+
+class LinkScanner:
+    """Blocklist/allowlist of a security policy, built once per policy version"""
+
+    __slots__ = ('blocked', 'allowed')
+
+    def __init__(self, blocked_domains: Iterable[str], allowed_domains: Iterable[str] = ()):
+        self.blocked = DomainSuffixSet(blocked_domains)
+        self.allowed = DomainSuffixSet(allowed_domains)
+
+    def find_blocked_link(self, content: str) -> Optional[str]:
+        """Return the first URL (scheme + host) whose host is blocked and not allowed"""
+        if not self.blocked or '://' not in content:
+            return None
+        for match in URL_AUTHORITY_PATTERN.finditer(content):
+            host = normalize_host(match.group(1))
+            if host is None or self.blocked.match(host) is None:
+                continue
+            if self.allowed and self.allowed.match(host) is not None:
+                continue
+            return match.group(0)
+        return None
+
+
+def compile_link_scanner(blocked_domains, allowed_domains) -> Optional[LinkScanner]:
+    """Return a LinkScanner, or None when nothing is blocked"""
+    scanner = LinkScanner(blocked_domains, allowed_domains)
+    return scanner if scanner.blocked else None
+
+
+if __name__ == '__main__':
+    # python link_scanner.py [domains] [messages]  - per-message cost against a large blocklist
+    import random
+    import string
+    import sys
+    import timeit
+
+    domain_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    message_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(42)
+
+    def _label(length):
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+    blocked = [f"{_label(rng.randint(4, 12))}.{rng.choice(['com', 'net', 'gg', 'io', 'xyz'])}" for _ in range(domain_count)]
+    allowed = [f"{_label(8)}.com" for _ in range(domain_count // 10)]
+    messages = []
+    for _ in range(message_count):
+        words = [_label(rng.randint(2, 9)) for _ in range(rng.randint(5, 30))]
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            host = rng.choice(blocked) if rng.random() < 0.1 else f"{_label(7)}.com"
+            words.insert(rng.randrange(len(words)), f"https://www.{host}/{_label(6)}?q={_label(4)}")
+        messages.append(' '.join(words))
+
+    legacy_pattern = re.compile(r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)')
+
+    def legacy_scan(content):
+        # Previous behaviour: substring test of every domain against every URL
+        for url in legacy_pattern.findall(content):
+            if any(domain in url for domain in blocked) and not any(domain in url for domain in allowed):
+                return url
+        return None
+
+    build_seconds = timeit.timeit(lambda: compile_link_scanner(blocked, allowed), number=5) / 5
+    scanner = compile_link_scanner(blocked, allowed)
+
+    def run(scan, sample):
+        return sum(1 for content in sample if scan(content))
+
+    hits = run(scanner.find_blocked_link, messages)
+    scanner_seconds = timeit.timeit(lambda: run(scanner.find_blocked_link, messages), number=5) / 5
+    legacy_sample = messages[:max(1, message_count // 20)]
+    legacy_seconds = timeit.timeit(lambda: run(legacy_scan, legacy_sample), number=1)
+
+    print(f"Blocklist: {domain_count} domains, allowlist: {len(allowed)} domains")
+    print(f"Scanner build: {build_seconds * 1000:.1f} ms (once per policy version)")
+    print(f"Scanner: {scanner_seconds / message_count * 1e6:.2f} µs/message ({hits} of {message_count} messages blocked)")
+    print(f"Substring scan: {legacy_seconds / len(legacy_sample) * 1e6:.2f} µs/message ({len(legacy_sample)} message sample)")
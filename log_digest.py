@@ -0,0 +1,132 @@
+"""Log digesting for RXT ENGINE bot - collapses high-rate repeats (raids, spam waves) into summaries"""
+
+import asyncio
+import os
+import re
+import time
+
+# Default: more than 15 logs of the same kind within 10s switches that kind to digests
+LOG_DIGEST_THRESHOLD = int(os.getenv('LOG_DIGEST_THRESHOLD', '15'))
+LOG_DIGEST_WINDOW = float(os.getenv('LOG_DIGEST_WINDOW', '10'))
+LOG_DIGEST_SAMPLES = 3
+
+
+def _parse_rules(spec):
+    """'join-leave=30/10,security=10/5' -> {'join-leave': (30, 10.0), 'security': (10, 5.0)}"""
+    rules = {}
+    for item in (spec or '').split(','):
+        log_type, _, rule = item.partition('=')
+        threshold, _, window = rule.partition('/')
+        try:
+            rules[log_type.strip()] = (int(threshold), float(window or LOG_DIGEST_WINDOW))
+        except ValueError:
+            continue
+    return rules
+
+
+# Per log type (threshold, window seconds); a threshold of 0 disables digesting for that type
+LOG_DIGEST_RULES = _parse_rules(os.getenv('LOG_DIGEST_RULES'))
+
+# "[ANTI-RAID]" / "[MEMBER JOIN]" tags separate kinds of events within one log type
+_TAG_PATTERN = re.compile(r'\[([A-Z][A-Z0-9 _\-]*)\]')
+
+
+def digest_rule(log_type):
+    """Return the (threshold, window) defaults for a log type"""
+    return LOG_DIGEST_RULES.get(log_type, (LOG_DIGEST_THRESHOLD, LOG_DIGEST_WINDOW))
+
+
+class _DigestState:
+    __slots__ = ('window_start', 'count', 'digesting', 'absorbed', 'samples', 'since')
+
+    def __init__(self, now):
+        self.window_start = now
+        self.count = 0
+        self.digesting = False
+        self.absorbed = 0
+        self.samples = []
+        self.since = now
+
+
+class LogDigester:
+    """Counts logs per (guild, log type, tag) in fixed windows.
+
+    Up to `threshold` logs per window pass through. Beyond that the kind switches to
+    digest mode: logs are absorbed and, once per window, replaced by one summary with
+    a few samples. A window with nothing absorbed ends digest mode.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._emit = None
+
+        self.absorbed_total = 0
+        self.summaries = 0
+
+    def bind(self, emit):
+        """Set the coroutine function(guild_id, log_type, summary) that delivers summaries"""
+        self._emit = emit
+
+    def offer(self, guild_id, log_type, text, threshold, window):
+        """Return True to deliver the log normally, False if it was absorbed into a digest"""
+        if threshold <= 0 or self._emit is None:
+            return True
+        match = _TAG_PATTERN.search(text or '')
+        key = (str(guild_id), log_type, match.group(1) if match else None)
+        now = time.monotonic()
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _DigestState(now)
+
+        if state.digesting:
+            state.absorbed += 1
+            self.absorbed_total += 1
+            if len(state.samples) < LOG_DIGEST_SAMPLES:
+                state.samples.append((text or '')[:150])
+            return False
+
+        if now - state.window_start >= window:
+            state.window_start = now
+            state.count = 0
+        state.count += 1
+        if state.count <= threshold:
+            return True
+
+        state.digesting = True
+        state.since = now
+        state.absorbed = 1
+        state.samples = [(text or '')[:150]]
+        self.absorbed_total += 1
+        asyncio.get_running_loop().call_later(window, self._flush, key, window)
+        return False
+
+    def _flush(self, key, window):
+        state = self._states.get(key)
+        if state is None:
+            return
+        if not state.absorbed:
+            # Rate dropped below the threshold - back to normal delivery
+            del self._states[key]
+            return
+        guild_id, log_type, tag = key
+        elapsed = time.monotonic() - state.since
+        label = f"[{tag}] " if tag else ""
+        summary = (f"📦 [DIGEST] {label}{state.absorbed} {log_type} log(s) in {elapsed:.0f}s"
+                   + "\nSample:\n" + "\n".join(f"• {sample}" for sample in state.samples))
+        state.absorbed = 0
+        state.samples = []
+        state.since = time.monotonic()
+        self.summaries += 1
+        asyncio.create_task(self._emit(guild_id, log_type, summary))
+        asyncio.get_running_loop().call_later(window, self._flush, key, window)
+
+    def stats(self):
+        return {
+            'digesting': sum(1 for state in self._states.values() if state.digesting),
+            'absorbed': self.absorbed_total,
+            'summaries': self.summaries,
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same digester
+log_digester = LogDigester()
@@ -0,0 +1,310 @@
+"""Batched log delivery for RXT ENGINE bot - one background queue per log channel"""
+
+import asyncio
+import os
+import time
+from collections import deque
+
+import aiohttp
+import discord
+
+from log_spool import open_spool
+from log_webhooks import log_webhooks
+
+LOG_BATCH_SIZE = 10  # Discord's limit of embeds per message
+LOG_BATCH_CHARS = 6000  # Discord's limit of embed characters per message
+LOG_FLUSH_MS = int(os.getenv('LOG_FLUSH_MS', '750'))
+# Per-channel backlog; the oldest entries are dropped beyond this
+LOG_QUEUE_MAX = int(os.getenv('LOG_QUEUE_MAX', '500'))
+# Backoff bounds while Discord is unreachable or returning 5xx
+LOG_OUTAGE_BACKOFF = (2, 60)
+
+
+def _is_transient(error):
+    """Discord outage / network failure - keep the batch and try again later"""
+    if isinstance(error, discord.HTTPException):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+
+
+class _LogEntry:
+    __slots__ = ('spool_id', 'embed', 'spooled', 'dropped')
+
+    def __init__(self, spool_id, embed, spooled=None):
+        self.spool_id = spool_id  # Set once the spool writer has persisted the embed
+        self.embed = embed
+        self.spooled = spooled  # Future of the writer pass that persists it
+        self.dropped = False
+
+
+class _ChannelQueue:
+    __slots__ = ('channel', 'entries', 'wakeup', 'task', 'first_at')
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.entries = deque()
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.first_at = None
+
+
+class LogDispatcher:
+    """Queues log embeds per destination channel and sends them in batches.
+
+    A batch goes out when it holds LOG_BATCH_SIZE embeds or when its oldest embed has
+    waited LOG_FLUSH_MS. Each channel has its own sender task, so a rate-limited
+    channel never delays the others. Workers exit when their queue drains.
+
+    With a spool (log_spool.py, opened by start()) every embed is written to local
+    disk and removed once delivered; start() re-queues what a previous run left.
+    Spool writes are batched per writer pass and run in a worker thread, so
+    submit() never touches the disk on the event loop.
+
+    Channels with a webhook in the registry (log_webhooks.py) are sent through it;
+    a rejected webhook is dropped and the batch goes out through channel.send.
+    """
+
+    def __init__(self, flush_ms=LOG_FLUSH_MS, max_queue=LOG_QUEUE_MAX, spool=None, webhooks=None):
+        self.flush_interval = flush_ms / 1000
+        self.max_queue = max_queue
+        self.spool = spool
+        self.webhooks = webhooks
+        self._queues = {}
+        self._closing = False
+        self._started = False
+        # Entries up to this spool ID were left by a previous run (see start)
+        self._replay_upto = spool.last_id() if spool is not None else None
+        # Submitted embeds waiting for the spool writer: [(channel_id, _LogEntry)]
+        self._unspooled = []
+        self._next_pass = None  # Future resolved once the pending entries are written
+        # Entries dropped from a full queue, removed from the spool by the writer
+        self._abandoned = []
+        self._spool_task = None
+
+        self.enqueued = 0
+        self.messages = 0
+        self.webhook_messages = 0
+        self.embeds = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def submit(self, channel, embed):
+        """Queue an embed for a channel and return immediately"""
+        entry = _LogEntry(None, embed)
+        if self.spool is not None:
+            if self._next_pass is None:
+                self._next_pass = asyncio.get_running_loop().create_future()
+            entry.spooled = self._next_pass
+            self._unspooled.append((channel.id, entry))
+            self._wake_spool_writer()
+        self._enqueue(channel, entry)
+
+    def _wake_spool_writer(self):
+        if self._spool_task is None or self._spool_task.done():
+            self._spool_task = asyncio.create_task(self._write_spool())
+
+    async def _write_spool(self):
+        """Persist submitted embeds (one transaction per pass) and unspool abandoned ones"""
+        while self._unspooled or self._abandoned:
+            if self._unspooled:
+                pending, self._unspooled = self._unspooled, []
+                written, self._next_pass = self._next_pass, None
+                pending = [(channel_id, entry) for channel_id, entry in pending if not entry.dropped]
+                try:
+                    rows = [(channel_id, entry.embed.to_dict()) for channel_id, entry in pending]
+                    spool_ids = await asyncio.to_thread(self.spool.append_many, rows)
+                    for (_, entry), spool_id in zip(pending, spool_ids):
+                        entry.spool_id = spool_id
+                except Exception as e:
+                    print(f"⚠️ Log spool write failed: {e}")
+                finally:
+                    if written is not None and not written.done():
+                        written.set_result(None)
+            if self._abandoned:
+                # After the write above, so entries dropped while it ran have their IDs
+                abandoned, self._abandoned = self._abandoned, []
+                try:
+                    await asyncio.to_thread(self.spool.ack, [entry.spool_id for entry in abandoned])
+                except Exception as e:
+                    print(f"⚠️ Log spool ack failed: {e}")
+
+    async def _ack(self, entries):
+        if self.spool is None:
+            return
+        # A batch can go out before its entries were spooled; wait for their writer pass
+        # only (not the writer task, which keeps running while submissions arrive)
+        passes = {entry.spooled for entry in entries if entry.spool_id is None and entry.spooled is not None}
+        passes = [written for written in passes if not written.done()]
+        if passes:
+            await asyncio.wait(passes)
+        try:
+            await asyncio.to_thread(self.spool.ack, [entry.spool_id for entry in entries])
+        except Exception as e:
+            print(f"⚠️ Log spool ack failed: {e}")
+
+    def _enqueue(self, channel, entry):
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = _ChannelQueue(channel)
+        queue.channel = channel
+        if len(queue.entries) >= self.max_queue:
+            # Abandoned for good - also removed from (or never written to) the spool
+            dropped = queue.entries.popleft()
+            dropped.dropped = True
+            self.dropped += 1
+            if self.spool is not None:
+                self._abandoned.append(dropped)
+                self._wake_spool_writer()
+        if not queue.entries:
+            queue.first_at = time.monotonic()
+        queue.entries.append(entry)
+        self.enqueued += 1
+        if len(queue.entries) >= LOG_BATCH_SIZE or self._closing:
+            queue.wakeup.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._run(queue))
+
+    def _take_batch(self, queue):
+        batch = []
+        chars = 0
+        while queue.entries and len(batch) < LOG_BATCH_SIZE:
+            size = len(queue.entries[0].embed)
+            if batch and chars + size > LOG_BATCH_CHARS:
+                break
+            batch.append(queue.entries.popleft())
+            chars += size
+        queue.first_at = time.monotonic() if queue.entries else None
+        return batch
+
+    async def _send(self, queue, batch):
+        outage_delay = LOG_OUTAGE_BACKOFF[0]
+        while True:
+            webhook = self.webhooks.get(queue.channel.id) if self.webhooks is not None else None
+            try:
+                if webhook is not None:
+                    await webhook.send(embeds=[entry.embed for entry in batch])
+                    self.webhook_messages += 1
+                else:
+                    await queue.channel.send(embeds=[entry.embed for entry in batch])
+                self.messages += 1
+                self.embeds += len(batch)
+                await self._ack(batch)
+                return
+            except Exception as e:
+                if webhook is not None and isinstance(e, (discord.NotFound, discord.Forbidden)):
+                    # Webhook deleted or no longer usable - fall back to the bot transport
+                    print(f"⚠️ Log webhook for channel {queue.channel.id} rejected ({e}) - using channel.send")
+                    self.webhooks.forget(queue.channel.id)
+                    continue
+                # 429s never get here: discord.py waits out rate limits inside send()
+                if _is_transient(e) and not self._closing:
+                    self.errors += 1
+                    print(f"⚠️ Discord unavailable for log delivery, retrying in {outage_delay}s: {e}")
+                    await asyncio.sleep(outage_delay)
+                    outage_delay = min(outage_delay * 2, LOG_OUTAGE_BACKOFF[1])
+                else:
+                    # Permanent (missing channel/permissions) or shutting down mid-outage
+                    self.errors += 1
+                    print(f"Error sending log batch to #{getattr(queue.channel, 'name', queue.channel.id)}: {e}")
+                    if not _is_transient(e):
+                        await self._ack(batch)
+                    return
+
+    async def _run(self, queue):
+        while queue.entries:
+            wait = queue.first_at + self.flush_interval - time.monotonic()
+            if wait > 0 and len(queue.entries) < LOG_BATCH_SIZE and not self._closing:
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._send(queue, self._take_batch(queue))
+        if self._queues.get(queue.channel.id) is queue and not queue.entries:
+            del self._queues[queue.channel.id]
+
+    async def flush(self):
+        """Send everything queued now and wait for the senders to finish"""
+        tasks = []
+        for queue in list(self._queues.values()):
+            queue.first_at = 0
+            queue.wakeup.set()
+            if queue.task is not None and not queue.task.done():
+                tasks.append(queue.task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def start(self, bot):
+        """Open the spool and re-queue embeds a previous run left undelivered (once per process)"""
+        if self._started:
+            return 0
+        self._started = True
+        spool = self.spool
+        if spool is None:
+            spool = await asyncio.to_thread(open_spool)
+            if spool is None:
+                return 0
+        replayed = 0
+        try:
+            # Read before submit() can spool into it, so only a previous run's entries are replayed
+            pending = await asyncio.to_thread(self._load_replay, spool)
+        except Exception as e:
+            print(f"⚠️ Log spool replay failed: {e}")
+            pending = []
+        self.spool = spool
+        try:
+            unknown = []
+            for spool_id, channel_id, embed_dict in pending:
+                channel = bot.get_channel(channel_id)
+                if channel is None:
+                    unknown.append(_LogEntry(spool_id, None))
+                    continue
+                self._enqueue(channel, _LogEntry(spool_id, discord.Embed.from_dict(embed_dict)))
+                replayed += 1
+            await self._ack(unknown)
+        except Exception as e:
+            print(f"⚠️ Log spool replay failed: {e}")
+        if replayed:
+            print(f"📨 Replaying {replayed} undelivered log embed(s) from the spool")
+        return replayed
+
+    def _load_replay(self, spool):
+        spool.trim()
+        upto = self._replay_upto if self._replay_upto is not None else spool.last_id()
+        return list(spool.pending(upto=upto))
+
+    async def close(self):
+        """Flush on shutdown; later submissions are sent without waiting for a batch"""
+        self._closing = True
+        await self.flush()
+        if self._spool_task is not None and not self._spool_task.done():
+            await self._spool_task
+        if self.spool is not None:
+            self.spool.close()
+
+    def stats(self):
+        """Return dispatcher counters (and spool size/lag when spooling)"""
+        spool = None
+        if self.spool is not None:
+            try:
+                spool = self.spool.stats()
+            except Exception as e:
+                spool = {'error': str(e)}
+        return {
+            'spool': spool,
+            'channels': len(self._queues),
+            'queued': sum(len(q.entries) for q in self._queues.values()),
+            'enqueued': self.enqueued,
+            'messages': self.messages,
+            'webhook_messages': self.webhook_messages,
+            'webhooks': len(self.webhooks) if self.webhooks is not None else 0,
+            'embeds': self.embeds,
+            'dropped': self.dropped,
+            'errors': self.errors,
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same dispatcher
+# The spool is opened by start() from on_ready, not at import
+log_dispatcher = LogDispatcher(webhooks=log_webhooks)
@@ -0,0 +1,171 @@
+"""Log routing for RXT ENGINE bot - per-guild log type -> destinations, compiled once per config"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+from brand_config import BrandColors
+from log_digest import digest_rule
+
+# Embed color per log type
+LOG_COLORS = {
+    "general": BrandColors.INFO,
+    "moderation": BrandColors.DANGER,
+    "setup": BrandColors.WARNING,
+    "communication": BrandColors.SUCCESS,
+    "karma": BrandColors.PRIMARY,
+    "tickets": BrandColors.INFO,
+    "ticket": BrandColors.INFO,
+    "reaction_role": BrandColors.ACCENT,
+    "reaction": BrandColors.ACCENT,
+    "welcome": BrandColors.SUCCESS,
+    "voice": BrandColors.PRIMARY,
+    "voice-log": BrandColors.PRIMARY,
+    "timed_roles": BrandColors.WARNING,
+    "timed": BrandColors.WARNING,
+    "security": BrandColors.DANGER,
+    "profile": BrandColors.INFO,
+    "utility": BrandColors.INFO,
+    "quarantine": BrandColors.WARNING,
+    "anti-raid": BrandColors.DANGER,
+    "anti-nuke": BrandColors.DANGER,
+    "automod": BrandColors.WARNING,
+    "join-leave": BrandColors.SUCCESS,
+    "role-update": BrandColors.INFO,
+    "channel-update": BrandColors.INFO,
+    "message-delete": BrandColors.WARNING,
+    "message-edit": BrandColors.WARNING,
+    "member-ban": BrandColors.DANGER,
+    "member-kick": BrandColors.DANGER,
+    "ticket-log": BrandColors.PRIMARY,
+    "economy-log": BrandColors.SECONDARY,
+    "music-log": BrandColors.SECONDARY,
+    "command-log": BrandColors.INFO,
+    "error-log": BrandColors.DANGER,
+    "system": BrandColors.INFO,
+    "events": BrandColors.PRIMARY,
+    "ai_chat": BrandColors.ACCENT,
+    "ai": BrandColors.ACCENT
+}
+
+# Log type -> organized log channel (from /log-category); unlisted types use their own name
+ORGANIZED_CHANNEL_FOR = {
+    "general": "general",
+    "moderation": "moderation",
+    "setup": "setup",
+    "communication": "communication",
+    "karma": "karma",
+    "tickets": "ticket-log",
+    "ticket": "ticket-log",
+    "reaction_role": "reaction",
+    "welcome": "join-leave",
+    "voice": "voice-log",
+    "timed_roles": "timed",
+    "security": "security",
+    "quarantine": "security",
+    "anti-raid": "security",
+    "anti-nuke": "security",
+    "antirole": "security",
+    "automod": "automod",
+    "join-leave": "join-leave",
+    "role-update": "role-update",
+    "channel-update": "channel-update",
+    "message-delete": "message-delete",
+    "message-edit": "message-edit",
+    "member-ban": "member-ban",
+    "member-kick": "member-kick",
+    "command-log": "general",
+    "error-log": "error-log",
+    "music-log": "music-log",
+    "economy-log": "economy-log",
+    "system": "system",
+    "profile": "general",
+    "utility": "general"
+}
+
+
+@dataclass(frozen=True, slots=True)
+class LogRoute:
+    destinations: Tuple[int, ...]
+    color: int
+    mirror: bool = True
+    sample: int = 1
+    digest_threshold: int = 0
+    digest_window: float = 0.0
+
+
+class LogRouter:
+    """Compiled routes of one guild. Routes are built lazily per log type and memoised.
+
+    Default: the single log channel if set, otherwise the matching organized channel, and
+    every log mirrored to the global log, digest limits from LOG_DIGEST_RULES.
+    servers.log_routes.<log_type> can replace the destinations (fan-out to several
+    channels), color, mirroring, sampling and digest limits of a type.
+    """
+
+    __slots__ = ('_logging', '_routes', '_sample_counts')
+
+    def __init__(self, logging_config):
+        self._logging = logging_config
+        self._routes = {}
+        self._sample_counts = {}
+
+    def _build(self, log_type):
+        logging_config = self._logging
+        if logging_config.log_channel_id:
+            destinations = (logging_config.log_channel_id,)
+        else:
+            organized_id = logging_config.organized_channel_ids.get(ORGANIZED_CHANNEL_FOR.get(log_type, log_type))
+            destinations = (organized_id,) if organized_id else ()
+        digest_threshold, digest_window = digest_rule(log_type)
+        route = LogRoute(
+            destinations=destinations,
+            color=LOG_COLORS.get(log_type, BrandColors.INFO),
+            digest_threshold=digest_threshold,
+            digest_window=digest_window,
+        )
+
+        rule = logging_config.route_rules.get(log_type)
+        if rule is not None:
+            route = LogRoute(
+                destinations=rule.channel_ids if rule.channel_ids is not None else route.destinations,
+                color=rule.color if rule.color is not None else route.color,
+                mirror=rule.mirror if rule.mirror is not None else route.mirror,
+                sample=rule.sample or route.sample,
+                digest_threshold=rule.digest_threshold if rule.digest_threshold is not None else route.digest_threshold,
+                digest_window=rule.digest_window or route.digest_window,
+            )
+        return route
+
+    def route(self, log_type):
+        """Return the LogRoute for a log type"""
+        route = self._routes.get(log_type)
+        if route is None:
+            route = self._routes[log_type] = self._build(log_type)
+        return route
+
+    def sampled_out(self, log_type, route):
+        """True when this event should be skipped by the route's 1-in-N sampling"""
+        if route.sample <= 1:
+            return False
+        count = self._sample_counts.get(log_type, 0) + 1
+        self._sample_counts[log_type] = count
+        return count % route.sample != 1
+
+
+# guild_id -> (ServerConfig compiled from, LogRouter)
+_compiled_routers = {}
+
+
+def compile_log_router(guild_id, config) -> LogRouter:
+    """Return the LogRouter for a guild's ServerConfig, rebuilding only when the config changed"""
+    guild_id = str(guild_id)
+    compiled = _compiled_routers.get(guild_id)
+    if compiled is not None and compiled[0] is config:
+        return compiled[1]
+    router = LogRouter(config.logging)
+    _compiled_routers[guild_id] = (config, router)
+    return router
+
+
+def forget_log_router(guild_id):
+    _compiled_routers.pop(str(guild_id), None)
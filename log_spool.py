@@ -0,0 +1,161 @@
+"""Durable log spool for RXT ENGINE bot - log embeds are persisted locally until Discord accepts them"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# SQLite file on local disk ('' disables the spool - logs are then kept in memory only)
+LOG_SPOOL_PATH = os.getenv('LOG_SPOOL_PATH', 'log_spool.sqlite3')
+LOG_SPOOL_MAX_ENTRIES = int(os.getenv('LOG_SPOOL_MAX_ENTRIES', '50000'))
+LOG_SPOOL_MAX_AGE_HOURS = float(os.getenv('LOG_SPOOL_MAX_AGE_HOURS', '24'))
+
+
+class LogSpool:
+    """Append-only table of undelivered log embeds in a WAL-mode SQLite file.
+
+    Rows are inserted before an embed is queued for sending and deleted once Discord
+    has accepted it, so whatever is left after a crash or restart is replayed in order.
+    Old rows are trimmed by count and age so an outage cannot fill the disk.
+
+    The dispatcher calls it from worker threads (asyncio.to_thread) so disk writes
+    never block the event loop; one lock serialises use of the connection.
+    """
+
+    def __init__(self, path=LOG_SPOOL_PATH, max_entries=LOG_SPOOL_MAX_ENTRIES, max_age_hours=LOG_SPOOL_MAX_AGE_HOURS):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_hours * 3600
+        self._conn = None
+        self._lock = threading.RLock()
+
+        self.appended = 0
+        self.delivered = 0
+        self.expired = 0
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS log_spool ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'channel_id INTEGER NOT NULL, '
+                'payload TEXT NOT NULL, '
+                'created_at REAL NOT NULL)'
+            )
+        return self._conn
+
+    def append_many(self, rows):
+        """Persist (channel_id, embed_dict) rows in one transaction and return their spool IDs"""
+        if not rows:
+            return []
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN')
+            try:
+                spool_ids = [
+                    conn.execute(
+                        'INSERT INTO log_spool (channel_id, payload, created_at) VALUES (?, ?, ?)',
+                        (int(channel_id), json.dumps(embed_dict, default=str), now)
+                    ).lastrowid
+                    for channel_id, embed_dict in rows
+                ]
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            before = self.appended
+            self.appended += len(spool_ids)
+            if self.appended // 1000 != before // 1000:
+                self.trim()
+        return spool_ids
+
+    def ack(self, spool_ids):
+        """Forget entries that were delivered (or deliberately dropped)"""
+        spool_ids = [spool_id for spool_id in spool_ids if spool_id is not None]
+        if not spool_ids:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN')
+            try:
+                conn.executemany('DELETE FROM log_spool WHERE id = ?', [(spool_id,) for spool_id in spool_ids])
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self.delivered += len(spool_ids)
+
+    def last_id(self):
+        """Highest spool ID written so far (0 when empty)"""
+        with self._lock:
+            return self._connection().execute('SELECT COALESCE(MAX(id), 0) FROM log_spool').fetchone()[0]
+
+    def pending(self, upto=None):
+        """Yield (spool_id, channel_id, embed_dict) for undelivered entries (up to an ID), oldest first"""
+        query = 'SELECT id, channel_id, payload FROM log_spool'
+        params = ()
+        if upto is not None:
+            query += ' WHERE id <= ?'
+            params = (upto,)
+        with self._lock:
+            rows = self._connection().execute(query + ' ORDER BY id', params).fetchall()
+        for spool_id, channel_id, payload in rows:
+            try:
+                yield spool_id, channel_id, json.loads(payload)
+            except ValueError:
+                self.ack([spool_id])
+
+    def trim(self):
+        """Drop entries beyond the age and count limits; returns how many were dropped"""
+        with self._lock:
+            conn = self._connection()
+            dropped = conn.execute('DELETE FROM log_spool WHERE created_at < ?', (time.time() - self.max_age,)).rowcount
+            count = conn.execute('SELECT COUNT(*) FROM log_spool').fetchone()[0]
+            if count > self.max_entries:
+                dropped += conn.execute(
+                    'DELETE FROM log_spool WHERE id IN (SELECT id FROM log_spool ORDER BY id LIMIT ?)',
+                    (count - self.max_entries,)
+                ).rowcount
+            self.expired += dropped
+            return dropped
+
+    def stats(self):
+        """Return spool size, age of the oldest undelivered entry (lag) and counters"""
+        with self._lock:
+            conn = self._connection()
+            count, oldest = conn.execute('SELECT COUNT(*), MIN(created_at) FROM log_spool').fetchone()
+            page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        return {
+            'path': self.path,
+            'entries': count,
+            'bytes': page_count * page_size,
+            'lag_seconds': round(time.time() - oldest, 1) if oldest else 0.0,
+            'appended': self.appended,
+            'delivered': self.delivered,
+            'expired': self.expired,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def open_spool():
+    """Return the configured LogSpool, or None when disabled or the file cannot be opened"""
+    if not LOG_SPOOL_PATH:
+        return None
+    spool = LogSpool()
+    try:
+        spool._connection()
+    except sqlite3.Error as e:
+        print(f"⚠️ Log spool unavailable ({LOG_SPOOL_PATH}): {e} - logs are kept in memory only")
+        return None
+    return spool
@@ -0,0 +1,76 @@
+"""Webhook transport for RXT ENGINE bot - organized log channels are written through their own webhook"""
+
+import asyncio
+import os
+
+import discord
+
+# Set to 'false' to keep every log on the bot's own channel.send
+LOG_WEBHOOKS_ENABLED = os.getenv('LOG_WEBHOOKS_ENABLED', 'true').lower() != 'false'
+LOG_WEBHOOK_NAME = "RXT ENGINE Logs"
+
+
+class LogWebhookRegistry:
+    """Log channel ID -> webhook, persisted in the log_webhooks collection.
+
+    Webhook sends have their own rate limit per webhook, so log volume does not use
+    the bot's per-channel/global budget shared with command responses. A webhook that
+    was deleted or lost its permissions is forgotten and the channel falls back to the
+    bot transport.
+    """
+
+    def __init__(self):
+        self._webhooks = {}
+        self._db = None
+        self.loaded = False
+
+    async def load(self, db, bot):
+        """Read every stored webhook (once per process); webhooks share the bot's HTTP session"""
+        self._db = db
+        if db is None or self.loaded or not LOG_WEBHOOKS_ENABLED:
+            return
+        async for document in db.log_webhooks.find({}, {'channel_id': 1, 'url': 1}):
+            try:
+                self._webhooks[int(document['channel_id'])] = discord.Webhook.from_url(document['url'], client=bot)
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.loaded = True
+        print(f"✅ Log webhooks loaded ({len(self._webhooks)} channels)")
+
+    def get(self, channel_id):
+        """Return the webhook for a log channel, or None to use channel.send"""
+        if not LOG_WEBHOOKS_ENABLED:
+            return None
+        return self._webhooks.get(channel_id)
+
+    async def create(self, channel, avatar=None):
+        """Create and store a webhook for a newly created log channel; returns it or None"""
+        if not LOG_WEBHOOKS_ENABLED:
+            return None
+        try:
+            webhook = await channel.create_webhook(name=LOG_WEBHOOK_NAME, avatar=avatar, reason="RXT ENGINE log delivery")
+        except discord.HTTPException as e:
+            print(f"⚠️ Could not create log webhook for #{channel.name}: {e} - using the bot transport")
+            return None
+        self._webhooks[channel.id] = webhook
+        if self._db is not None:
+            await self._db.log_webhooks.update_one(
+                {'channel_id': str(channel.id)},
+                {'$set': {'guild_id': str(channel.guild.id), 'url': webhook.url}},
+                upsert=True
+            )
+        return webhook
+
+    def forget(self, channel_id):
+        """Drop a channel's webhook (channel deleted, webhook removed or rejected)"""
+        if self._webhooks.pop(channel_id, None) is None:
+            return
+        if self._db is not None:
+            asyncio.create_task(self._db.log_webhooks.delete_one({'channel_id': str(channel_id)}))
+
+    def __len__(self):
+        return len(self._webhooks)
+
+
+# Shared instance - lives in its own module so every importer of main sees the same registry
+log_webhooks = LogWebhookRegistry()
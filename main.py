@@ -10,8 +10,10 @@ import random
 import sys
 from datetime import datetime, timedelta
 import motor.motor_asyncio
+from pymongo import ReturnDocument
 from typing import Optional, Union
 import json
+import copy
 from PIL import Image, ImageDraw, ImageFont
 import io
 import requests
@@ -26,51 +28,164 @@ from brand_config import (
 # Owner configuration
 BOT_OWNER_ID = os.getenv('BOT_OWNER_ID')  # Get owner ID from environment
 
-# MongoDB setup
+# MongoDB setup (command_stats records per-collection latency, see db_monitor.py)
+from db_monitor import command_stats, start_stats_server
 MONGO_URI = os.getenv('MONGO_URI')
 if MONGO_URI:
-    mongo_client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+    mongo_client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, event_listeners=[command_stats])
     db = mongo_client.rxt_engine_bot
 else:
     mongo_client = None
     db = None
 
-# Cache for server settings
-server_cache = {}
+# Cache for server settings (shared read-through cache, see config_cache.py)
+from config_cache import server_cache, HOT_CONFIG_FIELDS
+from server_config import compile_server_config, forget_server_config
+from log_routing import compile_log_router, forget_log_router
+from log_digest import log_digester
+from config_sync import stamp_update, apply_local_write, start_config_sync
+from write_buffer import counter_buffer
+from log_dispatcher import log_dispatcher
+from console_buffer import console_buffer
+from global_log_channels import global_log_channels
+from message_store import message_store
+from log_webhooks import log_webhooks
+from voice_log import voice_log
+from bot_logging import get_logger, set_level, levels as log_levels, LEVEL_NAMES, DEBUG as DEBUG_LEVEL
+
+log = get_logger('main')
+import guild_records
+guild_records.setup(db)
 
 # Bot setup
 intents = discord.Intents.all()
 intents.message_content = True  # Explicitly enable message content intent
-bot = commands.Bot(command_prefix='!', intents=intents, case_insensitive=True)
+class RXTBot(commands.Bot):
+    async def close(self):
+        # Pending coalesced voice lines go into the log queue before it is flushed
+        try:
+            await voice_log.flush_all()
+        except Exception as e:
+            print(f"❌ Failed to flush voice logs on shutdown: {e}")
+        # Write out buffered counter deltas before the connection goes away
+        try:
+            await counter_buffer.close()
+        except Exception as e:
+            print(f"❌ Failed to flush counter buffer on shutdown: {e}")
+        try:
+            await log_dispatcher.close()
+        except Exception as e:
+            print(f"❌ Failed to flush queued logs on shutdown: {e}")
+        await super().close()
+
+bot = RXTBot(command_prefix='!', intents=intents, case_insensitive=True)
 bot.remove_command('help')
 bot.start_time = time.time()
 
+async def _load_server_data(guild_id):
+    """Load a server configuration document from the database (cache miss path)"""
+    return await db.servers.find_one({'guild_id': guild_id}) or {}
+
+server_cache.set_loader(_load_server_data)
+
 async def get_server_data(guild_id):
-    """Get server configuration from database"""
+    """Get server configuration (private copy, safe to mutate)"""
     guild_id = str(guild_id)
     if db is not None:
-        return await db.servers.find_one({'guild_id': guild_id}) or {}
+        return copy.deepcopy(await server_cache.get(guild_id))
     return {}
 
+async def get_cached_server_data(guild_id):
+    """Get server configuration for read-only use on hot paths (shared with the cache, never mutate)"""
+    guild_id = str(guild_id)
+    if db is not None:
+        return await server_cache.get(guild_id, partial_ok=True)
+    return {}
+
+async def get_server_config(guild_id):
+    """Get the typed ServerConfig (IDs already parsed to int) for hot-path handlers"""
+    return compile_server_config(guild_id, await get_cached_server_data(guild_id))
+
+async def _bulk_load_server_data(guild_ids):
+    """Load the hot config fields of many guilds with batched $in queries"""
+    projection = {field: 1 for field in HOT_CONFIG_FIELDS}
+    documents = {}
+    for start in range(0, len(guild_ids), 500):
+        batch = guild_ids[start:start + 500]
+        async for document in db.servers.find({'guild_id': {'$in': batch}}, projection):
+            documents[document['guild_id']] = document
+    return documents
+
+async def preload_server_data(guilds):
+    """Warm the config cache for the given guilds (hot fields only) in one batched read"""
+    if db is None:
+        return 0
+    loaded = await server_cache.preload([guild.id for guild in guilds], _bulk_load_server_data, HOT_CONFIG_FIELDS)
+    return loaded
+
 async def update_server_data(guild_id, data):
     """Update server configuration in database"""
     guild_id = str(guild_id)
     if db is not None:
         await db.servers.update_one(
             {'guild_id': guild_id},
-            {'$set': data},
+            stamp_update({'$set': data}),
             upsert=True
         )
-    # Update cache
-    if guild_id not in server_cache:
-        server_cache[guild_id] = {}
-    server_cache[guild_id].update(data)
+        # Write-through so the next read sees this change without a round trip
+        apply_local_write(guild_id, data)
 
-async def log_action(guild_id, log_type, message):
-    """Log actions to appropriate channels with support for single channel, organized, and global logging"""
-    server_data = await get_server_data(guild_id)
-    
-    # Try global logging first (async fire-and-forget)
+async def update_server_fields(guild_id, set_fields=None, unset_fields=None, inc_fields=None):
+    """Atomically update individual fields of the server document.
+
+    Paths may be dotted (e.g. 'security_config.<key>'), so hot writers only touch the
+    keys they change instead of rewriting whole maps, and concurrent writers of different
+    keys cannot overwrite each other.
+    """
+    guild_id = str(guild_id)
+    update = {}
+    if set_fields:
+        update['$set'] = set_fields
+    if unset_fields:
+        update['$unset'] = {path: "" for path in unset_fields}
+    if inc_fields:
+        update['$inc'] = inc_fields
+    if not update or db is None:
+        return
+    await db.servers.update_one(
+        {'guild_id': guild_id},
+        stamp_update(update),
+        upsert=True
+    )
+    apply_local_write(guild_id, set_fields, unset_fields, inc_fields)
+
+async def increment_server_field(guild_id, path, amount=1):
+    """Atomically increment a (dotted) field of the server document and return its new value"""
+    guild_id = str(guild_id)
+    if db is None:
+        return amount
+    result = await db.servers.find_one_and_update(
+        {'guild_id': guild_id},
+        stamp_update({'$inc': {path: amount}}),
+        projection={path: 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    value = result or {}
+    for part in path.split('.'):
+        value = value.get(part, {}) if isinstance(value, dict) else {}
+    value = value if isinstance(value, (int, float)) else amount
+    apply_local_write(guild_id, {path: value})
+    return value
+
+async def get_log_route(guild_id, log_type):
+    """Return the compiled LogRoute and router for a log type of a guild"""
+    config = await get_server_config(guild_id)
+    router = compile_log_router(guild_id, config)
+    return router.route(log_type), router
+
+def _mirror_global_log(guild_id, log_type, message):
+    """Send a copy to the owner's global logging category (fire-and-forget)"""
     try:
         guild = bot.get_guild(int(guild_id))
         if guild:
@@ -78,148 +193,64 @@ async def log_action(guild_id, log_type, message):
             asyncio.create_task(send_global_log(log_type, message, guild))
     except Exception as e:
         print(f"Global logging attempt error: {e}")
-    
-    # Determine target color based on log type
-    color_map = {
-        "general": BrandColors.INFO,
-        "moderation": BrandColors.DANGER,
-        "setup": BrandColors.WARNING,
-        "communication": BrandColors.SUCCESS,
-        "karma": BrandColors.PRIMARY,
-        "tickets": BrandColors.INFO,
-        "ticket": BrandColors.INFO,
-        "reaction_role": BrandColors.ACCENT,
-        "reaction": BrandColors.ACCENT,
-        "welcome": BrandColors.SUCCESS,
-        "voice": BrandColors.PRIMARY,
-        "voice-log": BrandColors.PRIMARY,
-        "timed_roles": BrandColors.WARNING,
-        "timed": BrandColors.WARNING,
-        "security": BrandColors.DANGER,
-        "profile": BrandColors.INFO,
-        "utility": BrandColors.INFO,
-        "quarantine": BrandColors.WARNING,
-        "anti-raid": BrandColors.DANGER,
-        "anti-nuke": BrandColors.DANGER,
-        "automod": BrandColors.WARNING,
-        "join-leave": BrandColors.SUCCESS,
-        "role-update": BrandColors.INFO,
-        "channel-update": BrandColors.INFO,
-        "message-delete": BrandColors.WARNING,
-        "message-edit": BrandColors.WARNING,
-        "member-ban": BrandColors.DANGER,
-        "member-kick": BrandColors.DANGER,
-        "ticket-log": BrandColors.PRIMARY,
-        "economy-log": BrandColors.SECONDARY,
-        "music-log": BrandColors.SECONDARY,
-        "command-log": BrandColors.INFO,
-        "error-log": BrandColors.DANGER,
-        "system": BrandColors.INFO,
-        "events": BrandColors.PRIMARY,
-        "ai_chat": BrandColors.ACCENT,
-        "ai": BrandColors.ACCENT
-    }
 
-    # Check for single log channel
-    single_log = server_data.get('log_channel')
-    if single_log:
-        channel = bot.get_channel(int(single_log))
+def _submit_log(destinations, embed):
+    for channel_id in destinations:
+        channel = bot.get_channel(channel_id)
         if channel:
-            embed = discord.Embed(
-                description=message,
-                color=color_map.get(log_type, BrandColors.INFO),
-                timestamp=datetime.now()
-            )
-            embed.set_footer(text=f"{BOT_FOOTER} • {log_type.title()}", icon_url=bot.user.display_avatar.url)
-            try:
-                await channel.send(embed=embed)
-                return
-            except Exception as e:
-                print(f"Error sending single log: {e}")
-
-    # Check for organized logging system
-    organized_logs = server_data.get('organized_log_channels', {})
-    if organized_logs:
-        # Map log types to organized channels
-        log_mapping = {
-            "general": "general",
-            "moderation": "moderation",
-            "setup": "setup",
-            "communication": "communication",
-            "karma": "karma",
-            "tickets": "ticket-log",
-            "ticket": "ticket-log",
-            "reaction_role": "reaction",
-            "welcome": "join-leave",
-            "voice": "voice-log",
-            "timed_roles": "timed",
-            "security": "security",
-            "quarantine": "security",
-            "anti-raid": "security",
-            "anti-nuke": "security",
-            "antirole": "security",
-            "automod": "automod",
-            "join-leave": "join-leave",
-            "role-update": "role-update",
-            "channel-update": "channel-update",
-            "message-delete": "message-delete",
-            "message-edit": "message-edit",
-            "member-ban": "member-ban",
-            "member-kick": "member-kick",
-            "command-log": "general",
-            "error-log": "error-log",
-            "music-log": "music-log",
-            "economy-log": "economy-log",
-            "system": "system",
-            "profile": "general",
-            "utility": "general"
-        }
+            log_dispatcher.submit(channel, embed)
 
-        mapped_channel = log_mapping.get(log_type, log_type)
-        if mapped_channel in organized_logs:
-            channel = bot.get_channel(int(organized_logs[mapped_channel]))
-            if channel:
-                embed = discord.Embed(
-                    description=message,
-                    color=color_map.get(log_type, BrandColors.INFO),
-                    timestamp=datetime.now()
-                )
-                embed.set_footer(text=f"{BOT_FOOTER} • {log_type.title()}", icon_url=bot.user.display_avatar.url)
-                try:
-                    await channel.send(embed=embed)
-                    return
-                except Exception as e:
-                    print(f"Error sending organized log: {e}")
-
-async def has_permission(interaction, permission_level):
-    """Check if user has required permission level"""
-    if interaction.user.id == interaction.guild.owner_id:
-        return True
+async def log_action(guild_id, log_type, message):
+    """Log actions to the channels routed for log_type (see log_routing.py) and the global log.
 
-    server_data = await get_server_data(interaction.guild.id)
+    Embeds are queued on log_dispatcher and sent in batches, so this returns without
+    waiting on Discord. High-rate repeats are collapsed into digests (see log_digest.py).
+    """
+    route, router = await get_log_route(guild_id, log_type)
+    if router.sampled_out(log_type, route):
+        return
+    if not log_digester.offer(guild_id, log_type, message, route.digest_threshold, route.digest_window):
+        return
+    _deliver_log(guild_id, log_type, message, route)
 
-    if permission_level == "main_moderator":
-        main_mod_role_id = server_data.get('main_moderator_role')
-        if main_mod_role_id:
-            main_mod_role = interaction.guild.get_role(int(main_mod_role_id))
-            return main_mod_role in interaction.user.roles
+def _deliver_log(guild_id, log_type, message, route):
+    if route.mirror:
+        _mirror_global_log(guild_id, log_type, message)
 
-    elif permission_level == "junior_moderator":
-        # Junior mods can access if they have junior role OR main role
-        junior_mod_role_id = server_data.get('junior_moderator_role')
-        main_mod_role_id = server_data.get('main_moderator_role')
+    if route.destinations:
+        embed = discord.Embed(
+            description=message,
+            color=route.color,
+            timestamp=datetime.now()
+        )
+        embed.set_footer(text=f"{BOT_FOOTER} • {log_type.title()}", icon_url=bot.user.display_avatar.url)
+        _submit_log(route.destinations, embed)
+
+async def _deliver_digest(guild_id, log_type, summary):
+    """Send a digest summary along the log type's route (no sampling or digesting)"""
+    route, _ = await get_log_route(guild_id, log_type)
+    _deliver_log(guild_id, log_type, summary, route)
+
+async def log_embed(guild_id, log_type, embed, mirror_text=None):
+    """Route a prebuilt embed like log_action; mirror_text (if given) goes to the global log"""
+    route, router = await get_log_route(guild_id, log_type)
+    if router.sampled_out(log_type, route):
+        return
+    digest_text = mirror_text or embed.title or embed.description or ''
+    if not log_digester.offer(guild_id, log_type, digest_text, route.digest_threshold, route.digest_window):
+        return
 
-        if junior_mod_role_id:
-            junior_mod_role = interaction.guild.get_role(int(junior_mod_role_id))
-            if junior_mod_role in interaction.user.roles:
-                return True
+    if route.mirror and mirror_text:
+        _mirror_global_log(guild_id, log_type, mirror_text)
+    _submit_log(route.destinations, embed)
 
-        if main_mod_role_id:
-            main_mod_role = interaction.guild.get_role(int(main_mod_role_id))
-            if main_mod_role in interaction.user.roles:
-                return True
+async def has_permission(interaction, permission_level):
+    """Check if user has required permission level"""
+    if interaction.user.id == interaction.guild.owner_id:
+        return True
 
-    return False
+    config = await get_server_config(interaction.guild.id)
+    return config.roles.has_level(interaction.user, permission_level)
 
 # Karma system will be handled in xp_commands.py (now karma_commands.py)
 
@@ -306,6 +337,21 @@ async def on_ready():
         status_task_started = True
         print("✅ Rotating status task started (3s interval)")
     
+    # Apply the MongoDB index registry before background tasks start querying
+    try:
+        from db_indexes import setup_indexes
+        await setup_indexes(db)
+    except Exception as e:
+        print(f"❌ CRITICAL: Database index setup failed: {e}")
+
+    # Warm the config cache for every guild before events start hitting it
+    try:
+        loaded = await preload_server_data(bot.guilds)
+        if server_cache.warmup:
+            print(f"✅ Config cache warmed: {loaded} guilds in {server_cache.warmup['seconds'] * 1000:.0f}ms")
+    except Exception as e:
+        print(f"⚠️ Config cache preload failed: {e}")
+
     # Add invite tracker cog if not already added
     try:
         import invite_tracker
@@ -365,6 +411,32 @@ async def on_ready():
     # Start MongoDB ping task
     if mongo_client:
         bot.loop.create_task(ping_mongodb())
+        try:
+            await start_stats_server()
+        except Exception as e:
+            print(f"⚠️ Failed to start DB stats endpoint: {e}")
+
+    # Keep the config cache in sync with writes from other processes (CONFIG_SYNC_MODE)
+    start_config_sync(db)
+
+    # Flush buffered karma/voice counters in the background
+    counter_buffer.start(db)
+
+    # Webhooks of organized log channels, bound to this process's HTTP session (see log_webhooks.py)
+    try:
+        await log_webhooks.load(db, bot)
+    except Exception as e:
+        print(f"⚠️ Failed to load log webhooks: {e}")
+
+    # Open the log spool and re-send embeds a previous run never delivered (see log_spool.py)
+    await log_dispatcher.start(bot)
+
+    # Digest summaries go out through this process's running bot
+    log_digester.bind(_deliver_digest)
+    voice_log.bind(_deliver_voice_log)
+
+    # Move legacy per-guild maps out of the servers documents (see guild_records.py)
+    guild_records.start_record_migration()
 
 
     # Initialize server list monitoring
@@ -402,6 +474,11 @@ async def on_ready():
 @bot.event
 async def on_guild_join(guild):
     """Handle joining new server"""
+    try:
+        await preload_server_data([guild])
+    except Exception as e:
+        print(f"⚠️ Config preload failed for {guild.name}: {e}")
+
     # Update server list immediately
     try:
         from server_list import on_guild_join_server_list_update
@@ -412,6 +489,14 @@ async def on_guild_join(guild):
 @bot.event
 async def on_guild_remove(guild):
     """Handle leaving server"""
+    forget_server_config(guild.id)
+    forget_log_router(guild.id)
+    message_store.discard_guild(guild.id)
+    try:
+        import rxt_security
+        rxt_security.forget_security_policy(guild.id)
+    except ImportError:
+        pass
     # Update server list immediately
     try:
         from server_list import on_guild_remove_server_list_update
@@ -426,29 +511,8 @@ async def has_permission_user(member, guild, permission_level):
     if member.id == guild.owner_id:
         return True
 
-    server_data = await get_server_data(guild.id)
-
-    if permission_level == "main_moderator":
-        main_mod_role_id = server_data.get('main_moderator_role')
-        if main_mod_role_id:
-            main_mod_role = guild.get_role(int(main_mod_role_id))
-            return main_mod_role in member.roles
-
-    elif permission_level == "junior_moderator":
-        junior_mod_role_id = server_data.get('junior_moderator_role')
-        main_mod_role_id = server_data.get('main_moderator_role')
-
-        if junior_mod_role_id:
-            junior_mod_role = guild.get_role(int(junior_mod_role_id))
-            if junior_mod_role in member.roles:
-                return True
-
-        if main_mod_role_id:
-            main_mod_role = guild.get_role(int(main_mod_role_id))
-            if main_mod_role in member.roles:
-                return True
-
-    return False
+    config = await get_server_config(guild.id)
+    return config.roles.has_level(member, permission_level)
 
 # Command error handler for automatic help
 @bot.event
@@ -579,12 +643,12 @@ async def on_member_join(member):
     except:
         pass
 
-    server_data = await get_server_data(member.guild.id)
+    config = await get_server_config(member.guild.id)
 
     # Auto role assignment
-    auto_role_id = server_data.get('auto_role')
+    auto_role_id = config.welcome.auto_role_id
     if auto_role_id:
-        auto_role = member.guild.get_role(int(auto_role_id))
+        auto_role = member.guild.get_role(auto_role_id)
         if auto_role:
             try:
                 await member.add_roles(auto_role, reason="Auto role assignment")
@@ -595,13 +659,13 @@ async def on_member_join(member):
                 print(f"Failed to assign auto role: {e}")
 
     # Send welcome message to channel
-    welcome_channel_id = server_data.get('welcome_channel')
-    welcome_message = server_data.get('welcome_message', f"Welcome {member.mention} to {member.guild.name}!")
-    welcome_title = server_data.get('welcome_title', "⚡ **Quantum Network — New Node Detected**")
-    welcome_image = server_data.get('welcome_image')
+    welcome_channel_id = config.welcome.channel_id
+    welcome_message = config.welcome.message if config.welcome.message is not None else f"Welcome {member.mention} to {member.guild.name}!"
+    welcome_title = config.welcome.title if config.welcome.title is not None else "⚡ **Quantum Network — New Node Detected**"
+    welcome_image = config.welcome.image
 
     if welcome_channel_id:
-        welcome_channel = bot.get_channel(int(welcome_channel_id))
+        welcome_channel = bot.get_channel(welcome_channel_id)
         if welcome_channel:
             # Replace placeholders safely
             formatted_message = welcome_message.replace("{user}", member.mention).replace("{server}", member.guild.name)
@@ -674,8 +738,8 @@ async def on_member_join(member):
     # Send DM to new member (combine server welcome + bot message)
     try:
         # Get server's custom welcome message for DM
-        dm_welcome_message = server_data.get('welcome_message')
-        dm_welcome_title = server_data.get('welcome_title')
+        dm_welcome_message = config.welcome.message
+        dm_welcome_title = config.welcome.title
         
         # Build DM embed with server's message if available
         if dm_welcome_message:
@@ -721,17 +785,25 @@ async def on_member_join(member):
 @bot.event
 async def on_message(message):
     """Handle all message events including DMs and security checks"""
-    print(f"🟢 [DEBUG] on_message triggered! Author: {message.author}, Bot: {message.author.bot}")
+    log.debug("🟢 [DEBUG] on_message triggered! Author: %s, Bot: %s", message.author, message.author.bot, sample=100)
     
     # Process commands first
     await bot.process_commands(message)
     
     # Skip bot messages
     if message.author.bot:
-        print(f"🤖 [DEBUG] Skipping bot message from {message.author}")
+        log.debug("🤖 [DEBUG] Skipping bot message from %s", message.author, sample=100)
         return
     
-    print(f"🔍 [ON_MESSAGE] Message from {message.author} in {message.guild.name if message.guild else 'DM'}: {message.content[:100]}")
+    if log.enabled_for(DEBUG_LEVEL):
+        log.debug("🔍 [ON_MESSAGE] Message from %s in %s: %s", message.author, message.guild.name if message.guild else 'DM', message.content[:100], sample=100)
+
+    # Remember content for delete/edit logs of messages that fall out of discord.py's cache
+    if message.guild and message.content:
+        config = await get_server_config(message.guild.id)
+        if config.logging.message_store_enabled:
+            message_store.put(message.guild.id, message.id, message.author.id, message.channel.id,
+                              message.content, message.created_at.timestamp())
     
     # Handle Reaction Role Setup (text-based command)
     if message.guild and message.content.startswith("reaction role setup"):
@@ -779,15 +851,13 @@ async def on_message(message):
     
     # Handle AI chat in designated channels (must be after reaction role check)
     if message.guild:
-        print(f"📤 [AI HANDLER] handle_ai_message is: {handle_ai_message}")
         if handle_ai_message:
             try:
-                print(f"🚀 [AI HANDLER] Calling handle_ai_message for: {message.content[:50]}")
                 await handle_ai_message(message)
             except Exception as e:
-                print(f"❌ [AI CHAT ERROR] {e}")
+                log.error("❌ [AI CHAT ERROR] %s", e)
         else:
-            print(f"⚠️ [AI HANDLER] handle_ai_message is None!")
+            log.warning("⚠️ [AI HANDLER] handle_ai_message is None!", sample=1000)
     
     # Handle DM mentions
     if not message.guild:  # This is a DM
@@ -885,6 +955,7 @@ async def on_message_delete(message):
     
     if not message.guild:
         return
+    message_store.pop(message.guild.id, message.id)
     
     # Create embed for deleted message
     embed = discord.Embed(
@@ -901,8 +972,8 @@ async def on_message_delete(message):
     embed.set_footer(text=f"{BOT_FOOTER} • User ID: {message.author.id}", icon_url=bot.user.display_avatar.url)
     embed.set_thumbnail(url=message.author.display_avatar.url)
     
-    # Log to message-delete log channel via advanced logging system
-    await log_action(message.guild.id, "message-delete", f"🗑️ [MESSAGE DELETE] {message.author} in {message.channel.mention}\nContent: {message.content[:100] if message.content else '(No text content)'}")
+    # Log to message-delete log channel(s) and the global log
+    await log_embed(message.guild.id, "message-delete", embed, f"🗑️ [MESSAGE DELETE] {message.author} in {message.channel.mention}\nContent: {message.content[:100] if message.content else '(No text content)'}")
 
 @bot.event
 async def on_message_edit(before, after):
@@ -916,6 +987,9 @@ async def on_message_edit(before, after):
     # Ignore if content didn't actually change
     if before.content == after.content:
         return
+    if (await get_server_config(after.guild.id)).logging.message_store_enabled:
+        message_store.put(after.guild.id, after.id, after.author.id, after.channel.id,
+                          after.content, after.created_at.timestamp())
     
     # Create embed for edited message with before/after content
     embed = discord.Embed(
@@ -935,84 +1009,79 @@ async def on_message_edit(before, after):
     embed.set_footer(text=f"{BOT_FOOTER} • User ID: {after.author.id}", icon_url=bot.user.display_avatar.url)
     embed.set_thumbnail(url=after.author.display_avatar.url)
     
-    # Send to message-edit log channels
-    server_data = await get_server_data(after.guild.id)
-    organized_logs = server_data.get('organized_log_channels', {})
+    # Send to message-edit log channel(s) and the global log
+    await log_embed(after.guild.id, "message-edit", embed, f"✏️ [MESSAGE EDIT] {after.author} in {after.channel.mention}\nBefore: {before_content[:100]}\nAfter: {after_content[:100]}")
+
+@bot.event
+async def on_raw_message_delete(payload):
+    """Log deletes of messages discord.py no longer caches, using the message store"""
+    if payload.cached_message is not None or payload.guild_id is None:
+        return  # Handled by on_message_delete
+    stored = message_store.pop(payload.guild_id, payload.message_id)
+    if stored is None:
+        return
     
-    # Try organized logging first
-    if organized_logs and 'message-edit' in organized_logs:
-        channel = bot.get_channel(int(organized_logs['message-edit']))
-        if channel:
-            try:
-                await channel.send(embed=embed)
-            except Exception as e:
-                print(f"Error sending message edit log: {e}")
+    embed = discord.Embed(
+        title="🗑️ **Message Deleted**",
+        description=f"**Author:** <@{stored.author_id}>\n**Channel:** <#{stored.channel_id}>\n**Content:** {stored.content[:1000]}",
+        color=BrandColors.WARNING,
+        timestamp=datetime.now()
+    )
+    embed.add_field(name="🕒 Sent", value=f"<t:{int(stored.created_at)}:R>", inline=True)
+    embed.set_footer(text=f"{BOT_FOOTER} • User ID: {stored.author_id}", icon_url=bot.user.display_avatar.url)
     
-    # Try single log channel
-    single_log = server_data.get('log_channel')
-    if single_log and not organized_logs:
-        channel = bot.get_channel(int(single_log))
-        if channel:
-            try:
-                await channel.send(embed=embed)
-            except Exception as e:
-                print(f"Error sending message edit to single log: {e}")
+    await log_embed(payload.guild_id, "message-delete", embed, f"🗑️ [MESSAGE DELETE] <@{stored.author_id}> in <#{stored.channel_id}>\nContent: {stored.content[:100]}")
+
+@bot.event
+async def on_raw_bulk_message_delete(payload):
+    """Forget stored content of purged messages"""
+    if payload.guild_id is None:
+        return
+    for message_id in payload.message_ids:
+        message_store.pop(payload.guild_id, message_id)
+
+@bot.event
+async def on_raw_message_edit(payload):
+    """Log edits of messages discord.py no longer caches, using the message store"""
+    if payload.cached_message is not None or payload.guild_id is None:
+        return  # Handled by on_message_edit
+    content = payload.data.get('content')
+    if content is None:
+        return  # Embed-only update (link previews)
+    stored = message_store.get(payload.guild_id, payload.message_id)
+    if stored is None or stored.content == content:
+        return
+    message_store.put(payload.guild_id, payload.message_id, stored.author_id, stored.channel_id, content, stored.created_at)
+    
+    embed = discord.Embed(
+        title="✏️ **Message Edited**",
+        description=f"**Author:** <@{stored.author_id}>\n**Channel:** <#{stored.channel_id}>",
+        color=BrandColors.WARNING,
+        timestamp=datetime.now()
+    )
+    before_content = stored.content[:500]
+    after_content = content[:500] if content else "*No content*"
+    embed.add_field(name="📝 Before", value=f"```{before_content}```", inline=False)
+    embed.add_field(name="✨ After", value=f"```{after_content}```", inline=False)
+    embed.set_footer(text=f"{BOT_FOOTER} • User ID: {stored.author_id}", icon_url=bot.user.display_avatar.url)
     
-    # Also log to global system
-    await log_action(after.guild.id, "message-edit", f"✏️ [MESSAGE EDIT] {after.author} in {after.channel.mention}\nBefore: {before_content[:100]}\nAfter: {after_content[:100]}")
+    await log_embed(payload.guild_id, "message-edit", embed, f"✏️ [MESSAGE EDIT] <@{stored.author_id}> in <#{stored.channel_id}>\nBefore: {before_content[:100]}\nAfter: {after_content[:100]}")
 
 @bot.event
 async def on_voice_state_update(member, before, after):
-    """Log voice channel activities to voice-log channel"""
+    """Log voice channel activities to voice-log channel (coalesced per member, see voice_log.py)"""
     if member.bot:
         return
+    voice_log.record(member, before, after)
 
-    # Member joined a voice channel
-    if before.channel is None and after.channel is not None:
-        await log_action(member.guild.id, "voice-log", f"🔊 [VOICE JOIN] {member} joined {after.channel.name}")
-        try:
-            from global_logging import log_global_activity
-            await log_global_activity("Voice Activity", member.guild.id, member.id, f"Joined voice channel: {after.channel.name}")
-        except:
-            pass
-
-    # Member left a voice channel
-    elif before.channel is not None and after.channel is None:
-        await log_action(member.guild.id, "voice-log", f"🔇 [VOICE LEAVE] {member} left {before.channel.name}")
-        try:
-            from global_logging import log_global_activity
-            await log_global_activity("Voice Activity", member.guild.id, member.id, f"Left voice channel: {before.channel.name}")
-        except:
-            pass
-
-    # Member moved between voice channels
-    elif before.channel is not None and after.channel is not None and before.channel != after.channel:
-        await log_action(member.guild.id, "voice-log", f"🔄 [VOICE MOVE] {member} moved from {before.channel.name} to {after.channel.name}")
-        try:
-            from global_logging import log_global_activity
-            await log_global_activity("Voice Activity", member.guild.id, member.id, f"Moved from {before.channel.name} to {after.channel.name}")
-        except:
-            pass
-
-    # Member was muted/unmuted
-    if before.mute != after.mute:
-        status = "muted" if after.mute else "unmuted"
-        await log_action(member.guild.id, "voice-log", f"🔇 [VOICE MUTE] {member} was {status} in {after.channel.name if after.channel else 'voice'}")
-        try:
-            from global_logging import log_global_activity
-            await log_global_activity("Voice Moderation", member.guild.id, member.id, f"Was {status}")
-        except:
-            pass
-
-    # Member was deafened/undeafened
-    if before.deaf != after.deaf:
-        status = "deafened" if after.deaf else "undeafened"
-        await log_action(member.guild.id, "voice-log", f"🔇 [VOICE DEAF] {member} was {status} in {after.channel.name if after.channel else 'voice'}")
-        try:
-            from global_logging import log_global_activity
-            await log_global_activity("Voice Moderation", member.guild.id, member.id, f"Was {status}")
-        except:
-            pass
+async def _deliver_voice_log(guild_id, member_id, log_text, activity_type, global_text):
+    """Send one coalesced voice line to the voice-log route and the global activity log"""
+    await log_action(guild_id, "voice-log", log_text)
+    try:
+        from global_logging import log_global_activity
+        await log_global_activity(activity_type, guild_id, member_id, global_text)
+    except Exception:
+        pass
 
 @bot.event
 async def on_member_remove(member):
@@ -1092,6 +1161,8 @@ async def on_guild_channel_create(channel):
 @bot.event
 async def on_guild_channel_delete(channel):
     """Log channel deletion to channel-update channel"""
+    global_log_channels.forget_channel(channel.id)
+    log_webhooks.forget(channel.id)
     channel_type = "Category" if isinstance(channel, discord.CategoryChannel) else "Text" if isinstance(channel, discord.TextChannel) else "Voice"
     await log_action(channel.guild.id, "channel-update", f"🗑️ [CHANNEL DELETE] {channel_type} channel {channel.name} was deleted")
 
@@ -1869,6 +1940,79 @@ async def sync_commands(interaction: discord.Interaction):
     except Exception as e:
         await interaction.response.send_message(f"❌ Sync failed: {str(e)}", ephemeral=True)
 
+@bot.tree.command(name="dbstats", description="📊 MongoDB latency and slow query stats (Owner only)")
+@app_commands.describe(reset="Clear the counters after showing them")
+async def db_stats(interaction: discord.Interaction, reset: bool = False):
+    bot_owner_id = os.getenv('BOT_OWNER_ID')
+    if str(interaction.user.id) != bot_owner_id:
+        await interaction.response.send_message("❌ Only the bot owner can use this command!", ephemeral=True)
+        return
+
+    stats = command_stats.snapshot()
+    events = stats['events']
+    warmup = server_cache.warmup
+    warmup_text = f"{warmup['guilds']} guilds in {warmup['seconds'] * 1000:.0f}ms" if warmup else "not run"
+    embed = discord.Embed(
+        title="📊 **Database Command Stats**",
+        description=f"**◆ Window:** {timedelta(seconds=int(stats['uptime_seconds']))}\n"
+                    f"**◆ Commands:** {events['started']} started • {events['succeeded']} ok • {events['failed']} failed\n"
+                    f"**◆ Slow threshold:** {stats['slow_query_ms']:.0f}ms\n"
+                    f"**◆ Config warm-up:** {warmup_text}",
+        color=BrandColors.PRIMARY
+    )
+
+    top_ops = stats['operations'][:10]
+    if top_ops:
+        lines = [
+            f"`{op['collection']}.{op['operation']}` ×{op['count']} • avg {op['avg_ms']}ms • p95 ≤{op['p95_ms']:.0f}ms • max {op['max_ms']}ms"
+            for op in top_ops
+        ]
+        embed.add_field(name="🔥 Top Operations (by total time)", value="\n".join(lines)[:1024], inline=False)
+
+    slow = stats['slow_queries'][-5:]
+    if slow:
+        lines = [f"`{q['collection']}.{q['operation']}` {q['duration_ms']}ms <t:{int(q['at'])}:R>" for q in reversed(slow)]
+        embed.add_field(name=f"🐢 Recent Slow Queries ({len(stats['slow_queries'])})", value="\n".join(lines)[:1024], inline=False)
+
+    logs = log_dispatcher.stats()
+    log_lines = [f"**◆ Queued:** {logs['queued']} in {logs['channels']} channel(s) • {logs['embeds']} sent in {logs['messages']} message(s) ({logs['webhook_messages']} via {logs['webhooks']} webhook(s))",
+                 f"**◆ Dropped:** {logs['dropped']} • **Errors:** {logs['errors']}"]
+    spool = logs['spool']
+    if spool and 'error' not in spool:
+        log_lines.append(f"**◆ Spool:** {spool['entries']} undelivered • {spool['bytes'] // 1024} KiB • lag {spool['lag_seconds']:.0f}s")
+    store = message_store.stats()
+    log_lines.append(f"**◆ Message Store:** {store['messages']} msgs in {store['guilds']} guild(s) • {store['bytes'] // 1024}/{store['max_bytes'] // 1024} KiB • {store['hits']} hits • {store['evictions']} evicted")
+    embed.add_field(name="📨 Log Delivery", value="\n".join(log_lines), inline=False)
+
+    embed.set_footer(text=BOT_FOOTER)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    if reset:
+        command_stats.reset()
+
+@bot.tree.command(name="loglevel", description="🔧 View or set per-module console log levels (Owner only)")
+@app_commands.describe(module="Module name (e.g. main, ai_chat) or * for all", level="New level")
+@app_commands.choices(level=[app_commands.Choice(name=name, value=name) for name in LEVEL_NAMES])
+async def log_level(interaction: discord.Interaction, module: Optional[str] = None, level: Optional[app_commands.Choice[str]] = None):
+    bot_owner_id = os.getenv('BOT_OWNER_ID')
+    if str(interaction.user.id) != bot_owner_id:
+        await interaction.response.send_message("❌ Only the bot owner can use this command!", ephemeral=True)
+        return
+
+    if module and level:
+        set_level(module, level.value)
+        log.warning("🔧 [LOG LEVEL] %s set to %s by %s", module, level.value, interaction.user)
+
+    current = log_levels()
+    lines = [f"`{name}` → **{value}**" for name, value in current.items()]
+    embed = discord.Embed(
+        title="🔧 **Log Levels**",
+        description="\n".join(lines) if lines else "No module loggers registered",
+        color=BrandColors.PRIMARY
+    )
+    embed.set_footer(text=BOT_FOOTER)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 @bot.tree.command(name="contact", description="📞 Get bot contact information and support details")
 async def contact_info(interaction: discord.Interaction):
     await log_action(interaction.guild.id, "general", f"📞 [CONTACT] {interaction.user} viewed contact information")
@@ -2021,20 +2165,15 @@ async def ping_mongodb():
 
 # Console output capture class
 class ConsoleCapture:
-    """Captures print output for live console logging"""
+    """Captures print output for live console logging (drained by advanced_logging.console_output_logger)"""
     def __init__(self, original):
         self.original = original
-        self.buffer = []
     
     def write(self, message):
         """Capture and forward output"""
         self.original.write(message)
         if message and message.strip():
-            try:
-                from advanced_logging import queue_console_output
-                queue_console_output(message.strip())
-            except Exception:
-                pass
+            console_buffer.append(message)
     
     def flush(self):
         """Flush the original stdout"""
@@ -2076,7 +2215,7 @@ except ImportError as e:
 # Import and setup RXT Security System
 try:
     import rxt_security
-    rxt_security.setup(bot, get_server_data, update_server_data, log_action, has_permission, None)
+    rxt_security.setup(bot, get_server_data, update_server_data, log_action, has_permission, None, get_cached_server_data, update_server_fields)
     print("✅ RXT Security System loaded and configured")
 except ImportError as e:
     print(f"⚠️ RXT Security System not found: {e}")
@@ -2133,7 +2272,7 @@ except Exception as e:
 # Import and setup Voice Tracker system
 try:
     import voice_tracker
-    voice_tracker.setup(bot, db, has_permission, log_action)
+    voice_tracker.setup(bot, db, has_permission, log_action, log_embed)
     print("✅ Voice Tracker system loaded")
 except ImportError as e:
     print(f"⚠️ Voice Tracker module not found: {e}")
@@ -0,0 +1,172 @@
+"""Compact message content store for RXT ENGINE bot - serves delete/edit logs for uncached messages"""
+
+import os
+import struct
+import time
+import zlib
+from collections import OrderedDict, deque
+
+# Total bytes for all guilds, and the share any single guild may use
+MESSAGE_STORE_BYTES = int(os.getenv('MESSAGE_STORE_BYTES', str(16 * 1024 * 1024)))
+MESSAGE_STORE_GUILD_BYTES = int(os.getenv('MESSAGE_STORE_GUILD_BYTES', str(2 * 1024 * 1024)))
+# Content is compressed only when that pays for the zlib header
+COMPRESS_MIN_BYTES = 96
+# Approximate per-entry cost of the dict slot, key tuple and bytes header
+ENTRY_OVERHEAD_BYTES = 120
+MAX_CONTENT_CHARS = 2000
+
+# author_id, channel_id, created_at (epoch seconds), compressed flag
+_HEADER = struct.Struct('<QQdB')
+
+
+class StoredMessage:
+    __slots__ = ('message_id', 'author_id', 'channel_id', 'created_at', 'content')
+
+    def __init__(self, message_id, author_id, channel_id, created_at, content):
+        self.message_id = message_id
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.created_at = created_at
+        self.content = content
+
+
+def _pack(author_id, channel_id, created_at, content):
+    raw = content[:MAX_CONTENT_CHARS].encode('utf-8')
+    compressed = len(raw) >= COMPRESS_MIN_BYTES
+    if compressed:
+        packed = zlib.compress(raw, 6)
+        if len(packed) >= len(raw):
+            compressed, packed = False, raw
+    else:
+        packed = raw
+    return _HEADER.pack(author_id, channel_id, created_at, compressed) + packed
+
+
+def _unpack(message_id, blob):
+    author_id, channel_id, created_at, compressed = _HEADER.unpack_from(blob)
+    payload = blob[_HEADER.size:]
+    if compressed:
+        payload = zlib.decompress(payload)
+    return StoredMessage(message_id, author_id, channel_id, created_at, payload.decode('utf-8', 'replace'))
+
+
+class MessageContentStore:
+    """Byte-bounded ring buffer of recent message content for opted-in guilds.
+
+    Records are packed into one bytes object each (IDs, timestamp, zlib-compressed
+    content). A guild over its quota loses its oldest messages; when the total budget
+    is exceeded the oldest messages overall go first.
+    """
+
+    def __init__(self, max_bytes=MESSAGE_STORE_BYTES, guild_bytes=MESSAGE_STORE_GUILD_BYTES):
+        self.max_bytes = max_bytes
+        self.guild_bytes = guild_bytes
+        self._entries = OrderedDict()  # (guild_id, message_id) -> blob, oldest first
+        self._guild_order = {}  # guild_id -> deque of message_ids in insertion order
+        self._guild_usage = {}
+        self._guild_count = {}
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _cost(blob):
+        return len(blob) + ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key):
+        blob = self._entries.pop(key, None)
+        if blob is None:
+            return False
+        cost = self._cost(blob)
+        self.total_bytes -= cost
+        guild_id = key[0]
+        usage = self._guild_usage.get(guild_id, 0) - cost
+        count = self._guild_count.get(guild_id, 0) - 1
+        if count > 0:
+            self._guild_usage[guild_id] = usage
+            self._guild_count[guild_id] = count
+        else:
+            self._guild_usage.pop(guild_id, None)
+            self._guild_count.pop(guild_id, None)
+            self._guild_order.pop(guild_id, None)
+        return True
+
+    def _evict_guild_oldest(self, guild_id):
+        order = self._guild_order.get(guild_id)
+        while order:
+            # Entries removed by delete/global eviction are skipped lazily
+            if self._remove((guild_id, order.popleft())):
+                self.evictions += 1
+                return
+
+    def put(self, guild_id, message_id, author_id, channel_id, content, created_at=None):
+        """Store (or replace) the content of a message"""
+        if not content:
+            return
+        key = (guild_id, message_id)
+        blob = _pack(author_id, channel_id, created_at if created_at is not None else time.time(), content)
+        cost = self._cost(blob)
+        previous = self._entries.get(key)
+        if previous is not None:
+            # Edit: replace in place so the message keeps its age in both orders
+            delta = cost - self._cost(previous)
+            self._entries[key] = blob
+            self._guild_usage[guild_id] += delta
+            self.total_bytes += delta
+            return
+        if cost > self.guild_bytes:
+            return
+
+        while self._guild_usage.get(guild_id, 0) + cost > self.guild_bytes and self._guild_order.get(guild_id):
+            self._evict_guild_oldest(guild_id)
+        while self.total_bytes + cost > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        self._entries[key] = blob
+        order = self._guild_order.setdefault(guild_id, deque())
+        order.append(message_id)
+        self._guild_usage[guild_id] = self._guild_usage.get(guild_id, 0) + cost
+        count = self._guild_count[guild_id] = self._guild_count.get(guild_id, 0) + 1
+        self.total_bytes += cost
+        if len(order) > 2 * count + 64:
+            # Drop IDs already removed by deletes or global eviction
+            self._guild_order[guild_id] = deque(m for m in order if (guild_id, m) in self._entries)
+
+    def get(self, guild_id, message_id):
+        """Return a StoredMessage or None"""
+        blob = self._entries.get((guild_id, message_id))
+        if blob is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _unpack(message_id, blob)
+
+    def pop(self, guild_id, message_id):
+        """Return and forget a message (used for deletes)"""
+        stored = self.get(guild_id, message_id)
+        if stored is not None:
+            self._remove((guild_id, message_id))
+        return stored
+
+    def discard_guild(self, guild_id):
+        """Forget every message of a guild (opt-out or guild removed)"""
+        for message_id in list(self._guild_order.get(guild_id, ())):
+            self._remove((guild_id, message_id))
+
+    def stats(self):
+        return {
+            'messages': len(self._entries),
+            'guilds': len(self._guild_usage),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same store
+message_store = MessageContentStore()
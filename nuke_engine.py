@@ -0,0 +1,130 @@
+"""Actor-centric anti-nuke scoring for RXT Security - weighs every destructive action of an actor together"""
+
+import os
+import time
+from collections import OrderedDict, deque
+
+# Most actors tracked across all guilds; the least recently active go first
+NUKE_TRACKED_ACTORS = int(os.getenv('NUKE_TRACKED_ACTORS', '10000'))
+# Actions kept per actor - a score saturates here, far above any sane threshold
+NUKE_MAX_ACTIONS = 128
+SWEEP_BATCH = 32
+
+# Audit-log action name -> weight; security_config.nuke_weights overrides per action
+DEFAULT_NUKE_WEIGHTS = {
+    'channel_delete': 3,
+    'channel_create': 1,
+    'role_delete': 3,
+    'role_create': 1,
+    'webhook_create': 2,
+    'webhook_delete': 1,
+    'ban': 3,
+    'kick': 2,
+    'member_prune': 5,
+    'role_update': 2,  # Only counted when permissions changed
+    'overwrite_create': 1,
+    'overwrite_update': 1,
+    'overwrite_delete': 1,
+}
+
+
+def compile_weights(overrides):
+    """Merge stored per-action weights over the defaults (invalid values are ignored)"""
+    weights = dict(DEFAULT_NUKE_WEIGHTS)
+    for action, weight in (overrides or {}).items():
+        try:
+            weights[str(action)] = max(0, int(weight))
+        except (TypeError, ValueError):
+            continue
+    return weights
+
+
+def action_name(entry):
+    """Scored action name of an audit-log entry, or None when it does not count"""
+    action = getattr(entry.action, 'name', None)
+    if action == 'role_update' and getattr(entry.after, 'permissions', None) is None:
+        return None  # Name/color edit, not a permission change
+    return action
+
+
+class _ActorScore:
+    __slots__ = ('actions', 'total')
+
+    def __init__(self):
+        self.actions = deque(maxlen=NUKE_MAX_ACTIONS)  # (timestamp, weight, action)
+        self.total = 0
+
+
+class NukeScoreboard:
+    """Weighted sliding-window score per (guild, actor).
+
+    Each actor keeps a deque of its recent actions and their summed weight; adding an
+    action appends and pops expired ones from the left, so updates are amortized O(1).
+    Actors are kept in last-action order: idle ones are swept a few per update and the
+    table never exceeds max_actors.
+    """
+
+    def __init__(self, max_actors=NUKE_TRACKED_ACTORS):
+        self.max_actors = max_actors
+        self._actors = OrderedDict()  # (guild_id, actor_id) -> (window, _ActorScore)
+
+        self.actions = 0
+        self.triggers = 0
+
+    def add(self, guild_id, actor_id, action, weight, window, now=None):
+        """Record one action and return the actor's score within the window"""
+        if now is None:
+            now = time.time()
+        key = (guild_id, actor_id)
+        entry = self._actors.get(key)
+        if entry is None or entry[0] != window:
+            entry = self._actors[key] = (window, entry[1] if entry is not None else _ActorScore())
+        score = entry[1]
+        if len(score.actions) == score.actions.maxlen:
+            score.total -= score.actions[0][1]
+        score.actions.append((now, weight, action))
+        score.total += weight
+        cutoff = now - window
+        while score.actions and score.actions[0][0] <= cutoff:
+            score.total -= score.actions.popleft()[1]
+        self._actors.move_to_end(key)
+        self._sweep(now)
+        self.actions += 1
+        return score.total
+
+    def _sweep(self, now):
+        swept = 0
+        while self._actors and swept < SWEEP_BATCH:
+            key, (window, score) = next(iter(self._actors.items()))
+            if score.actions and score.actions[-1][0] > now - window:
+                break
+            del self._actors[key]
+            swept += 1
+        while len(self._actors) > self.max_actors:
+            self._actors.popitem(last=False)
+
+    def breakdown(self, guild_id, actor_id):
+        """Count of each action type in the actor's current window ("channel_delete ×4, ban ×2")"""
+        entry = self._actors.get((guild_id, actor_id))
+        if entry is None:
+            return ""
+        counts = {}
+        for _, _, action in entry[1].actions:
+            counts[action] = counts.get(action, 0) + 1
+        return ", ".join(f"{action} ×{count}" for action, count in sorted(counts.items(), key=lambda item: -item[1]))
+
+    def tripped(self, guild_id, actor_id):
+        """Forget an actor whose score crossed the threshold, so one burst triggers once"""
+        self._actors.pop((guild_id, actor_id), None)
+        self.triggers += 1
+
+    def stats(self):
+        return {
+            'actors': len(self._actors),
+            'actions': self.actions,
+            'triggers': self.triggers,
+        }
+
+
+# Shared instance - lives in its own module so every importer of rxt_security sees the same scoreboard
+nuke_scoreboard = NukeScoreboard()
@@ -3,7 +3,8 @@ from discord.ext import commands
 from discord import app_commands
 from main import bot, db, has_permission, get_server_data, log_action
 from brand_config import create_permission_denied_embed, create_owner_only_embed,  BOT_FOOTER, BrandColors, create_success_embed, create_error_embed, create_info_embed, create_command_embed, create_warning_embed
-from xp_commands import get_karma_level_info
+from xp_commands import get_karma_level_info, get_karma_data
+from write_buffer import counter_buffer
 from PIL import Image, ImageDraw, ImageFont
 import requests
 from io import BytesIO
@@ -168,6 +169,7 @@ async def create_profile_card(user, guild, karma_data):
 
     # Server rank based on karma
     if db is not None:
+        await counter_buffer.flush()
         users_sorted = await db.karma.find({'guild_id': str(guild.id)}).sort('karma', -1).to_list(None)
         rank = next((i + 1 for i, u in enumerate(users_sorted) if u['user_id'] == str(user.id)), "Unranked")
     else:
@@ -323,7 +325,7 @@ async def profile_card(interaction: discord.Interaction, user: discord.Member =
         karma_data = None
 
         if db is not None:
-            karma_data = await db.karma.find_one({'user_id': str(target_user.id), 'guild_id': str(interaction.guild.id)})
+            karma_data = await get_karma_data(interaction.guild.id, target_user.id)
 
         # Create profile card
         card_image = await create_profile_card(target_user, interaction.guild, karma_data)
@@ -353,7 +355,7 @@ async def profile_card(interaction: discord.Interaction, user: discord.Member =
         print(f"Error creating profile card: {e}")
 
         # Fallback embed if image generation fails
-        karma_data = await db.karma.find_one({'user_id': str(target_user.id), 'guild_id': str(interaction.guild.id)}) if db is not None else None
+        karma_data = await get_karma_data(interaction.guild.id, target_user.id) if db is not None else None
         karma = karma_data.get('karma', 0) if karma_data else 0
 
         embed = discord.Embed(
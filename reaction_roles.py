@@ -5,6 +5,8 @@ from discord import app_commands
 from main import bot
 from brand_config import create_permission_denied_embed, create_owner_only_embed,  BOT_FOOTER, BrandColors, create_success_embed, create_error_embed, create_info_embed, create_command_embed, create_warning_embed
 from main import has_permission, get_server_data, update_server_data, log_action
+import guild_records
+from server_config import compile_reaction_roles
 
 @bot.tree.command(name="reactionrole", description="🎭 Setup reaction roles with multiple emoji/role pairs")
 @app_commands.describe(
@@ -120,18 +122,13 @@ async def reaction_role_setup(
                         await modal_interaction.followup.send(f"⚠️ Failed to add reaction {emoji} - invalid emoji", ephemeral=True)
 
                 # Store reaction role data
-                server_data = await get_server_data(modal_interaction.guild.id)
-                reaction_roles = server_data.get('reaction_roles', {})
-
-                reaction_roles[str(sent_message.id)] = {
+                await guild_records.reaction_roles.update(modal_interaction.guild.id, sent_message.id, set_fields={
                     'channel_id': str(self.channel.id),
                     'pairs': [(emoji, str(role.id)) for emoji, role in pairs],
                     'auto_remove_role_id': str(self.auto_remove_role.id) if self.auto_remove_role else None,
                     'title': self.embed_title,
                     'description': self.embed_description
-                }
-
-                await update_server_data(modal_interaction.guild.id, {'reaction_roles': reaction_roles})
+                })
 
                 # Success response
                 success_embed = discord.Embed(
@@ -202,18 +199,13 @@ async def quick_reaction_role_setup(
         await sent_message.add_reaction(emoji)
 
         # Store reaction role data
-        server_data = await get_server_data(interaction.guild.id)
-        reaction_roles = server_data.get('reaction_roles', {})
-
-        reaction_roles[str(sent_message.id)] = {
+        await guild_records.reaction_roles.update(interaction.guild.id, sent_message.id, set_fields={
             'channel_id': str(channel.id),
             'pairs': [(emoji, str(role.id))],
             'auto_remove_role_id': str(auto_remove_role.id) if auto_remove_role else None,
             'title': "Reaction Roles",
             'description': message
-        }
-
-        await update_server_data(interaction.guild.id, {'reaction_roles': reaction_roles})
+        })
 
         response_embed = discord.Embed(
             title="✅ Quick Reaction Role Setup Complete",
@@ -238,44 +230,38 @@ async def on_raw_reaction_add(payload):
     if not guild:
         return
 
-    server_data = await get_server_data(guild.id)
-    reaction_roles = server_data.get('reaction_roles', {})
+    reaction_roles = compile_reaction_roles(guild.id, await guild_records.reaction_roles.all(guild.id))
 
-    message_id = str(payload.message_id)
-    if message_id in reaction_roles:
-        reaction_data = reaction_roles[message_id]
+    reaction_message = reaction_roles.get(payload.message_id)
+    if reaction_message:
         member = guild.get_member(payload.user_id)
 
         if not member:
             return
 
-        # Check for multiple emoji/role pairs
-        pairs = reaction_data.get('pairs', [])
-        auto_remove_role_id = reaction_data.get('auto_remove_role_id')
-
-        for emoji, role_id in pairs:
-            if str(payload.emoji) == emoji:
-                give_role = guild.get_role(int(role_id))
-                
-                if give_role and member:
-                    try:
-                        # Handle auto-remove role functionality
-                        if auto_remove_role_id:
-                            auto_remove_role = guild.get_role(int(auto_remove_role_id))
-                            if auto_remove_role and auto_remove_role in member.roles:
-                                await member.remove_roles(auto_remove_role, reason="Auto-remove role on reaction role assignment")
-                                await log_action(guild.id, "reaction_role", f"🔄 [AUTO-REMOVE] {auto_remove_role.name} removed from {member}")
-
-                        # Add the reaction role
-                        if give_role not in member.roles:
-                            await member.add_roles(give_role, reason="Reaction role assignment")
-                            await log_action(guild.id, "reaction_role", f"🎭 [REACTION ROLE] {give_role.name} added to {member}")
-
-                    except discord.Forbidden:
-                        print(f"Missing permissions to modify roles for {member}")
-                    except discord.HTTPException as e:
-                        print(f"Failed to modify role: {e}")
-                break
+        auto_remove_role_id = reaction_message.auto_remove_role_id
+        role_id = reaction_message.role_ids.get(str(payload.emoji))
+        if role_id is not None:
+            give_role = guild.get_role(role_id)
+            
+            if give_role and member:
+                try:
+                    # Handle auto-remove role functionality
+                    if auto_remove_role_id:
+                        auto_remove_role = guild.get_role(auto_remove_role_id)
+                        if auto_remove_role and auto_remove_role in member.roles:
+                            await member.remove_roles(auto_remove_role, reason="Auto-remove role on reaction role assignment")
+                            await log_action(guild.id, "reaction_role", f"🔄 [AUTO-REMOVE] {auto_remove_role.name} removed from {member}")
+
+                    # Add the reaction role
+                    if give_role not in member.roles:
+                        await member.add_roles(give_role, reason="Reaction role assignment")
+                        await log_action(guild.id, "reaction_role", f"🎭 [REACTION ROLE] {give_role.name} added to {member}")
+
+                except discord.Forbidden:
+                    print(f"Missing permissions to modify roles for {member}")
+                except discord.HTTPException as e:
+                    print(f"Failed to modify role: {e}")
 
 @bot.event
 async def on_raw_reaction_remove(payload):
@@ -287,55 +273,50 @@ async def on_raw_reaction_remove(payload):
     if not guild:
         return
 
-    server_data = await get_server_data(guild.id)
-    reaction_roles = server_data.get('reaction_roles', {})
+    reaction_roles = compile_reaction_roles(guild.id, await guild_records.reaction_roles.all(guild.id))
 
-    message_id = str(payload.message_id)
-    if message_id in reaction_roles:
-        reaction_data = reaction_roles[message_id]
+    reaction_message = reaction_roles.get(payload.message_id)
+    if reaction_message:
         member = guild.get_member(payload.user_id)
 
         if not member:
             return
 
-        # Check for multiple emoji/role pairs
-        pairs = reaction_data.get('pairs', [])
-        auto_remove_role_id = reaction_data.get('auto_remove_role_id')
-
-        for emoji, role_id in pairs:
-            if str(payload.emoji) == emoji:
-                remove_role = guild.get_role(int(role_id))
-                
-                if remove_role and member:
-                    try:
-                        # Remove the reaction role when unreacting
-                        if remove_role in member.roles:
-                            await member.remove_roles(remove_role, reason="Reaction role removal")
-                            await log_action(guild.id, "reaction_role", f"🎭 [REACTION ROLE] {remove_role.name} removed from {member}")
-
-                        # Restore auto-remove role if enabled and user has no other reaction roles
-                        if auto_remove_role_id:
-                            auto_remove_role = guild.get_role(int(auto_remove_role_id))
-                            if auto_remove_role:
-                                # Check if user has any other reaction roles from this message
-                                has_other_roles = False
-                                for other_emoji, other_role_id in pairs:
-                                    if other_emoji != emoji:
-                                        other_role = guild.get_role(int(other_role_id))
-                                        if other_role and other_role in member.roles:
-                                            has_other_roles = True
-                                            break
-
-                                # Only restore auto-remove role if user has no other reaction roles
-                                if not has_other_roles and auto_remove_role not in member.roles:
-                                    await member.add_roles(auto_remove_role, reason="Auto-remove role restoration")
-                                    await log_action(guild.id, "reaction_role", f"🔄 [AUTO-RESTORE] {auto_remove_role.name} restored to {member}")
-
-                    except discord.Forbidden:
-                        print(f"Missing permissions to modify roles for {member}")
-                    except discord.HTTPException as e:
-                        print(f"Failed to modify role: {e}")
-                break
+        emoji = str(payload.emoji)
+        auto_remove_role_id = reaction_message.auto_remove_role_id
+        role_id = reaction_message.role_ids.get(emoji)
+        if role_id is not None:
+            remove_role = guild.get_role(role_id)
+            
+            if remove_role and member:
+                try:
+                    # Remove the reaction role when unreacting
+                    if remove_role in member.roles:
+                        await member.remove_roles(remove_role, reason="Reaction role removal")
+                        await log_action(guild.id, "reaction_role", f"🎭 [REACTION ROLE] {remove_role.name} removed from {member}")
+
+                    # Restore auto-remove role if enabled and user has no other reaction roles
+                    if auto_remove_role_id:
+                        auto_remove_role = guild.get_role(auto_remove_role_id)
+                        if auto_remove_role:
+                            # Check if user has any other reaction roles from this message
+                            has_other_roles = False
+                            for other_emoji, other_role_id in reaction_message.role_ids.items():
+                                if other_emoji != emoji:
+                                    other_role = guild.get_role(other_role_id)
+                                    if other_role and other_role in member.roles:
+                                        has_other_roles = True
+                                        break
+
+                            # Only restore auto-remove role if user has no other reaction roles
+                            if not has_other_roles and auto_remove_role not in member.roles:
+                                await member.add_roles(auto_remove_role, reason="Auto-remove role restoration")
+                                await log_action(guild.id, "reaction_role", f"🔄 [AUTO-RESTORE] {auto_remove_role.name} restored to {member}")
+
+                except discord.Forbidden:
+                    print(f"Missing permissions to modify roles for {member}")
+                except discord.HTTPException as e:
+                    print(f"Failed to modify role: {e}")
 
 # List reaction roles command
 @bot.tree.command(name="listreactionroles", description="📋 List all active reaction role setups")
@@ -344,8 +325,7 @@ async def list_reaction_roles(interaction: discord.Interaction):
         await interaction.response.send_message(embed=create_permission_denied_embed("Junior Moderator"), ephemeral=True)
         return
 
-    server_data = await get_server_data(interaction.guild.id)
-    reaction_roles = server_data.get('reaction_roles', {})
+    reaction_roles = await guild_records.reaction_roles.all(interaction.guild.id)
 
     if not reaction_roles:
         embed = discord.Embed(
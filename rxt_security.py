@@ -2,93 +2,255 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import os
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict
+from dataclasses import dataclass
 import re
-from collections import defaultdict
+import copy
+from types import MappingProxyType
 from brand_config import BrandColors, VisualElements, BOT_FOOTER
+import guild_records
+from guild_records import VIOLATION_HISTORY_TTL
+from sliding_window import SlidingWindowCounter
+from link_scanner import LinkScanner, compile_link_scanner
+from server_config import parse_id
+from duplicate_flood import duplicate_flood
+from audit_feed import audit_feed
+from nuke_engine import nuke_scoreboard, compile_weights, action_name
 
 # Global logging import (avoid circular import by not importing main)
 _log_to_global = None
 
-user_message_timestamps = defaultdict(lambda: defaultdict(list))
-user_join_timestamps = defaultdict(list)
-user_message_deletion_attempts = defaultdict(lambda: defaultdict(list))
-user_message_deletions_bulk = defaultdict(lambda: defaultdict(list))  # Track bulk deletes by user
+# Sliding-window counters: (guild_id, user_id) for messages and deletes, guild_id for joins
+user_message_rate = SlidingWindowCounter()
+user_join_rate = SlidingWindowCounter(max_events=1000)
+user_message_deletions_bulk = SlidingWindowCounter()  # Track bulk deletes by user
 user_stored_roles = {}
 user_quarantine_info = {}
 user_violation_history = {}  # Persistent violation tracking that survives quarantine expiration
 system_role_actions = set()  # Track (guild_id, user_id) tuples for system-initiated role changes
+quarantines_in_flight = set()  # storage keys whose quarantine is being applied right now
 
 _bot_instance = None
 _get_server_data = None
+_get_cached_server_data = None
 _update_server_data = None
+_update_server_fields = None
 _log_action = None
 _has_permission = None
 _setup_complete = False
 
-async def get_security_config(guild_id: int) -> Dict:
-    server_data = await _get_server_data(guild_id)
-    default_config = {
-        'security_enabled': False,
-        'antiraid_enabled': False,
-        'antinuke_enabled': False,
-        'antilink_enabled': False,
-        'antispam_enabled': False,
-        'massmention_enabled': False,
-        'webhookguard_enabled': False,
-        'antirole_enabled': False,
-        'massdelete_enabled': False,
-        
-        'quarantine_role_id': None,
-        'quarantine_channel_id': None,
-        'quarantine_category_id': None,
-        
-        'whitelist_users': [],
-        'whitelist_roles': [],
-        'whitelist_bots': [],
-        
-        'raid_join_threshold': 10,
-        'raid_time_window': 10,
-        'raid_account_age_days': 7,
-        
-        'spam_message_threshold': 5,
-        'spam_time_window': 5,
-        
-        'allowed_domains': [],
-        'blocked_domains': ['discord.gg', 'bit.ly', 't.co'],
-        
-        'quarantine_base_duration': 900,
-        'mass_delete_threshold': 5,
-        'mass_delete_time_window': 5
-    }
+DEFAULT_SECURITY_CONFIG = {
+    'security_enabled': False,
+    'antiraid_enabled': False,
+    'antinuke_enabled': False,
+    'antilink_enabled': False,
+    'antispam_enabled': False,
+    'massmention_enabled': False,
+    'webhookguard_enabled': False,
+    'antirole_enabled': False,
+    'massdelete_enabled': False,
+    'dupeflood_enabled': False,
+    
+    'quarantine_role_id': None,
+    'quarantine_channel_id': None,
+    'quarantine_category_id': None,
+    
+    'whitelist_users': [],
+    'whitelist_roles': [],
+    'whitelist_bots': [],
+    
+    'raid_join_threshold': 10,
+    'raid_time_window': 10,
+    'raid_account_age_days': 7,
     
-    security_config = server_data.get('security_config', {})
+    'spam_message_threshold': 5,
+    'spam_time_window': 5,
+    
+    'allowed_domains': [],
+    'blocked_domains': ['discord.gg', 'bit.ly', 't.co'],
+    
+    'quarantine_base_duration': 900,
+    'mass_delete_threshold': 5,
+    'mass_delete_time_window': 5,
+    'duplicate_channel_threshold': 5,
+    'duplicate_user_threshold': 6,
+    'duplicate_time_window': 60,
+    'nuke_score_threshold': 10,
+    'nuke_time_window': 60,
+    'nuke_weights': {}
+}
+
+# /security-config settings that are sliding-window lengths (seconds) and must be > 0
+WINDOW_SETTINGS = frozenset({'raid_time_window', 'spam_time_window', 'mass_delete_time_window', 'duplicate_time_window', 'nuke_time_window'})
+
+SUSPICIOUS_USERNAME_PATTERNS = tuple((pattern, re.compile(pattern)) for pattern in ['discord', 'bot', 'fake', 'test', '^[0-9]+$'])
+
+async def get_security_config(guild_id: int) -> Dict:
+    # Read-only cached document; only the security subdocument is copied for callers to mutate
+    server_data = await (_get_cached_server_data or _get_server_data)(guild_id)
+    default_config = copy.deepcopy(DEFAULT_SECURITY_CONFIG)
+    security_config = copy.deepcopy(server_data.get('security_config', {}))
     default_config.update(security_config)
     return default_config
 
+def _number_setting(config, key, default, cast=int):
+    """Stored threshold/window, falling back to the default when unset (None) or invalid"""
+    value = config.get(key)
+    if value is None or value == '':
+        return cast(default)
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return cast(default)
+
+def _id_set(values):
+    ids = set()
+    for value in values or []:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            pass
+    return frozenset(ids)
+
+@dataclass(frozen=True, slots=True)
+class SecurityPolicy:
+    """Immutable, precompiled view of a guild's security_config, rebuilt only when it changes"""
+    security_enabled: bool
+    antiraid_enabled: bool
+    antinuke_enabled: bool
+    antilink_enabled: bool
+    antispam_enabled: bool
+    massmention_enabled: bool
+    webhookguard_enabled: bool
+    antirole_enabled: bool
+    massdelete_enabled: bool
+    dupeflood_enabled: bool
+    quarantine_role_id: Optional[int]
+    quarantine_channel_id: Optional[int]
+    quarantine_base_duration: int
+    whitelist_users: frozenset
+    whitelist_roles: frozenset
+    whitelist_bots: frozenset
+    raid_join_threshold: int
+    raid_time_window: float
+    raid_account_age_days: int
+    spam_message_threshold: int
+    spam_time_window: float
+    mass_delete_threshold: int
+    mass_delete_time_window: float
+    duplicate_channel_threshold: int
+    duplicate_user_threshold: int
+    duplicate_time_window: float
+    nuke_score_threshold: int
+    nuke_time_window: float
+    nuke_weights: MappingProxyType
+    blocked_domains: tuple
+    allowed_domains: tuple
+    link_scanner: Optional[LinkScanner]
+
+    @classmethod
+    def compile(cls, stored_config: Optional[Dict]) -> 'SecurityPolicy':
+        config = dict(DEFAULT_SECURITY_CONFIG)
+        config.update(stored_config or {})
+        role_id = config.get('quarantine_role_id')
+        channel_id = config.get('quarantine_channel_id')
+        blocked = tuple(config.get('blocked_domains') or ())
+        allowed = tuple(config.get('allowed_domains') or ())
+        return cls(
+            security_enabled=bool(config.get('security_enabled')),
+            antiraid_enabled=bool(config.get('antiraid_enabled')),
+            antinuke_enabled=bool(config.get('antinuke_enabled')),
+            antilink_enabled=bool(config.get('antilink_enabled')),
+            antispam_enabled=bool(config.get('antispam_enabled')),
+            massmention_enabled=bool(config.get('massmention_enabled')),
+            webhookguard_enabled=bool(config.get('webhookguard_enabled')),
+            antirole_enabled=bool(config.get('antirole_enabled')),
+            massdelete_enabled=bool(config.get('massdelete_enabled')),
+            dupeflood_enabled=bool(config.get('dupeflood_enabled')),
+            quarantine_role_id=parse_id(role_id),
+            quarantine_channel_id=parse_id(channel_id),
+            quarantine_base_duration=_number_setting(config, 'quarantine_base_duration', 900),
+            whitelist_users=_id_set(config.get('whitelist_users')),
+            whitelist_roles=_id_set(config.get('whitelist_roles')),
+            whitelist_bots=_id_set(config.get('whitelist_bots')),
+            raid_join_threshold=_number_setting(config, 'raid_join_threshold', 10),
+            raid_time_window=_number_setting(config, 'raid_time_window', 10, float),
+            raid_account_age_days=_number_setting(config, 'raid_account_age_days', 7),
+            spam_message_threshold=_number_setting(config, 'spam_message_threshold', 5),
+            spam_time_window=_number_setting(config, 'spam_time_window', 5, float),
+            mass_delete_threshold=_number_setting(config, 'mass_delete_threshold', 5),
+            mass_delete_time_window=_number_setting(config, 'mass_delete_time_window', 5, float),
+            duplicate_channel_threshold=_number_setting(config, 'duplicate_channel_threshold', 5),
+            duplicate_user_threshold=_number_setting(config, 'duplicate_user_threshold', 6),
+            duplicate_time_window=_number_setting(config, 'duplicate_time_window', 60, float),
+            nuke_score_threshold=_number_setting(config, 'nuke_score_threshold', 10),
+            nuke_time_window=_number_setting(config, 'nuke_time_window', 60, float),
+            nuke_weights=MappingProxyType(compile_weights(config.get('nuke_weights'))),
+            blocked_domains=blocked,
+            allowed_domains=allowed,
+            link_scanner=compile_link_scanner(blocked, allowed),
+        )
+
+    def is_whitelisted(self, user) -> bool:
+        guild = getattr(user, 'guild', None)
+        if guild is not None and guild.owner_id == user.id:
+            return True
+        if user.id in self.whitelist_users:
+            return True
+        if user.bot and user.id in self.whitelist_bots:
+            return True
+        if self.whitelist_roles:
+            for role in getattr(user, 'roles', ()):
+                if role.id in self.whitelist_roles:
+                    return True
+        return False
+
+    def find_blocked_link(self, content: str) -> Optional[str]:
+        """Return the first URL in content whose host is blocked (domain or subdomain) and not allowed"""
+        if self.link_scanner is None:
+            return None
+        return self.link_scanner.find_blocked_link(content)
+
+# str(guild_id) -> (security_config subdocument the policy was compiled from, policy), least recent first
+_security_policies = OrderedDict()
+# Compiled policies kept; beyond this the least recently used guild's is recompiled on next use
+SECURITY_POLICY_CACHE_MAX = int(os.getenv('SECURITY_POLICY_CACHE_MAX', '10000'))
+
+async def get_security_policy(guild_id: int) -> SecurityPolicy:
+    """Return the compiled policy, recompiling only when the stored security_config object changes"""
+    server_data = await (_get_cached_server_data or _get_server_data)(guild_id)
+    stored_config = server_data.get('security_config')
+    key = str(guild_id)
+    cached = _security_policies.get(key)
+    # The config cache replaces the subdocument on every write, so identity means unchanged
+    if cached is not None and cached[0] is stored_config:
+        _security_policies.move_to_end(key)
+        return cached[1]
+    policy = SecurityPolicy.compile(stored_config)
+    _security_policies[key] = (stored_config, policy)
+    _security_policies.move_to_end(key)
+    while len(_security_policies) > SECURITY_POLICY_CACHE_MAX:
+        _security_policies.popitem(last=False)
+    return policy
+
+def forget_security_policy(guild_id):
+    """Drop the compiled policy of a guild the bot left"""
+    _security_policies.pop(str(guild_id), None)
+
 async def update_security_config(guild_id: int, config_data: Dict):
     await _update_server_data(guild_id, {'security_config': config_data})
 
+async def set_security_config_field(guild_id: int, key: str, value):
+    # Single-key write so concurrent config edits (e.g. whitelist changes) are not overwritten
+    await _update_server_fields(guild_id, set_fields={f'security_config.{key}': value})
+
 async def is_whitelisted(guild_id: int, user: discord.Member) -> bool:
-    if user.guild.owner_id == user.id:
-        return True
-    
-    config = await get_security_config(guild_id)
-    
-    if user.id in config.get('whitelist_users', []):
-        return True
-    
-    if user.bot and user.id in config.get('whitelist_bots', []):
-        return True
-    
-    user_role_ids = [role.id for role in user.roles]
-    whitelist_roles = config.get('whitelist_roles', [])
-    if any(role_id in whitelist_roles for role_id in user_role_ids):
-        return True
-    
-    return False
+    policy = await get_security_policy(guild_id)
+    return policy.is_whitelisted(user)
 
 async def get_or_create_quarantine_category(guild: discord.Guild, config: Dict):
     category_id = config.get('quarantine_category_id')
@@ -103,7 +265,7 @@ async def get_or_create_quarantine_category(guild: discord.Guild, config: Dict):
     )
     
     config['quarantine_category_id'] = category.id
-    await update_security_config(guild.id, config)
+    await set_security_config_field(guild.id, 'quarantine_category_id', category.id)
     
     return category
 
@@ -133,7 +295,7 @@ async def get_or_create_quarantine_role(guild: discord.Guild, config: Dict):
     )
     
     config['quarantine_role_id'] = role.id
-    await update_security_config(guild.id, config)
+    await set_security_config_field(guild.id, 'quarantine_role_id', role.id)
     
     return role
 
@@ -185,21 +347,35 @@ async def get_or_create_quarantine_channel(guild: discord.Guild, config: Dict, r
     await channel.send(embed=embed)
     
     config['quarantine_channel_id'] = channel.id
-    await update_security_config(guild.id, config)
+    await set_security_config_field(guild.id, 'quarantine_channel_id', channel.id)
     
     return channel
 
-async def apply_quarantine(member: discord.Member, reason: str, violation_type: str = "security_violation"):
+async def apply_quarantine(member: discord.Member, reason: str, violation_type: str = "security_violation") -> bool:
+    """Quarantine a member once; returns False when they are already quarantined or being quarantined.
+
+    Every detector goes through here, so concurrent checks (a per-event listener and the
+    anti-nuke score for the same burst) cannot quarantine one actor twice.
+    """
+    storage_key = f"{member.guild.id}_{member.id}"
+    if storage_key in quarantines_in_flight or storage_key in user_quarantine_info:
+        return False
+    quarantines_in_flight.add(storage_key)
+    try:
+        return await _apply_quarantine(member, reason, violation_type)
+    finally:
+        quarantines_in_flight.discard(storage_key)
+
+async def _apply_quarantine(member: discord.Member, reason: str, violation_type: str):
     storage_key = f"{member.guild.id}_{member.id}"
     config = await get_security_config(member.guild.id)
     
     # Load violation history from MongoDB if not in memory
     if storage_key not in user_violation_history:
         try:
-            server_data = await _get_server_data(member.guild.id)
-            violation_history = server_data.get('violation_history', {})
-            if str(member.id) in violation_history:
-                user_violation_history[storage_key] = violation_history[str(member.id)]
+            history = await guild_records.violation_history.get(member.guild.id, member.id)
+            if history:
+                user_violation_history[storage_key] = history
         except:
             pass
     
@@ -246,28 +422,19 @@ async def apply_quarantine(member: discord.Member, reason: str, violation_type:
             'quarantine_role_id': quarantine_role.id
         }
         
-        # Save quarantine data to MongoDB for persistence
+        # Save quarantine data and persistent violation history to MongoDB (only this member's records)
         try:
-            server_data = await _get_server_data(member.guild.id)
-            if 'quarantine_data' not in server_data:
-                server_data['quarantine_data'] = {}
-            server_data['quarantine_data'][str(member.id)] = {
+            await guild_records.quarantine_records.update(member.guild.id, member.id, set_fields={
                 'roles': [role.id for role in current_roles],
                 'quarantine_until': quarantine_until,
                 'violations': current_violations,
                 'reason': reason,
                 'quarantine_role_id': quarantine_role.id
-            }
-            
-            # Save persistent violation history separately
-            if 'violation_history' not in server_data:
-                server_data['violation_history'] = {}
-            server_data['violation_history'][str(member.id)] = {
+            })  # No expiry: stored roles are kept until restoration deletes the record
+            await guild_records.violation_history.update(member.guild.id, member.id, set_fields={
                 'violations': current_violations,
                 'last_violation_time': time.time()
-            }
-            
-            await _update_server_data(member.guild.id, server_data)
+            }, expires_at=datetime.utcnow() + VIOLATION_HISTORY_TTL)
         except:
             pass
         
@@ -328,9 +495,11 @@ async def apply_quarantine(member: discord.Member, reason: str, violation_type:
             except Exception as e:
                 print(f"Global security logging failed (non-critical): {e}")
         
+        return True
     except Exception as e:
         await _log_action(member.guild.id, "security", 
                         f"⚠️ [QUARANTINE FAILED] {member} - Error: {e}")
+        return False
 
 async def _cleanup_system_action(guild_id: int, user_id: int, delay_seconds: int):
     await asyncio.sleep(delay_seconds)
@@ -413,10 +582,7 @@ async def _execute_quarantine_restoration(member: discord.Member, is_from_reload
         
         # Remove quarantine data from MongoDB but KEEP violation history for persistent tracking
         try:
-            server_data = await _get_server_data(member.guild.id)
-            if 'quarantine_data' in server_data and str(member.id) in server_data['quarantine_data']:
-                del server_data['quarantine_data'][str(member.id)]
-                await _update_server_data(member.guild.id, server_data)
+            await guild_records.quarantine_records.delete(member.guild.id, member.id)
             # Note: We do NOT delete violation_history here - it persists across quarantine cycles
         except:
             pass
@@ -434,17 +600,16 @@ async def remove_quarantine_manual(member: discord.Member):
     if storage_key not in user_stored_roles:
         # Check MongoDB for persisted quarantine data
         try:
-            server_data = await _get_server_data(member.guild.id)
-            quarantine_data = server_data.get('quarantine_data', {})
-            if str(member.id) in quarantine_data:
+            quarantine_record = await guild_records.quarantine_records.get(member.guild.id, member.id)
+            if quarantine_record:
                 # Load from MongoDB
                 user_stored_roles[storage_key] = {
-                    'roles': quarantine_data[str(member.id)].get('roles', []),
+                    'roles': quarantine_record.get('roles', []),
                     'timestamp': time.time(),
                     'duration': 0,
-                    'violations': quarantine_data[str(member.id)].get('violations', 0)
+                    'violations': quarantine_record.get('violations', 0)
                 }
-                user_quarantine_info[storage_key] = quarantine_data[str(member.id)]
+                user_quarantine_info[storage_key] = quarantine_record
             else:
                 return False
         except:
@@ -490,10 +655,7 @@ async def remove_quarantine_manual(member: discord.Member):
         
         # Remove from MongoDB
         try:
-            server_data = await _get_server_data(member.guild.id)
-            if 'quarantine_data' in server_data and str(member.id) in server_data['quarantine_data']:
-                del server_data['quarantine_data'][str(member.id)]
-                await _update_server_data(member.guild.id, server_data)
+            await guild_records.quarantine_records.delete(member.guild.id, member.id)
         except:
             pass
         
@@ -507,8 +669,31 @@ async def remove_quarantine_manual(member: discord.Member):
         return False
 
 
-def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_action_func, has_permission_func, log_to_global_func=None):
-    global _bot_instance, _get_server_data, _update_server_data, _log_action, _has_permission, _setup_complete, _log_to_global
+async def _audit_actor(guild: discord.Guild, entry) -> Optional[discord.Member]:
+    """Member behind an audit-log entry (gateway entries may carry only user_id)"""
+    user_id = getattr(entry, 'user_id', None) or (entry.user.id if entry.user else None)
+    if user_id is None:
+        return None
+    member = guild.get_member(user_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.HTTPException:
+            return None
+    return member
+
+async def _is_trusted_actor(guild: discord.Guild, member: discord.Member, policy: SecurityPolicy) -> bool:
+    """Actors exempt from RXT Security: owner, this bot, whitelisted users/roles, main moderator role"""
+    if member.id == guild.owner_id or member.id == guild.me.id:
+        return True
+    if policy.is_whitelisted(member):
+        return True
+    server_data = await (_get_cached_server_data or _get_server_data)(guild.id)
+    main_mod_role_id = parse_id(server_data.get('main_moderator_role'))
+    return main_mod_role_id is not None and any(role.id == main_mod_role_id for role in member.roles)
+
+def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_action_func, has_permission_func, log_to_global_func=None, get_cached_server_data_func=None, update_server_fields_func=None):
+    global _bot_instance, _get_server_data, _get_cached_server_data, _update_server_data, _update_server_fields, _log_action, _has_permission, _setup_complete, _log_to_global
     
     if _setup_complete:
         print("⚠️ RXT Security System already initialized, skipping duplicate setup")
@@ -516,7 +701,9 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
     
     _bot_instance = bot
     _get_server_data = get_server_data_func
+    _get_cached_server_data = get_cached_server_data_func
     _update_server_data = update_server_data_func
+    _update_server_fields = update_server_fields_func
     _log_action = log_action_func
     _has_permission = has_permission_func
     _log_to_global = log_to_global_func
@@ -548,31 +735,24 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                     except:
                         pass
                 
-                # Also check MongoDB for persisted quarantines that need restoration
-                for guild in bot.guilds:
-                    try:
-                        server_data = await _get_server_data(guild.id)
-                        quarantine_data = server_data.get('quarantine_data', {})
-                        expired_user_ids = []
-                        
-                        for user_id_str, q_data in quarantine_data.items():
-                            if current_time >= q_data.get('quarantine_until', 0):
-                                expired_user_ids.append(int(user_id_str))
-                        
-                        for user_id in expired_user_ids:
-                            member = guild.get_member(user_id)
-                            if member:
-                                storage_key = f"{guild.id}_{user_id}"
-                                user_stored_roles[storage_key] = {
-                                    'roles': quarantine_data[str(user_id)].get('roles', []),
-                                    'timestamp': time.time(),
-                                    'duration': 0,
-                                    'violations': quarantine_data[str(user_id)].get('violations', 0)
-                                }
-                                user_quarantine_info[storage_key] = quarantine_data[str(user_id)]
-                                await _execute_quarantine_restoration(member)
-                    except:
-                        pass
+                # Also check MongoDB for persisted quarantines that need restoration (one indexed query)
+                try:
+                    expired = guild_records.quarantine_records.find({'quarantine_until': {'$lte': current_time}})
+                    async for guild_id, user_id_str, q_data in expired:
+                        guild = bot.get_guild(int(guild_id))
+                        member = guild.get_member(int(user_id_str)) if guild else None
+                        if member:
+                            storage_key = f"{guild.id}_{member.id}"
+                            user_stored_roles[storage_key] = {
+                                'roles': q_data.get('roles', []),
+                                'timestamp': time.time(),
+                                'duration': 0,
+                                'violations': q_data.get('violations', 0)
+                            }
+                            user_quarantine_info[storage_key] = q_data
+                            await _execute_quarantine_restoration(member)
+                except:
+                    pass
                 
                 await asyncio.sleep(60)  # Check every minute
             except:
@@ -585,6 +765,46 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         except:
             pass
     
+    @bot.listen('on_audit_log_entry_create')
+    async def security_on_audit_log_entry(entry):
+        audit_feed.record(entry)
+        await _score_destructive_action(entry)
+    
+    async def _score_destructive_action(entry):
+        """Anti-nuke: add the entry's weight to its actor's score and quarantine once it crosses the threshold"""
+        guild = entry.guild
+        actor_id = getattr(entry, 'user_id', None) or (entry.user.id if entry.user else None)
+        if actor_id is None or actor_id == guild.me.id or actor_id == guild.owner_id:
+            return
+        action = action_name(entry)
+        if action is None:
+            return
+        policy = await get_security_policy(guild.id)
+        if not policy.security_enabled:
+            return
+        # Webhook guard quarantines through the same score when anti-nuke itself is off
+        if not policy.antinuke_enabled and not (policy.webhookguard_enabled and action.startswith('webhook_')):
+            return
+        weight = policy.nuke_weights.get(action, 0)
+        if not weight:
+            return
+        # Same exemptions as the role-change checks, before the action counts at all
+        member = await _audit_actor(guild, entry)
+        if member is None or await _is_trusted_actor(guild, member, policy):
+            return
+        
+        score = nuke_scoreboard.add(guild.id, actor_id, action, weight, policy.nuke_time_window)
+        if score < policy.nuke_score_threshold:
+            return
+        
+        breakdown = nuke_scoreboard.breakdown(guild.id, actor_id)
+        nuke_scoreboard.tripped(guild.id, actor_id)
+        
+        if not await apply_quarantine(member, f"Destructive activity score {score} in {policy.nuke_time_window:.0f}s ({breakdown})", "anti_nuke"):
+            return  # Already quarantined (or it failed and was logged)
+        await _log_action(guild.id, "security",
+                        f"🚫 [ANTI-NUKE] {member} placed in quarantine - score {score}/{policy.nuke_score_threshold} in {policy.nuke_time_window:.0f}s: {breakdown}")
+    
     @bot.listen('on_message')
     async def security_on_message(message):
         if message.author.bot:
@@ -593,15 +813,15 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         if not message.guild:
             return
         
-        config = await get_security_config(message.guild.id)
+        policy = await get_security_policy(message.guild.id)
         
-        if not config.get('security_enabled'):
+        if not policy.security_enabled:
             return
         
-        if await is_whitelisted(message.guild.id, message.author):
+        if policy.is_whitelisted(message.author):
             return
         
-        if config.get('massmention_enabled'):
+        if policy.massmention_enabled:
             if '@everyone' in message.content or '@here' in message.content:
                 try:
                     await message.delete()
@@ -614,19 +834,18 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                                f"🚫 [MASS MENTION BLOCKED] {message.author} attempted @everyone/@here")
                 return
         
-        if config.get('antispam_enabled'):
-            user_id = message.author.id
-            guild_id = message.guild.id
-            current_time = time.time()
-            
-            user_message_timestamps[guild_id][user_id].append(current_time)
-            
-            user_message_timestamps[guild_id][user_id] = [
-                ts for ts in user_message_timestamps[guild_id][user_id]
-                if current_time - ts < config.get('spam_time_window', 5)
-            ]
+        if policy.dupeflood_enabled:
+            flood = duplicate_flood.check(message.guild.id, message.author.id, message.channel.id, message.content,
+                                          policy.duplicate_time_window, policy.duplicate_channel_threshold,
+                                          policy.duplicate_user_threshold)
+            if flood is not None:
+                await _handle_duplicate_flood(message, flood)
+                return
+        
+        if policy.antispam_enabled:
+            rate_key = (message.guild.id, message.author.id)
             
-            if len(user_message_timestamps[guild_id][user_id]) > config.get('spam_message_threshold', 5):
+            if user_message_rate.hit(rate_key, policy.spam_time_window) > policy.spam_message_threshold:
                 try:
                     await message.delete()
                 except:
@@ -637,70 +856,76 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                 await _log_action(message.guild.id, "security", 
                                f"🚫 [ANTI-SPAM] {message.author} placed in quarantine for spam/flood")
                 
-                user_message_timestamps[guild_id][user_id].clear()
+                user_message_rate.reset(rate_key)
                 return
         
-        if config.get('antilink_enabled'):
-            url_pattern = r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)'
-            urls = re.findall(url_pattern, message.content)
-            
-            if urls:
-                allowed_domains = config.get('allowed_domains', [])
-                blocked_domains = config.get('blocked_domains', [])
+        if policy.antilink_enabled:
+            url = policy.find_blocked_link(message.content)
+            if url:
+                try:
+                    await message.delete()
+                except:
+                    pass
                 
-                for url in urls:
-                    is_blocked = False
-                    
-                    for blocked_domain in blocked_domains:
-                        if blocked_domain in url:
-                            is_blocked = True
-                            break
-                    
-                    if is_blocked and not any(allowed_domain in url for allowed_domain in allowed_domains):
-                        try:
-                            await message.delete()
-                        except:
-                            pass
-                        
-                        await apply_quarantine(message.author, f"Posted blocked link: {url}", "anti_link")
-                        
-                        await _log_action(message.guild.id, "security", 
-                                       f"🚫 [ANTI-LINK] {message.author} placed in quarantine for blocked link")
-                        return
+                await apply_quarantine(message.author, f"Posted blocked link: {url}", "anti_link")
+                
+                await _log_action(message.guild.id, "security", 
+                               f"🚫 [ANTI-LINK] {message.author} placed in quarantine for blocked link")
+                return
+    
+    async def _handle_duplicate_flood(message, flood):
+        """Delete a flood copy and quarantine its author (and, on detection, every earlier poster)"""
+        try:
+            await message.delete()
+        except:
+            pass
+        
+        reason = f"Duplicate message flood ({flood.count} copies across {flood.channels} channels)"
+        await apply_quarantine(message.author, reason, "duplicate_flood")
+        
+        if not flood.new:
+            return
+        
+        quarantined = 1
+        policy = await get_security_policy(message.guild.id)
+        for author_id in flood.authors:
+            if author_id == message.author.id:
+                continue
+            member = message.guild.get_member(author_id)
+            if member is None or member.bot:
+                continue
+            if policy.is_whitelisted(member):
+                continue
+            await apply_quarantine(member, reason, "duplicate_flood")
+            quarantined += 1
+        
+        await _log_action(message.guild.id, "security",
+                        f"🚫 [DUPLICATE FLOOD] Same message posted {flood.count} times by {len(flood.authors)} user(s) in {flood.channels} channels within {flood.seconds:.0f}s - {quarantined} user(s) quarantined")
     
     @bot.listen('on_member_join')
     async def security_on_member_join(member):
         if member.bot:
             return
         
-        config = await get_security_config(member.guild.id)
+        policy = await get_security_policy(member.guild.id)
         
-        if not config.get('security_enabled') or not config.get('antiraid_enabled'):
+        if not policy.security_enabled or not policy.antiraid_enabled:
             return
         
-        if await is_whitelisted(member.guild.id, member):
+        if policy.is_whitelisted(member):
             return
         
-        current_time = time.time()
-        guild_id = member.guild.id
-        
-        user_join_timestamps[guild_id].append(current_time)
+        join_count = user_join_rate.hit(member.guild.id, policy.raid_time_window)
         
-        user_join_timestamps[guild_id] = [
-            ts for ts in user_join_timestamps[guild_id]
-            if current_time - ts < config.get('raid_time_window', 10)
-        ]
-        
-        if len(user_join_timestamps[guild_id]) > config.get('raid_join_threshold', 10):
+        if join_count > policy.raid_join_threshold:
             # Capture member data BEFORE kicking
             member_name = member.name
             member_id = member.id
             server_name = member.guild.name
             server_id = member.guild.id
             server_icon = member.guild.icon.url if member.guild.icon else None
-            join_count = len(user_join_timestamps[guild_id])
-            time_window = config.get('raid_time_window', 10)
-            threshold = config.get('raid_join_threshold', 10)
+            time_window = policy.raid_time_window
+            threshold = policy.raid_join_threshold
             
             try:
                 # Enforce FIRST - kick the member
@@ -733,12 +958,11 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         
         account_age = (datetime.now(timezone.utc) - member.created_at).days
         
-        if account_age < config.get('raid_account_age_days', 7):
-            suspicious_username_patterns = ['discord', 'bot', 'fake', 'test', '^[0-9]+$']
+        if account_age < policy.raid_account_age_days:
             username_lower = member.name.lower()
             
-            for pattern in suspicious_username_patterns:
-                if re.search(pattern, username_lower):
+            for pattern, compiled_pattern in SUSPICIOUS_USERNAME_PATTERNS:
+                if compiled_pattern.search(username_lower):
                     try:
                         await member.kick(reason=f"RXT Security - Suspicious account detected: {pattern}")
                         await _log_action(member.guild.id, "security", 
@@ -749,50 +973,41 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
     
     @bot.listen('on_bulk_message_delete')
     async def security_on_bulk_delete(messages):
+        event_time = time.time()
         if not messages:
             return
         
         try:
-            config = await get_security_config(messages[0].guild.id)
+            policy = await get_security_policy(messages[0].guild.id)
             
-            if not config.get('security_enabled') or not config.get('massdelete_enabled'):
+            if not policy.security_enabled or not policy.massdelete_enabled:
                 return
             
             deletion_count = len(messages)
-            threshold = config.get('mass_delete_threshold', 5)
+            threshold = policy.mass_delete_threshold
             
             # Only check audit logs if deletion count exceeds threshold
             if deletion_count <= threshold:
                 return
             
-            # Get the user who deleted the messages from audit logs
-            actor = None
-            actor_member = None
-            
-            # Try to get from audit logs - check multiple actions
+            # Get the user who deleted the messages from the audit-log feed (bulk delete targets the channel)
             try:
-                async for entry in messages[0].guild.audit_logs(limit=10):
-                    if entry.user and not entry.user.bot:
-                        # Check if this is a recent message delete action
-                        if entry.action == discord.AuditLogAction.message_delete or entry.action == discord.AuditLogAction.message_bulk_delete:
-                            actor = entry.user
-                            break
+                entry = await audit_feed.resolve(messages[0].guild, discord.AuditLogAction.message_bulk_delete, messages[0].channel.id, event_time)
             except Exception as e:
                 await _log_action(messages[0].guild.id, "security", 
                                f"⚠️ [MASS DELETE] Could not read audit logs: {e}")
                 return
             
-            if not actor:
+            if not entry:
                 return
             
-            # Get the member object
-            try:
-                actor_member = await messages[0].guild.fetch_member(actor.id)
-            except:
+            actor_member = await _audit_actor(messages[0].guild, entry)
+            if actor_member is None or actor_member.bot:
                 return
+            actor = actor_member
             
             # Check whitelist
-            if await is_whitelisted(messages[0].guild.id, actor_member):
+            if policy.is_whitelisted(actor_member):
                 return
             
             # Quarantine user for mass message deletion
@@ -810,30 +1025,21 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             return
         
         try:
-            config = await get_security_config(message.guild.id)
+            policy = await get_security_policy(message.guild.id)
             
-            if not config.get('security_enabled') or not config.get('massdelete_enabled'):
+            if not policy.security_enabled or not policy.massdelete_enabled:
                 return
             
-            if await is_whitelisted(message.guild.id, message.author):
+            if policy.is_whitelisted(message.author):
                 return
             
             guild_id = message.guild.id
             user_id = message.author.id
-            current_time = time.time()
-            time_window = config.get('mass_delete_time_window', 5)
-            threshold = config.get('mass_delete_threshold', 5)
+            time_window = policy.mass_delete_time_window
+            threshold = policy.mass_delete_threshold
             
-            # Track this deletion
-            user_message_deletions_bulk[guild_id][user_id].append(current_time)
-            
-            # Clean up old deletions outside time window
-            user_message_deletions_bulk[guild_id][user_id] = [
-                ts for ts in user_message_deletions_bulk[guild_id][user_id]
-                if current_time - ts < time_window
-            ]
-            
-            deletion_count = len(user_message_deletions_bulk[guild_id][user_id])
+            # Track this deletion (deletions older than the window drop out)
+            deletion_count = user_message_deletions_bulk.hit((guild_id, user_id), time_window)
             
             # Quarantine if threshold exceeded
             if deletion_count > threshold:
@@ -845,7 +1051,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                                     f"🚫 [MASS DELETE] {message.author} placed in quarantine - {deletion_count} messages deleted in {message.channel.mention}")
                     
                     # Reset counter after quarantine
-                    user_message_deletions_bulk[guild_id][user_id].clear()
+                    user_message_deletions_bulk.reset((guild_id, user_id))
                 except:
                     pass
         except:
@@ -853,9 +1059,10 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
     
     @bot.listen('on_member_update')
     async def security_on_role_change(before, after):
-        config = await get_security_config(before.guild.id)
+        event_time = time.time()
+        policy = await get_security_policy(before.guild.id)
         
-        if not config.get('security_enabled'):
+        if not policy.security_enabled:
             return
         
         # Check if this is a system action (role restoration) - skip checks
@@ -868,38 +1075,25 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         removed_roles = before_roles - after_roles
         added_roles = after_roles - before_roles
         
+        # Nickname, avatar, timeout or pending updates - nothing to check, so no audit-log wait
+        if not removed_roles and not added_roles:
+            return
+        
         # Check who made the role change from audit logs
         actor_member = None
         actor_is_trusted = False
         try:
-            async for entry in before.guild.audit_logs(limit=10, action=discord.AuditLogAction.member_role_update):
-                if entry.target.id == before.id and entry.user:
-                    # Fetch the actor as a member object
-                    try:
-                        actor_member = await before.guild.fetch_member(entry.user.id)
-                    except:
-                        actor_member = entry.user
-                    
-                    # Only trust: owner, whitelisted users, whitelisted roles, main mod role
-                    # Check if actor is server owner
-                    if entry.user.id == before.guild.owner_id:
-                        actor_is_trusted = True
-                    # Check if actor is whitelisted user
-                    elif await is_whitelisted(before.guild.id, entry.user):
-                        actor_is_trusted = True
-                    # Check if actor has main moderator role (from server setup)
-                    else:
-                        if hasattr(actor_member, 'roles'):
-                            server_data = await _get_server_data(before.guild.id)
-                            main_mod_role_id = server_data.get('main_moderator_role')
-                            if main_mod_role_id and any(role.id == int(main_mod_role_id) for role in actor_member.roles):
-                                actor_is_trusted = True
-                    break
+            entry = await audit_feed.resolve(before.guild, discord.AuditLogAction.member_role_update, before.id, event_time)
+            if entry:
+                # Fetch the actor as a member object
+                actor_member = await _audit_actor(before.guild, entry)
+            if actor_member:
+                actor_is_trusted = await _is_trusted_actor(before.guild, actor_member, policy)
         except Exception as e:
             pass
         
         # Check if target is whitelisted
-        target_is_whitelisted = await is_whitelisted(before.guild.id, before)
+        target_is_whitelisted = policy.is_whitelisted(before)
         
         # PROTECTION: If target is whitelisted but actor is not trusted, restore roles and quarantine actor
         if target_is_whitelisted and not actor_is_trusted:
@@ -968,7 +1162,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             return
         
         # ANTI-NUKE: Check for role removal (anti-nuke protection)
-        if removed_roles and config.get('antinuke_enabled'):
+        if removed_roles and policy.antinuke_enabled:
             for role in removed_roles:
                 if role.permissions.administrator or role.permissions.manage_guild:
                     # Mark this role addition as system action before adding to prevent re-triggering protection
@@ -990,7 +1184,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                     return
         
         # ANTI-ROLE: Check for unauthorized role granting (anti-role abuse)
-        if added_roles and config.get('antirole_enabled'):
+        if added_roles and policy.antirole_enabled:
             for role in added_roles:
                 if role.permissions.administrator or role.permissions.manage_guild or role.permissions.ban_members:
                     # Mark this role removal as system action before removing to prevent re-triggering protection
@@ -1011,107 +1205,49 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                                        f"🚫 [ANTI-ROLE] {actor_member} placed in quarantine - Attempted to grant role: {role.name} to {before}")
                     return
     
-    @bot.listen('on_guild_channel_delete')
-    async def security_on_channel_delete(channel):
-        config = await get_security_config(channel.guild.id)
-        
-        if not config.get('security_enabled') or not config.get('antinuke_enabled'):
-            return
-        
-        audit_log_entry = None
-        try:
-            async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_delete):
-                audit_log_entry = entry
-                break
-        except:
-            return
-        
-        if not audit_log_entry or not audit_log_entry.user:
-            return
-        
-        if audit_log_entry.user.bot:
-            return
-        
-        if await is_whitelisted(channel.guild.id, audit_log_entry.user):
-            return
-        
-        try:
-            member = await channel.guild.fetch_member(audit_log_entry.user.id)
-            await apply_quarantine(member, f"Mass channel deletion detected: {channel.name}", "anti_nuke")
-            await _log_action(channel.guild.id, "security",
-                           f"🚫 [ANTI-NUKE] {member} placed in quarantine - Channel deletion: {channel.name}")
-        except:
-            pass
-    
-    @bot.listen('on_guild_role_delete')
-    async def security_on_role_delete(role):
-        config = await get_security_config(role.guild.id)
-        
-        if not config.get('security_enabled') or not config.get('antinuke_enabled'):
-            return
-        
-        audit_log_entry = None
-        try:
-            async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_delete):
-                audit_log_entry = entry
-                break
-        except:
-            return
-        
-        if not audit_log_entry or not audit_log_entry.user:
-            return
-        
-        if audit_log_entry.user.bot:
-            return
-        
-        if await is_whitelisted(role.guild.id, audit_log_entry.user):
-            return
-        
-        try:
-            member = await role.guild.fetch_member(audit_log_entry.user.id)
-            await apply_quarantine(member, f"Mass role deletion detected: {role.name}", "anti_nuke")
-            await _log_action(role.guild.id, "security",
-                           f"🚫 [ANTI-NUKE] {member} placed in quarantine - Role deletion: {role.name}")
-        except:
-            pass
+    # Channel and role deletions are scored from their gateway audit-log entries
+    # (security_on_audit_log_entry -> _score_destructive_action), not quarantined per event
     
     @bot.listen('on_webhooks_update')
     async def security_on_webhook_update(channel):
-        config = await get_security_config(channel.guild.id)
+        event_time = time.time()
+        policy = await get_security_policy(channel.guild.id)
         
-        if not config.get('security_enabled') or not config.get('webhookguard_enabled'):
+        if not policy.security_enabled or not policy.webhookguard_enabled:
             return
         
-        audit_log_entry = None
+        # Webhook entries target the webhook, so take the newest webhook_create in the window
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.webhook_create):
-                audit_log_entry = entry
-                break
+            audit_log_entry = await audit_feed.resolve(channel.guild, discord.AuditLogAction.webhook_create, event_time=event_time)
         except:
             return
         
-        if not audit_log_entry or not audit_log_entry.user:
+        if not audit_log_entry:
             return
         
-        if audit_log_entry.user.bot:
+        member = await _audit_actor(channel.guild, audit_log_entry)
+        if member is None or member.bot:
             return
         
-        if await is_whitelisted(channel.guild.id, audit_log_entry.user):
+        if await _is_trusted_actor(channel.guild, member, policy):
             return
         
+        # Remove the webhook here; quarantining the creator is left to the anti-nuke score
+        # (webhook_create is weighted in nuke_weights), so one webhook does not quarantine on its own
         try:
+            removed = 0
             webhooks = await channel.webhooks()
             for webhook in webhooks:
-                if webhook.user and webhook.user.id == audit_log_entry.user.id:
+                if webhook.user and webhook.user.id == member.id:
                     try:
                         await webhook.delete(reason="RXT Security - Unauthorized webhook")
+                        removed += 1
                     except:
                         pass
             
-            member = await channel.guild.fetch_member(audit_log_entry.user.id)
-            await apply_quarantine(member, f"Unauthorized webhook created in {channel.name}", "webhook_guard")
-            await _log_action(channel.guild.id, "security",
-                           f"🚫 [WEBHOOK GUARD] {member} placed in quarantine - Webhook created in {channel.name}")
+            if removed:
+                await _log_action(channel.guild.id, "security",
+                               f"🚫 [WEBHOOK GUARD] Removed {removed} webhook(s) created by {member} in {channel.name}")
         except:
             pass
     
@@ -1131,7 +1267,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             config = await get_security_config(interaction.guild.id)
             new_state = not config.get(config_key, False)
             config[config_key] = new_state
-            await update_security_config(interaction.guild.id, config)
+            await set_security_config_field(interaction.guild.id, config_key, new_state)
             
             status = "✅ ENABLED" if new_state else "❌ DISABLED"
             features_text = "\n".join([f"→ {feature}" for feature in features])
@@ -1159,9 +1295,10 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
     create_protection_toggle_command("antilink", "🔗", "antilink_enabled", ["Malicious link detection", "Phishing domain blocking", "Domain whitelist support"])
     create_protection_toggle_command("antispam", "💬", "antispam_enabled", ["Message rate limiting", "Spam flood detection", "Quarantine for violators"])
     create_protection_toggle_command("massmention", "📢", "massmention_enabled", ["@everyone mention blocking", "@here mention blocking", "Quarantine for violators"])
-    create_protection_toggle_command("webhookguard", "🪝", "webhookguard_enabled", ["Unknown webhook detection", "Auto webhook deletion", "Quarantine for webhook creators"])
+    create_protection_toggle_command("webhookguard", "🪝", "webhookguard_enabled", ["Unknown webhook detection", "Auto webhook deletion", "Quarantine for repeated webhook creation (anti-nuke score)"])
     create_protection_toggle_command("antirole", "🎭", "antirole_enabled", ["High-permission role detection", "Permission escalation prevention", "Auto role deletion"])
     create_protection_toggle_command("massdelete", "🗑️", "massdelete_enabled", ["Mass message deletion detection", "Auto-quarantine for violators", "Audit logging"])
+    create_protection_toggle_command("dupeflood", "📑", "dupeflood_enabled", ["Cross-channel duplicate message detection", "Slow-rate raid spam detection", "Quarantine for every poster"])
     
     @bot.tree.command(name="security", description="🔐 Configure RXT Security System")
     @app_commands.describe(action="Action to perform")
@@ -1188,7 +1325,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         
         if action == "enable":
             config['security_enabled'] = True
-            await update_security_config(interaction.guild.id, config)
+            await set_security_config_field(interaction.guild.id, 'security_enabled', True)
             
             embed = discord.Embed(
                 title="🔐 **SECURITY SYSTEM ENABLED**",
@@ -1217,7 +1354,7 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         
         elif action == "disable":
             config['security_enabled'] = False
-            await update_security_config(interaction.guild.id, config)
+            await set_security_config_field(interaction.guild.id, 'security_enabled', False)
             
             embed = discord.Embed(
                 title="⛔ **SECURITY SYSTEM DISABLED**",
@@ -1289,6 +1426,11 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                 value=f"{'✅ ACTIVE' if config.get('massdelete_enabled') else '❌ INACTIVE'}",
                 inline=True
             )
+            embed.add_field(
+                name="📑 Duplicate Flood",
+                value=f"{'✅ ACTIVE' if config.get('dupeflood_enabled') else '❌ INACTIVE'}",
+                inline=True
+            )
             embed.add_field(
                 name=f"{VisualElements.CIRCUIT_LINE}",
                 value="Use `/antiraid`, `/antinuke`, etc. to toggle individual protections.",
@@ -1623,6 +1765,11 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             app_commands.Choice(name="spam_time_window - Spam detection window (seconds, default: 5)", value="spam_time_window"),
             app_commands.Choice(name="mass_delete_threshold - Messages deleted to trigger protection (default: 5)", value="mass_delete_threshold"),
             app_commands.Choice(name="mass_delete_time_window - Mass delete detection window (seconds, default: 5)", value="mass_delete_time_window"),
+            app_commands.Choice(name="duplicate_channels - Channels with the same message to trigger (default: 5)", value="duplicate_channels"),
+            app_commands.Choice(name="duplicate_users - Users posting the same message to trigger (default: 6)", value="duplicate_users"),
+            app_commands.Choice(name="duplicate_time_window - Duplicate flood window (seconds since the latest copy, default: 60)", value="duplicate_time_window"),
+            app_commands.Choice(name="nuke_score_threshold - Anti-nuke score to trigger (default: 10)", value="nuke_score_threshold"),
+            app_commands.Choice(name="nuke_time_window - Anti-nuke scoring window (seconds, default: 60)", value="nuke_time_window"),
             app_commands.Choice(name="view - View all current settings", value="view"),
         ]
     )
@@ -1649,6 +1796,8 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
                 f"📈 **Spam Time Window:** {config.get('spam_time_window', 5)}s",
                 f"🗑️ **Mass Delete Threshold:** {config.get('mass_delete_threshold', 5)} messages",
                 f"🔄 **Mass Delete Time Window:** {config.get('mass_delete_time_window', 5)}s",
+                f"📑 **Duplicate Flood:** {config.get('duplicate_channel_threshold', 5)} channels or {config.get('duplicate_user_threshold', 6)} users in {config.get('duplicate_time_window', 60)}s",
+                f"💣 **Anti-Nuke Score:** {config.get('nuke_score_threshold', 10)} points in {config.get('nuke_time_window', 60)}s",
             ]
             
             embed = discord.Embed(
@@ -1671,6 +1820,17 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
+        # A zero-length window would count nothing (and never trip)
+        if setting in WINDOW_SETTINGS and value <= 0:
+            embed = discord.Embed(
+                title="❌ **INVALID VALUE**",
+                description=f"{VisualElements.CIRCUIT_LINE}\n\nTime windows must be greater than 0 seconds.\n\n{VisualElements.CIRCUIT_LINE}",
+                color=BrandColors.DANGER
+            )
+            embed.set_footer(text=BOT_FOOTER)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
         setting_map = {
             "quarantine_time": "quarantine_base_duration",
             "raid_join_count": "raid_join_threshold",
@@ -1680,6 +1840,11 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             "spam_time_window": "spam_time_window",
             "mass_delete_threshold": "mass_delete_threshold",
             "mass_delete_time_window": "mass_delete_time_window",
+            "duplicate_channels": "duplicate_channel_threshold",
+            "duplicate_users": "duplicate_user_threshold",
+            "duplicate_time_window": "duplicate_time_window",
+            "nuke_score_threshold": "nuke_score_threshold",
+            "nuke_time_window": "nuke_time_window",
         }
         
         db_key = setting_map.get(setting)
@@ -1695,7 +1860,8 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
         
         old_value = config.get(db_key)
         config[db_key] = value
-        await update_security_config(interaction.guild.id, config)
+        # Only this setting - a whole-subdocument write would race concurrent edits and sync
+        await set_security_config_field(interaction.guild.id, db_key, value)
         
         setting_name = {
             "quarantine_base_duration": "Quarantine Base Duration",
@@ -1706,6 +1872,11 @@ def setup(bot: commands.Bot, get_server_data_func, update_server_data_func, log_
             "spam_time_window": "Spam Time Window",
             "mass_delete_threshold": "Mass Delete Threshold",
             "mass_delete_time_window": "Mass Delete Time Window",
+            "duplicate_channel_threshold": "Duplicate Flood Channels",
+            "duplicate_user_threshold": "Duplicate Flood Users",
+            "duplicate_time_window": "Duplicate Flood Window",
+            "nuke_score_threshold": "Anti-Nuke Score Threshold",
+            "nuke_time_window": "Anti-Nuke Time Window",
         }.get(db_key, setting)
         
         embed = discord.Embed(
@@ -3,7 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from main import bot
 from brand_config import create_permission_denied_embed, create_owner_only_embed,  BOT_FOOTER, BrandColors, create_success_embed, create_error_embed, create_info_embed, create_command_embed, create_warning_embed
-from main import has_permission, get_server_data, update_server_data, log_action
+from main import has_permission, get_server_data, get_server_config, update_server_data, log_action
 from captcha_generator import CaptchaGenerator
 
 # CAPTCHA tracking data
@@ -163,23 +163,21 @@ class VerificationView(discord.ui.View):
     @discord.ui.button(label='✅ Verify Me', style=discord.ButtonStyle.success, emoji='✅', custom_id='verify_member')
     async def verify_member(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Get verification settings from database
-        server_data = await get_server_data(interaction.guild.id)
-        security_settings = server_data.get('security_settings', {})
-        verification_config = security_settings.get('verification_system', {})
+        verification_config = (await get_server_config(interaction.guild.id)).verification
 
-        if not verification_config.get('enabled', False):
+        if not verification_config.enabled:
             await interaction.response.send_message(embed=create_error_embed("Verification system is not enabled! Contact administrators."), ephemeral=True)
             return
 
-        verified_role_id = verification_config.get('verified_role')
-        remove_role_id = verification_config.get('remove_role')
-        verification_type = verification_config.get('verification_type', 'captcha')
+        verified_role_id = verification_config.verified_role_id
+        remove_role_id = verification_config.remove_role_id
+        verification_type = verification_config.verification_type
 
         if not verified_role_id:
             await interaction.response.send_message(embed=create_error_embed("Verification role not configured! Contact administrators."), ephemeral=True)
             return
 
-        verified_role = interaction.guild.get_role(int(verified_role_id))
+        verified_role = interaction.guild.get_role(verified_role_id)
         if not verified_role:
             await interaction.response.send_message(embed=create_error_embed("Verification role not found! Contact administrators."), ephemeral=True)
             return
@@ -190,7 +188,7 @@ class VerificationView(discord.ui.View):
 
         remove_role = None
         if remove_role_id:
-            remove_role = interaction.guild.get_role(int(remove_role_id))
+            remove_role = interaction.guild.get_role(remove_role_id)
 
         # Handle Button Verification (one-click)
         if verification_type == "button":
@@ -0,0 +1,237 @@
+"""Typed guild configuration for RXT ENGINE bot - servers documents compiled once with pre-parsed IDs"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+
+def parse_id(value) -> Optional[int]:
+    """Parse a stored snowflake (str or int) to int, or None if unset/invalid"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_id_map(values) -> Mapping[str, int]:
+    if not isinstance(values, dict):
+        return MappingProxyType({})
+    parsed = {key: parse_id(value) for key, value in values.items()}
+    return MappingProxyType({key: value for key, value in parsed.items() if value is not None})
+
+
+@dataclass(frozen=True, slots=True)
+class LogRouteRule:
+    """Per-guild override for one log type (servers.log_routes.<log_type>); None keeps the default"""
+    channel_ids: Optional[Tuple[int, ...]] = None
+    color: Optional[int] = None
+    mirror: Optional[bool] = None
+    sample: Optional[int] = None
+    digest_threshold: Optional[int] = None
+    digest_window: Optional[float] = None
+
+    @classmethod
+    def from_document(cls, rule):
+        if not isinstance(rule, dict):
+            return None
+        channels = rule.get('channels')
+        channel_ids = None
+        if isinstance(channels, (list, tuple)):
+            channel_ids = tuple(i for i in (parse_id(c) for c in channels) if i is not None)
+        color = rule.get('color')
+        sample = rule.get('sample')
+        digest_threshold = rule.get('digest_threshold')
+        digest_window = rule.get('digest_window')
+        return cls(
+            channel_ids=channel_ids,
+            color=color if isinstance(color, int) else None,
+            mirror=rule['mirror'] if isinstance(rule.get('mirror'), bool) else None,
+            sample=max(1, int(sample)) if isinstance(sample, int) else None,
+            digest_threshold=max(0, digest_threshold) if isinstance(digest_threshold, int) else None,
+            digest_window=float(digest_window) if isinstance(digest_window, (int, float)) and digest_window > 0 else None,
+        )
+
+
+def _parse_route_rules(rules) -> Mapping[str, LogRouteRule]:
+    if not isinstance(rules, dict):
+        return MappingProxyType({})
+    parsed = {log_type: LogRouteRule.from_document(rule) for log_type, rule in rules.items()}
+    return MappingProxyType({log_type: rule for log_type, rule in parsed.items() if rule is not None})
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingConfig:
+    log_channel_id: Optional[int] = None
+    organized_channel_ids: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    route_rules: Mapping[str, LogRouteRule] = field(default_factory=lambda: MappingProxyType({}))
+    # Keep recent message content so deletes/edits of uncached messages can be logged
+    message_store_enabled: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class ModerationRoles:
+    main_moderator_role_id: Optional[int] = None
+    junior_moderator_role_id: Optional[int] = None
+
+    def has_level(self, member, permission_level) -> bool:
+        """Role check behind has_permission (owner check is done by the caller)"""
+        if permission_level == "main_moderator":
+            return self.main_moderator_role_id is not None and member.get_role(self.main_moderator_role_id) is not None
+        if permission_level == "junior_moderator":
+            for role_id in (self.junior_moderator_role_id, self.main_moderator_role_id):
+                if role_id is not None and member.get_role(role_id) is not None:
+                    return True
+        return False
+
+
+@dataclass(frozen=True, slots=True)
+class WelcomeConfig:
+    auto_role_id: Optional[int] = None
+    channel_id: Optional[int] = None
+    message: Optional[str] = None
+    title: Optional[str] = None
+    image: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class KarmaChannels:
+    karma_zone_channel_id: Optional[int] = None
+    levelup_channel_id: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class TicketConfig:
+    support_role_id: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationConfig:
+    enabled: bool = False
+    channel_id: Optional[int] = None
+    verified_role_id: Optional[int] = None
+    remove_role_id: Optional[int] = None
+    verification_type: str = 'captcha'
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Read-only view of a servers document with every ID parsed to int"""
+    guild_id: Optional[int]
+    logging: LoggingConfig
+    roles: ModerationRoles
+    welcome: WelcomeConfig
+    karma: KarmaChannels
+    tickets: TicketConfig
+    verification: VerificationConfig
+    voice_tracker_enabled: bool = False
+
+    @classmethod
+    def from_document(cls, document):
+        document = document or {}
+        karma_channels = document.get('karma_channels') or {}
+        verification = (document.get('security_settings') or {}).get('verification_system') or {}
+        return cls(
+            guild_id=parse_id(document.get('guild_id')),
+            logging=LoggingConfig(
+                log_channel_id=parse_id(document.get('log_channel')),
+                organized_channel_ids=_parse_id_map(document.get('organized_log_channels')),
+                route_rules=_parse_route_rules(document.get('log_routes')),
+                message_store_enabled=bool(document.get('message_store_enabled', False)),
+            ),
+            roles=ModerationRoles(
+                main_moderator_role_id=parse_id(document.get('main_moderator_role')),
+                junior_moderator_role_id=parse_id(document.get('junior_moderator_role')),
+            ),
+            welcome=WelcomeConfig(
+                auto_role_id=parse_id(document.get('auto_role')),
+                channel_id=parse_id(document.get('welcome_channel')),
+                message=document.get('welcome_message'),
+                title=document.get('welcome_title'),
+                image=document.get('welcome_image'),
+            ),
+            karma=KarmaChannels(
+                karma_zone_channel_id=parse_id(karma_channels.get('karma_zone_channel')),
+                levelup_channel_id=parse_id(karma_channels.get('levelup_channel')),
+            ),
+            tickets=TicketConfig(
+                support_role_id=parse_id(document.get('ticket_support_role')),
+            ),
+            verification=VerificationConfig(
+                enabled=bool(verification.get('enabled', False)),
+                channel_id=parse_id(verification.get('channel')),
+                verified_role_id=parse_id(verification.get('verified_role')),
+                remove_role_id=parse_id(verification.get('remove_role')),
+                verification_type=verification.get('verification_type', 'captcha'),
+            ),
+            voice_tracker_enabled=bool(document.get('voice_tracker_enabled', False)),
+        )
+
+
+# guild_id -> (document compiled from, ServerConfig)
+_compiled_configs = {}
+
+
+def compile_server_config(guild_id, document) -> ServerConfig:
+    """Return the ServerConfig for a cached document, recompiling only when the document changed.
+
+    Cached documents are replaced (never mutated) on write, so identity is a valid change check.
+    """
+    guild_id = str(guild_id)
+    compiled = _compiled_configs.get(guild_id)
+    if compiled is not None and compiled[0] is document:
+        return compiled[1]
+    config = ServerConfig.from_document(document)
+    _compiled_configs[guild_id] = (document, config)
+    return config
+
+
+def forget_server_config(guild_id):
+    """Drop the compiled config of a guild the bot left"""
+    _compiled_configs.pop(str(guild_id), None)
+    _compiled_reaction_roles.pop(str(guild_id), None)
+
+
+@dataclass(frozen=True, slots=True)
+class ReactionRoleMessage:
+    """One reaction-role message with emoji -> role ID resolved up front"""
+    role_ids: Mapping[str, int]
+    auto_remove_role_id: Optional[int] = None
+
+    @classmethod
+    def from_record(cls, record):
+        role_ids = {}
+        for pair in record.get('pairs', []):
+            try:
+                emoji, role_id = pair
+            except (TypeError, ValueError):
+                continue
+            role_id = parse_id(role_id)
+            if role_id is not None:
+                # First pair wins, as in the original linear scan
+                role_ids.setdefault(emoji, role_id)
+        return cls(
+            role_ids=MappingProxyType(role_ids),
+            auto_remove_role_id=parse_id(record.get('auto_remove_role_id')),
+        )
+
+
+# guild_id -> (records map compiled from, {message_id: ReactionRoleMessage})
+_compiled_reaction_roles = {}
+
+
+def compile_reaction_roles(guild_id, records) -> Mapping[int, ReactionRoleMessage]:
+    """Return {message_id: ReactionRoleMessage} for a guild's cached reaction_roles records"""
+    guild_id = str(guild_id)
+    compiled = _compiled_reaction_roles.get(guild_id)
+    if compiled is not None and compiled[0] is records:
+        return compiled[1]
+    messages = {}
+    for message_id, record in records.items():
+        message_id = parse_id(message_id)
+        if message_id is not None:
+            messages[message_id] = ReactionRoleMessage.from_record(record)
+    messages = MappingProxyType(messages)
+    _compiled_reaction_roles[guild_id] = (records, messages)
+    return messages
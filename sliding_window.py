@@ -0,0 +1,85 @@
+"""Sliding-window event counters for RXT ENGINE bot - bounded memory, amortized O(1) per event"""
+
+import os
+import time
+from collections import OrderedDict, deque
+
+# Most keys (guild/user pairs) one counter tracks; the least recently active go first
+SECURITY_TRACKED_KEYS = int(os.getenv('SECURITY_TRACKED_KEYS', '100000'))
+# Timestamps kept per key - counts saturate here, far above any sane threshold
+MAX_EVENTS_PER_KEY = 256
+# Expired keys removed per hit, so a sweep never stalls an event handler
+SWEEP_BATCH = 32
+
+
+class SlidingWindowCounter:
+    """Counts events per key over the last `window` seconds.
+
+    Each key holds a deque of timestamps: a hit appends and pops expired ones from
+    the left (each timestamp is popped once, so amortized O(1)). Keys are kept in
+    last-hit order; every hit also drops a few keys from the front whose newest
+    event has left their window, so idle users and guilds do not accumulate, and
+    beyond max_keys the least recently active key is evicted.
+    """
+
+    def __init__(self, max_keys=SECURITY_TRACKED_KEYS, max_events=MAX_EVENTS_PER_KEY):
+        self.max_keys = max_keys
+        self.max_events = max_events
+        self._keys = OrderedDict()  # key -> (window, deque of timestamps), least recent first
+
+        self.evicted_idle = 0
+        self.evicted_cap = 0
+
+    def hit(self, key, window, now=None):
+        """Record an event for key and return how many fall within the window"""
+        if now is None:
+            now = time.time()
+        entry = self._keys.get(key)
+        if entry is None or entry[0] != window:
+            events = entry[1] if entry is not None else deque(maxlen=self.max_events)
+            entry = self._keys[key] = (window, events)
+        events = entry[1]
+        events.append(now)
+        cutoff = now - window
+        while events and events[0] <= cutoff:
+            events.popleft()
+        self._keys.move_to_end(key)
+        self._sweep(now)
+        return len(events)
+
+    def _sweep(self, now):
+        swept = 0
+        while self._keys and swept < SWEEP_BATCH:
+            key, (window, events) = next(iter(self._keys.items()))
+            if events and events[-1] > now - window:
+                break
+            del self._keys[key]
+            self.evicted_idle += 1
+            swept += 1
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+            self.evicted_cap += 1
+
+    def count(self, key, now=None):
+        """Events of key still inside its window (without recording one)"""
+        entry = self._keys.get(key)
+        if entry is None:
+            return 0
+        window, events = entry
+        cutoff = (now if now is not None else time.time()) - window
+        return sum(1 for ts in events if ts > cutoff)
+
+    def reset(self, key):
+        """Forget a key (e.g. after the member was quarantined)"""
+        self._keys.pop(key, None)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def stats(self):
+        return {
+            'keys': len(self._keys),
+            'events': sum(len(events) for _, events in self._keys.values()),
+            'evicted_idle': self.evicted_idle,
+            'evicted_cap': self.evicted_cap,
+        }
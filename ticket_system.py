@@ -5,7 +5,9 @@ import asyncio
 from datetime import datetime, timedelta
 from main import bot
 from brand_config import BOT_FOOTER, BrandColors, create_success_embed, create_error_embed, create_info_embed, create_command_embed, create_warning_embed
-from main import has_permission, get_server_data, update_server_data, log_action
+from main import has_permission, get_server_data, get_server_config, log_action
+import guild_records
+from guild_records import TICKET_COOLDOWN
 
 class TicketCategorySelect(discord.ui.Select):
     def __init__(self, categories):
@@ -37,8 +39,7 @@ class TicketCategorySelect(discord.ui.Select):
         
         category_num = int(self.values[0])
         server_data = await get_server_data(interaction.guild.id)
-        ticket_categories = server_data.get('ticket_categories', {})
-        category_data = ticket_categories.get(str(category_num), {})
+        category_data = await guild_records.ticket_categories.get(interaction.guild.id, category_num) or {}
         
         if not category_data:
             await interaction.response.send_message("❌ This ticket category no longer exists! Please contact an administrator.", ephemeral=True)
@@ -83,13 +84,12 @@ class TicketModal(discord.ui.Modal):
             self.add_item(field)
 
     async def on_submit(self, interaction: discord.Interaction):
-        server_data = await get_server_data(interaction.guild.id)
-        ticket_cooldowns = server_data.get('ticket_cooldowns', {})
+        config = await get_server_config(interaction.guild.id)
         user_id = str(interaction.user.id)
 
-        if user_id in ticket_cooldowns:
-            last_ticket = datetime.fromisoformat(ticket_cooldowns[user_id])
-            if datetime.now() - last_ticket < timedelta(minutes=10):
+        cooldown = await guild_records.ticket_cooldowns.get(interaction.guild.id, user_id)
+        if cooldown:
+            if datetime.utcnow() - cooldown['last_ticket'] < TICKET_COOLDOWN:
                 embed = discord.Embed(
                     title="⏳ Ticket Cooldown",
                     description="You must wait 10 minutes between creating tickets!",
@@ -108,9 +108,9 @@ class TicketModal(discord.ui.Modal):
             await interaction.response.send_message("❌ Ticket category channel not found!", ephemeral=True)
             return
 
-        main_mod_role_id = server_data.get('main_moderator_role')
-        junior_mod_role_id = server_data.get('junior_moderator_role')
-        support_role_id = server_data.get('ticket_support_role')
+        main_mod_role_id = config.roles.main_moderator_role_id
+        junior_mod_role_id = config.roles.junior_moderator_role_id
+        support_role_id = config.tickets.support_role_id
 
         overwrites = {
             interaction.guild.default_role: discord.PermissionOverwrite(read_messages=False),
@@ -118,25 +118,24 @@ class TicketModal(discord.ui.Modal):
         }
 
         if main_mod_role_id:
-            main_mod_role = interaction.guild.get_role(int(main_mod_role_id))
+            main_mod_role = interaction.guild.get_role(main_mod_role_id)
             if main_mod_role:
                 overwrites[main_mod_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
 
         if junior_mod_role_id:
-            junior_mod_role = interaction.guild.get_role(int(junior_mod_role_id))
+            junior_mod_role = interaction.guild.get_role(junior_mod_role_id)
             if junior_mod_role:
                 overwrites[junior_mod_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
 
         if support_role_id:
-            support_role = interaction.guild.get_role(int(support_role_id))
+            support_role = interaction.guild.get_role(support_role_id)
             if support_role:
                 overwrites[support_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True)
 
-        ticket_categories = server_data.get('ticket_categories', {})
-        category_ticket_count = ticket_categories.get(str(self.category_num), {}).get('ticket_count', 0) + 1
-        
-        ticket_categories[str(self.category_num)]['ticket_count'] = category_ticket_count
-        await update_server_data(interaction.guild.id, {'ticket_categories': ticket_categories})
+        category_record = await guild_records.ticket_categories.update(
+            interaction.guild.id, self.category_num, inc_fields={'ticket_count': 1}, upsert=False
+        )
+        category_ticket_count = (category_record or {}).get('ticket_count', 1)
         
         clean_username = ''.join(c for c in interaction.user.name if c.isalnum() or c in ['-', '_']).lower()[:20]
         category_name_short = ''.join(c for c in self.category_data.get('name', 'ticket') if c.isalnum() or c in ['-', '_']).lower()[:15]
@@ -171,14 +170,16 @@ class TicketModal(discord.ui.Modal):
 
         mention_text = ""
         if support_role_id:
-            support_role = interaction.guild.get_role(int(support_role_id))
+            support_role = interaction.guild.get_role(support_role_id)
             if support_role:
                 mention_text = f"{support_role.mention} "
 
         await ticket_channel.send(content=mention_text, embed=embed, view=view)
         
-        ticket_cooldowns[user_id] = datetime.now().isoformat()
-        await update_server_data(interaction.guild.id, {'ticket_cooldowns': ticket_cooldowns})
+        now = datetime.utcnow()
+        await guild_records.ticket_cooldowns.update(
+            interaction.guild.id, user_id, set_fields={'last_ticket': now}, expires_at=now + TICKET_COOLDOWN
+        )
 
         success_embed = discord.Embed(
             title="✅ Ticket Created",
@@ -199,8 +200,6 @@ class TicketControlView(discord.ui.View):
 
     @discord.ui.button(label="Close Ticket", style=discord.ButtonStyle.danger, custom_id="close_ticket", emoji="🔒")
     async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        server_data = await get_server_data(interaction.guild.id)
-        
         if not await has_permission(interaction, 'junior_moderator'):
             await interaction.response.send_message("❌ You don't have permission to close tickets!", ephemeral=True)
             return
@@ -212,8 +211,7 @@ class TicketControlView(discord.ui.View):
 
         try:
             category_num = channel.topic.split("Category Number:")[1].strip()
-            ticket_categories = server_data.get('ticket_categories', {})
-            category_data = ticket_categories.get(category_num, {})
+            category_data = await guild_records.ticket_categories.get(interaction.guild.id, category_num) or {}
             
             closed_category_id = category_data.get('closed_category_id')
             if not closed_category_id:
@@ -263,8 +261,6 @@ class ReopenDeleteTicketView(discord.ui.View):
 
     @discord.ui.button(label="Reopen Ticket", style=discord.ButtonStyle.success, custom_id="reopen_ticket", emoji="🔓")
     async def reopen_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        server_data = await get_server_data(interaction.guild.id)
-        
         if not await has_permission(interaction, 'junior_moderator'):
             await interaction.response.send_message("❌ You don't have permission to reopen tickets!", ephemeral=True)
             return
@@ -276,8 +272,7 @@ class ReopenDeleteTicketView(discord.ui.View):
 
         try:
             category_num = channel.topic.split("Category Number:")[1].strip()
-            ticket_categories = server_data.get('ticket_categories', {})
-            category_data = ticket_categories.get(category_num, {})
+            category_data = await guild_records.ticket_categories.get(interaction.guild.id, category_num) or {}
             
             open_category_id = category_data.get('open_category_id')
             if not open_category_id:
@@ -370,13 +365,11 @@ class ConfirmDeleteView(discord.ui.View):
 
 @bot.tree.command(name="ticketpanel", description="Create a ticket selection panel")
 async def ticketpanel(interaction: discord.Interaction):
-    server_data = await get_server_data(interaction.guild.id)
-    
     if not await has_permission(interaction, 'main_moderator') and interaction.user.id != interaction.guild.owner_id:
         await interaction.response.send_message("❌ Only server owners and main moderators can create ticket panels!", ephemeral=True)
         return
 
-    ticket_categories = server_data.get('ticket_categories', {})
+    ticket_categories = await guild_records.ticket_categories.all(interaction.guild.id)
     enabled_cats = {k: v for k, v in ticket_categories.items() if v.get('enabled', False)}
     
     if not enabled_cats:
@@ -426,8 +419,6 @@ async def ticketcategory(
     open_category: discord.CategoryChannel = None,
     closed_category: discord.CategoryChannel = None
 ):
-    server_data = await get_server_data(interaction.guild.id)
-    
     if not await has_permission(interaction, 'main_moderator') and interaction.user.id != interaction.guild.owner_id:
         await interaction.response.send_message("❌ Only server owners and main moderators can configure ticket categories!", ephemeral=True)
         return
@@ -436,7 +427,7 @@ async def ticketcategory(
         await interaction.response.send_message("❌ Category number must be between 1 and 7!", ephemeral=True)
         return
 
-    ticket_categories = server_data.get('ticket_categories', {})
+    ticket_categories = await guild_records.ticket_categories.all(interaction.guild.id)
     cat_key = str(category_number)
     
     if action == "setup":
@@ -444,7 +435,7 @@ async def ticketcategory(
             await interaction.response.send_message("❌ For setup, you must provide: name, open_category, and closed_category!", ephemeral=True)
             return
         
-        ticket_categories[cat_key] = {
+        category_record = {
             'name': name,
             'description': description or f"Open a {name} ticket",
             'emoji': emoji or '🎫',
@@ -458,7 +449,7 @@ async def ticketcategory(
             ]
         }
         
-        await update_server_data(interaction.guild.id, {'ticket_categories': ticket_categories})
+        await guild_records.ticket_categories.update(interaction.guild.id, cat_key, set_fields=category_record)
         
         embed = discord.Embed(
             title="✅ Ticket Category Created",
@@ -469,16 +460,14 @@ async def ticketcategory(
         
     elif action == "disable":
         if cat_key in ticket_categories:
-            ticket_categories[cat_key]['enabled'] = False
-            await update_server_data(interaction.guild.id, {'ticket_categories': ticket_categories})
+            await guild_records.ticket_categories.update(interaction.guild.id, cat_key, set_fields={'enabled': False}, upsert=False)
             await interaction.response.send_message(f"✅ Category {category_number} has been disabled.")
         else:
             await interaction.response.send_message(f"❌ Category {category_number} doesn't exist!")
             
     elif action == "enable":
         if cat_key in ticket_categories:
-            ticket_categories[cat_key]['enabled'] = True
-            await update_server_data(interaction.guild.id, {'ticket_categories': ticket_categories})
+            await guild_records.ticket_categories.update(interaction.guild.id, cat_key, set_fields={'enabled': True}, upsert=False)
             await interaction.response.send_message(f"✅ Category {category_number} has been enabled.")
         else:
             await interaction.response.send_message(f"❌ Category {category_number} doesn't exist!")
@@ -521,8 +510,6 @@ async def action_autocomplete(interaction: discord.Interaction, current: str):
     category_number="Category number (1-7) to configure fields for"
 )
 async def ticketfields(interaction: discord.Interaction, category_number: int):
-    server_data = await get_server_data(interaction.guild.id)
-    
     if not await has_permission(interaction, 'main_moderator') and interaction.user.id != interaction.guild.owner_id:
         await interaction.response.send_message("❌ Only server owners and main moderators can configure ticket fields!", ephemeral=True)
         return
@@ -531,7 +518,7 @@ async def ticketfields(interaction: discord.Interaction, category_number: int):
         await interaction.response.send_message("❌ Category number must be between 1 and 7!", ephemeral=True)
         return
 
-    ticket_categories = server_data.get('ticket_categories', {})
+    ticket_categories = await guild_records.ticket_categories.all(interaction.guild.id)
     cat_key = str(category_number)
     
     if cat_key not in ticket_categories:
@@ -621,17 +608,15 @@ class FieldConfigModal(discord.ui.Modal, title='Configure Form Fields'):
             await interaction.response.send_message("❌ No valid fields were provided!", ephemeral=True)
             return
         
-        server_data = await get_server_data(interaction.guild.id)
-        ticket_categories = server_data.get('ticket_categories', {})
         cat_key = str(self.category_num)
+        category_record = await guild_records.ticket_categories.update(
+            interaction.guild.id, cat_key, set_fields={'form_fields': form_fields}, upsert=False
+        )
         
-        if cat_key in ticket_categories:
-            ticket_categories[cat_key]['form_fields'] = form_fields
-            await update_server_data(interaction.guild.id, {'ticket_categories': ticket_categories})
-            
+        if category_record:
             embed = discord.Embed(
                 title=f"✅ Form Fields Updated for Category {self.category_num}",
-                description=f"**{ticket_categories[cat_key].get('name')}**\n\nConfigured {len(form_fields)} field(s):",
+                description=f"**{category_record.get('name')}**\n\nConfigured {len(form_fields)} field(s):",
                 color=BrandColors.SUCCESS
             )
             
@@ -0,0 +1,146 @@
+"""Voice activity log coalescing for RXT ENGINE bot - one log line per member per burst of voice events"""
+
+import asyncio
+import os
+import time
+
+# Voice events of a member within this many seconds of their first one share one log line
+VOICE_LOG_WINDOW = float(os.getenv('VOICE_LOG_WINDOW', '20'))
+# Longest channel path kept per line; further hops are counted, not listed
+VOICE_LOG_MAX_HOPS = 12
+
+
+class _VoiceBurst:
+    __slots__ = ('member', 'started', 'path', 'hidden_hops', 'moderation', 'events', 'handle')
+
+    def __init__(self, member, now):
+        self.member = member
+        self.started = now
+        self.path = []
+        self.hidden_hops = 0
+        self.moderation = []
+        self.events = 0
+        self.handle = None
+
+    def hop(self, name):
+        if len(self.path) < VOICE_LOG_MAX_HOPS:
+            self.path.append(name)
+        else:
+            self.hidden_hops += 1
+
+
+class VoiceLogCoalescer:
+    """Merges a member's joins, leaves, moves, mutes and deafens into one line per window.
+
+    record() only updates in-memory state, so the voice event handler never waits on
+    logging. The first event of a member opens a window; when it closes the burst is
+    rendered ("A → B → C in 20s") and handed to the bound emit coroutine. A lone
+    event keeps its usual single-event wording.
+    """
+
+    def __init__(self, window=VOICE_LOG_WINDOW):
+        self.window = window
+        self._bursts = {}
+        self._emit = None
+
+        self.events = 0
+        self.lines = 0
+
+    def bind(self, emit):
+        """Set the coroutine function(guild_id, member_id, log_text, activity_type, global_text)"""
+        self._emit = emit
+
+    def record(self, member, before, after):
+        """Fold one voice state change into the member's pending burst"""
+        if self._emit is None:
+            return
+        joined = before.channel is None and after.channel is not None
+        left = before.channel is not None and after.channel is None
+        moved = before.channel is not None and after.channel is not None and before.channel != after.channel
+        moderation = []
+        if before.mute != after.mute:
+            moderation.append("muted" if after.mute else "unmuted")
+        if before.deaf != after.deaf:
+            moderation.append("deafened" if after.deaf else "undeafened")
+        if not (joined or left or moved or moderation):
+            return
+
+        key = (member.guild.id, member.id)
+        burst = self._bursts.get(key)
+        if burst is None:
+            burst = self._bursts[key] = _VoiceBurst(member, time.monotonic())
+            burst.handle = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+            if before.channel is not None:
+                burst.hop(before.channel.name)
+        burst.member = member
+        if joined or moved:
+            burst.hop(after.channel.name)
+        elif left:
+            burst.hop("(left)")
+        for status in moderation:
+            if not burst.moderation or burst.moderation[-1] != status:
+                burst.moderation.append(status)
+        burst.events += 1
+        self.events += 1
+
+    def _render(self, burst):
+        member = burst.member
+        where = burst.path[-1] if burst.path and burst.path[-1] != "(left)" else "voice"
+        if burst.events == 1 and not burst.moderation:
+            if len(burst.path) == 1:
+                return (f"🔊 [VOICE JOIN] {member} joined {burst.path[0]}",
+                        "Voice Activity", f"Joined voice channel: {burst.path[0]}")
+            if burst.path[1] == "(left)":
+                return (f"🔇 [VOICE LEAVE] {member} left {burst.path[0]}",
+                        "Voice Activity", f"Left voice channel: {burst.path[0]}")
+            return (f"🔄 [VOICE MOVE] {member} moved from {burst.path[0]} to {burst.path[1]}",
+                    "Voice Activity", f"Moved from {burst.path[0]} to {burst.path[1]}")
+        if burst.events == 1 and len(burst.path) <= 1:
+            status = burst.moderation[0]
+            tag = "VOICE MUTE" if status.endswith("muted") else "VOICE DEAF"
+            return (f"🔇 [{tag}] {member} was {status} in {where}",
+                    "Voice Moderation", f"Was {status}")
+
+        elapsed = time.monotonic() - burst.started
+        parts = []
+        if len(burst.path) > 1:
+            path = " → ".join(burst.path)
+            if burst.hidden_hops:
+                path += f" → … (+{burst.hidden_hops})"
+            parts.append(path)
+        if burst.moderation:
+            parts.append(f"{', '.join(burst.moderation)} in {where}")
+        summary = "; ".join(parts)
+        return (f"🔄 [VOICE ACTIVITY] {member}: {summary} ({burst.events} events in {elapsed:.0f}s)",
+                "Voice Activity" if len(burst.path) > 1 else "Voice Moderation", summary)
+
+    def _flush(self, key):
+        burst = self._bursts.pop(key, None)
+        if burst is None or self._emit is None:
+            return
+        log_text, activity_type, global_text = self._render(burst)
+        self.lines += 1
+        return asyncio.create_task(self._emit(key[0], key[1], log_text, activity_type, global_text))
+
+    async def flush_all(self):
+        """Emit every pending burst now and wait for delivery to be queued (shutdown)"""
+        tasks = []
+        for key, burst in list(self._bursts.items()):
+            if burst.handle is not None:
+                burst.handle.cancel()
+            task = self._flush(key)
+            if task is not None:
+                tasks.append(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        return {
+            'pending': len(self._bursts),
+            'events': self.events,
+            'lines': self.lines,
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same coalescer
+voice_log = VoiceLogCoalescer()
@@ -5,6 +5,9 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict
 import asyncio
 
+from config_cache import server_cache
+from config_sync import stamp_update, apply_local_write
+from write_buffer import counter_buffer
 from brand_config import (
     BOT_FOOTER, BrandColors, VisualElements,
     create_success_embed, create_error_embed, create_info_embed,
@@ -15,6 +18,7 @@ bot = None
 db = None
 has_permission = None
 log_action = None
+log_embed = None
 
 voice_sessions: Dict[str, Dict[str, datetime]] = {}
 
@@ -60,30 +64,28 @@ def get_all_milestones_up_to(hours: float) -> list:
 async def is_voice_tracker_enabled(guild_id: str) -> bool:
     if db is None:
         return False
-    server_data = await db.servers.find_one({'guild_id': guild_id}) or {}
+    server_data = await server_cache.get(guild_id, partial_ok=True)
     return server_data.get('voice_tracker_enabled', False)
 
 async def get_voice_data(guild_id: str, user_id: str) -> dict:
     if db is None:
         return {'guild_id': guild_id, 'user_id': user_id, 'total_seconds': 0, 'last_milestone': 0}
     
-    data = await db.voice_tracker.find_one({'guild_id': guild_id, 'user_id': user_id})
+    query = {'guild_id': guild_id, 'user_id': user_id}
+    data = counter_buffer.overlay('voice_tracker', query, await db.voice_tracker.find_one(query))
     if not data:
         return {'guild_id': guild_id, 'user_id': user_id, 'total_seconds': 0, 'last_milestone': 0}
     return data
 
-async def update_voice_data(guild_id: str, user_id: str, total_seconds: int, last_milestone: int):
+async def update_voice_data(guild_id: str, user_id: str, elapsed_seconds: int, last_milestone: int = None):
+    """Queue elapsed voice time as a buffered $inc; milestones (rare) are written immediately"""
     if db is None:
         return
     
-    await db.voice_tracker.update_one(
-        {'guild_id': guild_id, 'user_id': user_id},
-        {'$set': {
-            'total_seconds': total_seconds,
-            'last_milestone': last_milestone
-        }},
-        upsert=True
-    )
+    query = {'guild_id': guild_id, 'user_id': user_id}
+    counter_buffer.add('voice_tracker', query, {'total_seconds': elapsed_seconds})
+    if last_milestone:
+        await db.voice_tracker.update_one(query, {'$max': {'last_milestone': last_milestone}}, upsert=True)
 
 def start_session(guild_id: str, user_id: str):
     key = f"{guild_id}_{user_id}"
@@ -102,8 +104,6 @@ def get_session_key(guild_id: str, user_id: str) -> str:
     return f"{guild_id}_{user_id}"
 
 async def send_milestone_message(guild: discord.Guild, member: discord.Member, milestone_hours: int):
-    server_data = await db.servers.find_one({'guild_id': str(guild.id)}) or {}
-    
     embed = discord.Embed(
         title="🎧 **VOICE MILESTONE UNLOCKED**",
         description=f"{VisualElements.CIRCUIT_LINE}",
@@ -137,17 +137,8 @@ async def send_milestone_message(guild: discord.Guild, member: discord.Member, m
     embed.set_thumbnail(url=member.display_avatar.url if member.display_avatar else None)
     embed.set_footer(text=f"⚡ RXT ENGINE • Voice Tracker", icon_url=bot.user.display_avatar.url)
     
-    log_channel_id = server_data.get('log_channel')
-    if log_channel_id:
-        channel = guild.get_channel(int(log_channel_id))
-        if channel:
-            try:
-                await channel.send(embed=embed)
-            except:
-                pass
-    
     try:
-        await log_action(guild.id, "voice", f"🎧 [MILESTONE] {member} reached **{milestone_hours}h** voice time!")
+        await log_embed(guild.id, "voice", embed, f"🎧 [MILESTONE] {member} reached **{milestone_hours}h** voice time!")
     except:
         pass
 
@@ -215,7 +206,7 @@ async def process_time_update(member: discord.Member, guild_id: str, user_id: st
         except Exception as e:
             print(f"Error sending milestone message: {e}")
     
-    await update_voice_data(guild_id, user_id, new_total, highest_milestone)
+    await update_voice_data(guild_id, user_id, elapsed_seconds, highest_milestone if highest_milestone > last_milestone else None)
 
 @app_commands.command(name="voicetracker", description="🎧 Enable or disable voice channel time tracking")
 @app_commands.describe(action="Turn voice tracking on or off")
@@ -245,9 +236,10 @@ async def voicetracker_cmd(interaction: discord.Interaction, action: str):
     
     await db.servers.update_one(
         {'guild_id': guild_id},
-        {'$set': {'voice_tracker_enabled': enabled}},
+        stamp_update({'$set': {'voice_tracker_enabled': enabled}}),
         upsert=True
     )
+    apply_local_write(guild_id, {'voice_tracker_enabled': enabled})
     
     if enabled:
         embed = discord.Embed(
@@ -354,6 +346,7 @@ async def voicetime_cmd(interaction: discord.Interaction, action: str = "me", us
     filled = int((progress_percent / 100) * progress_bar_length)
     progress_bar = "█" * filled + "░" * (progress_bar_length - filled)
     
+    await counter_buffer.flush()
     all_users_raw = await db.voice_tracker.find({'guild_id': guild_id}).to_list(None)
     ranked_users = []
     for u in all_users_raw:
@@ -421,6 +414,7 @@ async def voicetime_cmd(interaction: discord.Interaction, action: str = "me", us
 async def show_leaderboard(interaction: discord.Interaction):
     guild_id = str(interaction.guild.id)
     
+    await counter_buffer.flush()
     all_users_raw = await db.voice_tracker.find({'guild_id': guild_id}).to_list(None)
     
     if not all_users_raw:
@@ -494,8 +488,8 @@ async def show_leaderboard(interaction: discord.Interaction):
 
 _setup_done = False
 
-def setup(bot_instance, db_instance, has_permission_func, log_action_func):
-    global bot, db, has_permission, log_action, _setup_done
+def setup(bot_instance, db_instance, has_permission_func, log_action_func, log_embed_func):
+    global bot, db, has_permission, log_action, log_embed, _setup_done
     
     if _setup_done:
         return
@@ -504,6 +498,7 @@ def setup(bot_instance, db_instance, has_permission_func, log_action_func):
     db = db_instance
     has_permission = has_permission_func
     log_action = log_action_func
+    log_embed = log_embed_func
     
     existing_commands = [cmd.name for cmd in bot.tree.get_commands()]
     
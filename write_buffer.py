@@ -0,0 +1,243 @@
+"""Write-behind counter buffer for RXT ENGINE bot - coalesces high-frequency $inc updates into bulk writes"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+try:
+    from pymongo import UpdateOne
+    from pymongo.errors import BulkWriteError
+except ImportError:
+    UpdateOne = None
+    BulkWriteError = None
+
+COUNTER_FLUSH_MS = int(os.getenv('COUNTER_FLUSH_MS', '1000'))
+COUNTER_FLUSH_MAX_KEYS = int(os.getenv('COUNTER_FLUSH_MAX_KEYS', '500'))
+# An op the server keeps rejecting (e.g. duplicate key) is dropped after this many flushes
+COUNTER_MAX_FAILURES = 5
+# Documents whose acknowledged totals are kept in memory, and for how long before a re-read
+COUNTER_KNOWN_MAX = int(os.getenv('COUNTER_KNOWN_MAX', '10000'))
+COUNTER_KNOWN_TTL = float(os.getenv('COUNTER_KNOWN_TTL', '300'))
+
+
+def _key(collection, filter_doc):
+    return collection, tuple(sorted(filter_doc.items()))
+
+
+class CounterWriteBuffer:
+    """Accumulates $inc deltas per (collection, filter) and writes them with one bulk_write.
+
+    Deltas stay visible to readers (overlay/pending) until the write that carries them
+    has been acknowledged, so reads never go backwards while a flush is in flight.
+
+    Documents a caller has read once can be remembered: acknowledged deltas are applied
+    to the remembered copy, so hot paths (reaction karma) read it instead of the database.
+    """
+
+    def __init__(self, flush_ms=COUNTER_FLUSH_MS, max_keys=COUNTER_FLUSH_MAX_KEYS):
+        self.flush_interval = flush_ms / 1000
+        self.max_keys = max_keys
+        self._db = None
+        self._pending = {}
+        self._inflight = []
+        self._failures = {}  # key -> consecutive flushes its op was rejected
+        self._known = OrderedDict()  # key -> (read at, acknowledged document), least recent first
+        self.generation = 0  # Bumped on every acknowledged write (see remember)
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._wakeup = None
+        self._closing = False
+
+        self.flushes = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def start(self, db):
+        """Start the periodic flush task (idempotent)"""
+        self._db = db
+        if db is None:
+            return None
+        if self._task is not None and not self._task.done():
+            return self._task
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def add(self, collection, filter_doc, deltas):
+        """Queue $inc deltas for the document matched by filter_doc (upserted on flush)"""
+        key = _key(collection, filter_doc)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = dict(deltas)
+        else:
+            self.coalesced += 1
+            for field, amount in deltas.items():
+                pending[field] = pending.get(field, 0) + amount
+        if len(self._pending) >= self.max_keys and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending(self, collection, filter_doc):
+        """Return the deltas not yet acknowledged by the database for one document"""
+        key = _key(collection, filter_doc)
+        total = {}
+        for batch in self._inflight + [self._pending]:
+            for field, amount in batch.get(key, {}).items():
+                total[field] = total.get(field, 0) + amount
+        return total
+
+    def overlay(self, collection, filter_doc, document):
+        """Return document (or a fresh one built from filter_doc) with pending deltas applied"""
+        deltas = self.pending(collection, filter_doc)
+        if not deltas:
+            return document
+        document = dict(document) if document else dict(filter_doc)
+        for field, amount in deltas.items():
+            document[field] = document.get(field, 0) + amount
+        return document
+
+    def remember(self, collection, filter_doc, document, generation):
+        """Keep a freshly read document (None = not stored yet) as the acknowledged state.
+
+        generation is self.generation from before the read; if a write was acknowledged
+        meanwhile the read may or may not include it, so the document is not kept.
+        """
+        if generation != self.generation:
+            return
+        key = _key(collection, filter_doc)
+        self._known[key] = (time.monotonic(), dict(document) if document else dict(filter_doc))
+        self._known.move_to_end(key)
+        while len(self._known) > COUNTER_KNOWN_MAX:
+            self._known.popitem(last=False)
+
+    def known(self, collection, filter_doc):
+        """Remembered document with pending deltas applied, or None when it must be read"""
+        key = _key(collection, filter_doc)
+        entry = self._known.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > COUNTER_KNOWN_TTL:
+            del self._known[key]
+            return None
+        self._known.move_to_end(key)
+        return self.overlay(collection, filter_doc, entry[1])
+
+    def forget(self, collection, **match):
+        """Drop remembered documents of a collection (those whose filter has every match field)"""
+        for key in [k for k in self._known if k[0] == collection and all(item in k[1] for item in match.items())]:
+            del self._known[key]
+
+    def _acknowledge(self, key, deltas):
+        self.generation += 1
+        self._failures.pop(key, None)
+        entry = self._known.get(key)
+        if entry is not None:
+            document = entry[1]
+            for field, amount in deltas.items():
+                document[field] = document.get(field, 0) + amount
+
+    def _requeue(self, batch):
+        for key, deltas in batch.items():
+            merged = self._pending.setdefault(key, {})
+            for field, amount in deltas.items():
+                merged[field] = merged.get(field, 0) + amount
+
+    def _requeue_failed(self, keys, batch):
+        """Merge rejected ops back, dropping those that failed COUNTER_MAX_FAILURES times"""
+        for key in keys:
+            failures = self._failures.get(key, 0) + 1
+            if failures >= COUNTER_MAX_FAILURES:
+                self._failures.pop(key, None)
+                self.dropped += 1
+                print(f"⚠️ Counter buffer dropped {batch[key]} for {key[0]} {dict(key[1])} after {failures} rejected writes")
+            else:
+                self._failures[key] = failures
+                self._requeue({key: batch[key]})
+
+    async def flush(self):
+        """Write every queued delta now.
+
+        Ops the server applied are acknowledged; with a partial BulkWriteError only the
+        rejected ops are merged back. A failure with an unknown outcome (network) requeues
+        the collection's whole batch.
+        """
+        async with self._flush_lock:
+            if not self._pending or self._db is None:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._inflight.append(batch)
+            written = 0
+            try:
+                by_collection = {}
+                for key, deltas in batch.items():
+                    by_collection.setdefault(key[0], []).append(key)
+                for collection, keys in by_collection.items():
+                    operations = [UpdateOne(dict(key[1]), {'$inc': batch[key]}, upsert=True) for key in keys]
+                    failed = []
+                    try:
+                        await self._db[collection].bulk_write(operations, ordered=False)
+                    except Exception as e:
+                        if BulkWriteError is None or not isinstance(e, BulkWriteError):
+                            self.errors += 1
+                            print(f"⚠️ Counter buffer flush of {collection} failed, retrying later: {e}")
+                            self._requeue({key: batch.pop(key) for key in keys})
+                            continue
+                        # ordered=False: every op not listed in writeErrors was applied
+                        self.errors += 1
+                        failed_indexes = {error['index'] for error in e.details.get('writeErrors', ())}
+                        failed = [keys[index] for index in sorted(failed_indexes)]
+                        print(f"⚠️ Counter buffer: {len(failed)} of {len(keys)} {collection} write(s) rejected: "
+                              f"{e.details.get('writeErrors', [{}])[0].get('errmsg', e)}")
+                        self._requeue_failed(failed, batch)
+                    failed = set(failed)
+                    for key in keys:
+                        deltas = batch.pop(key)
+                        if key not in failed:
+                            # Acknowledged - stop overlaying the delta and fold it into the remembered copy
+                            self._acknowledge(key, deltas)
+                            written += 1
+                self.flushes += 1
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            finally:
+                self._inflight.remove(batch)
+                self.writes += written
+            return written
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def close(self):
+        """Stop the flush task and write everything still queued"""
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self):
+        """Return buffer counters"""
+        return {
+            'pending': len(self._pending),
+            'flushes': self.flushes,
+            'writes': self.writes,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'known': len(self._known),
+        }
+
+
+# Shared instance - lives in its own module so every importer of main sees the same buffer
+counter_buffer = CounterWriteBuffer()
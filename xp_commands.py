@@ -5,11 +5,30 @@ import time
 import random
 from main import bot
 from brand_config import create_permission_denied_embed, create_owner_only_embed,  BOT_FOOTER, BrandColors, create_success_embed, create_error_embed, create_info_embed, create_command_embed, create_warning_embed
-from main import db, has_permission, log_action, get_server_data, update_server_data
+from main import db, has_permission, log_action, get_server_data, update_server_data, get_server_config
+from write_buffer import counter_buffer
 
 # Karma cooldown tracking (user_id -> {target_user_id: last_time})
 karma_cooldowns = {}
 
+def karma_filter(guild_id, user_id):
+    return {'guild_id': str(guild_id), 'user_id': str(user_id)}
+
+async def get_karma_data(guild_id, user_id):
+    """Get a user's karma document with buffered (not yet written) changes applied.
+
+    The document is read once and then kept current by the counter buffer, so repeated
+    reactions to the same author do not cost a database read each.
+    """
+    query = karma_filter(guild_id, user_id)
+    known = counter_buffer.known('karma', query)
+    if known is not None:
+        return {**query, 'karma': 0, **known}
+    generation = counter_buffer.generation
+    user_data = await db.karma.find_one(query) if db is not None else None
+    counter_buffer.remember('karma', query, user_data, generation)
+    return counter_buffer.overlay('karma', query, user_data) or dict(query, karma=0)
+
 # Quantum system messages for level advancement
 KARMA_QUOTES = [
     "Quantum signature amplified — neural network recognizes your contribution ⚡",
@@ -151,20 +170,10 @@ async def give_karma(interaction: discord.Interaction, user: discord.Member, amo
         await interaction.response.send_message(embed=create_error_embed("Database not connected!"), ephemeral=True)
         return
 
-    # Get or create user karma data
-    user_data = await db.karma.find_one({'user_id': str(receiver_id), 'guild_id': str(interaction.guild.id)})
-    if not user_data:
-        user_data = {'user_id': str(receiver_id), 'guild_id': str(interaction.guild.id), 'karma': 0}
-
-    old_karma = user_data.get('karma', 0)
+    # Read current karma (including unflushed deltas) and queue the increment
+    old_karma = (await get_karma_data(interaction.guild.id, receiver_id)).get('karma', 0)
     new_karma = old_karma + karma_points
-    user_data['karma'] = new_karma
-
-    await db.karma.update_one(
-        {'user_id': str(receiver_id), 'guild_id': str(interaction.guild.id)},
-        {'$set': user_data},
-        upsert=True
-    )
+    counter_buffer.add('karma', karma_filter(interaction.guild.id, receiver_id), {'karma': karma_points})
 
     # Create response embed
     reason_text = f" for **{reason}**" if reason else ""
@@ -193,12 +202,11 @@ async def give_karma(interaction: discord.Interaction, user: discord.Member, amo
 @app_commands.describe(user="User to check karma for (optional)")
 async def check_karma(interaction: discord.Interaction, user: discord.Member = None):
     # Check if command is used in correct channel
-    server_data = await get_server_data(interaction.guild.id)
-    karma_channels = server_data.get('karma_channels', {})
-    karma_zone_channel_id = karma_channels.get('karma_zone_channel')
+    config = await get_server_config(interaction.guild.id)
+    karma_zone_channel_id = config.karma.karma_zone_channel_id
 
-    if karma_zone_channel_id and str(interaction.channel.id) != karma_zone_channel_id:
-        karma_zone_channel = bot.get_channel(int(karma_zone_channel_id))
+    if karma_zone_channel_id and interaction.channel.id != karma_zone_channel_id:
+        karma_zone_channel = bot.get_channel(karma_zone_channel_id)
         channel_mention = karma_zone_channel.mention if karma_zone_channel else "#karma-zone"
         await interaction.response.send_message(embed=create_error_embed(f"This command can only be used in {channel_mention}!"), ephemeral=True)
         return
@@ -209,14 +217,10 @@ async def check_karma(interaction: discord.Interaction, user: discord.Member = N
         await interaction.response.send_message(embed=create_error_embed("Database not connected!"), ephemeral=True)
         return
 
-    user_data = await db.karma.find_one({'user_id': str(target_user.id), 'guild_id': str(interaction.guild.id)})
-
-    if not user_data:
-        karma = 0
-    else:
-        karma = user_data.get('karma', 0)
+    karma = (await get_karma_data(interaction.guild.id, target_user.id)).get('karma', 0)
 
     # Get user rank
+    await counter_buffer.flush()
     users_sorted = await db.karma.find({'guild_id': str(interaction.guild.id)}).sort('karma', -1).to_list(None)
     rank = next((i + 1 for i, u in enumerate(users_sorted) if u['user_id'] == str(target_user.id)), len(users_sorted) + 1)
 
@@ -265,12 +269,11 @@ async def check_karma(interaction: discord.Interaction, user: discord.Member = N
 @bot.tree.command(name="mykarma", description="Check your own karma points quickly")
 async def my_karma(interaction: discord.Interaction):
     # Check if command is used in correct channel
-    server_data = await get_server_data(interaction.guild.id)
-    karma_channels = server_data.get('karma_channels', {})
-    karma_zone_channel_id = karma_channels.get('karma_zone_channel')
+    config = await get_server_config(interaction.guild.id)
+    karma_zone_channel_id = config.karma.karma_zone_channel_id
 
-    if karma_zone_channel_id and str(interaction.channel.id) != karma_zone_channel_id:
-        karma_zone_channel = bot.get_channel(int(karma_zone_channel_id))
+    if karma_zone_channel_id and interaction.channel.id != karma_zone_channel_id:
+        karma_zone_channel = bot.get_channel(karma_zone_channel_id)
         channel_mention = karma_zone_channel.mention if karma_zone_channel else "#karma-zone"
         await interaction.response.send_message(embed=create_error_embed(f"This command can only be used in {channel_mention}!"), ephemeral=True)
         return
@@ -281,14 +284,10 @@ async def my_karma(interaction: discord.Interaction):
         await interaction.response.send_message(embed=create_error_embed("Database not connected!"), ephemeral=True)
         return
 
-    user_data = await db.karma.find_one({'user_id': str(target_user.id), 'guild_id': str(interaction.guild.id)})
-
-    if not user_data:
-        karma = 0
-    else:
-        karma = user_data.get('karma', 0)
+    karma = (await get_karma_data(interaction.guild.id, target_user.id)).get('karma', 0)
 
     # Get user rank
+    await counter_buffer.flush()
     users_sorted = await db.karma.find({'guild_id': str(interaction.guild.id)}).sort('karma', -1).to_list(None)
     rank = next((i + 1 for i, u in enumerate(users_sorted) if u['user_id'] == str(target_user.id)), len(users_sorted) + 1)
 
@@ -337,12 +336,11 @@ async def my_karma(interaction: discord.Interaction):
 @bot.tree.command(name="karmaboard", description="Show server karma leaderboard with top 10 contributors")
 async def karma_leaderboard(interaction: discord.Interaction):
     # Check if command is used in correct channel
-    server_data = await get_server_data(interaction.guild.id)
-    karma_channels = server_data.get('karma_channels', {})
-    karma_zone_channel_id = karma_channels.get('karma_zone_channel')
+    config = await get_server_config(interaction.guild.id)
+    karma_zone_channel_id = config.karma.karma_zone_channel_id
 
-    if karma_zone_channel_id and str(interaction.channel.id) != karma_zone_channel_id:
-        karma_zone_channel = bot.get_channel(int(karma_zone_channel_id))
+    if karma_zone_channel_id and interaction.channel.id != karma_zone_channel_id:
+        karma_zone_channel = bot.get_channel(karma_zone_channel_id)
         channel_mention = karma_zone_channel.mention if karma_zone_channel else "#karma-zone"
         await interaction.response.send_message(embed=create_error_embed(f"This command can only be used in {channel_mention}!"), ephemeral=True)
         return
@@ -351,6 +349,7 @@ async def karma_leaderboard(interaction: discord.Interaction):
         await interaction.response.send_message(embed=create_error_embed("Database not connected!"), ephemeral=True)
         return
 
+    await counter_buffer.flush()
     users_sorted = await db.karma.find({'guild_id': str(interaction.guild.id)}).sort('karma', -1).limit(10).to_list(None)
 
     if not users_sorted:
@@ -420,7 +419,9 @@ async def reset_karma(interaction: discord.Interaction, scope: str, user: discor
             await interaction.response.send_message(embed=create_error_embed("Please specify a user to reset!"), ephemeral=True)
             return
 
+        await counter_buffer.flush()
         result = await db.karma.delete_one({'user_id': str(user.id), 'guild_id': str(interaction.guild.id)})
+        counter_buffer.forget('karma', **karma_filter(interaction.guild.id, user.id))
 
         if result.deleted_count > 0:
             embed = discord.Embed(
@@ -436,7 +437,9 @@ async def reset_karma(interaction: discord.Interaction, scope: str, user: discor
             )
 
     elif scope == "server":
+        await counter_buffer.flush()
         result = await db.karma.delete_many({'guild_id': str(interaction.guild.id)})
+        counter_buffer.forget('karma', guild_id=str(interaction.guild.id))
 
         embed = discord.Embed(
             title="⚡ **Server Karma Reset**",
@@ -451,12 +454,11 @@ async def reset_karma(interaction: discord.Interaction, scope: str, user: discor
 
 async def send_karma_levelup(guild, user, karma):
     """Send karma level-up announcement with animated GIF and motivational quotes"""
-    server_data = await get_server_data(guild.id)
-    karma_channels = server_data.get('karma_channels', {})
-    levelup_channel_id = karma_channels.get('levelup_channel')
+    config = await get_server_config(guild.id)
+    levelup_channel_id = config.karma.levelup_channel_id
 
     if levelup_channel_id:
-        levelup_channel = bot.get_channel(int(levelup_channel_id))
+        levelup_channel = bot.get_channel(levelup_channel_id)
         if levelup_channel:
             # Get random quote
             quote = random.choice(KARMA_QUOTES)
@@ -568,19 +570,10 @@ async def on_reaction_add(reaction, user):
     if db is None:
         return
 
-    user_data = await db.karma.find_one({'user_id': str(receiver_id), 'guild_id': str(reaction.message.guild.id)})
-    if not user_data:
-        user_data = {'user_id': str(receiver_id), 'guild_id': str(reaction.message.guild.id), 'karma': 0}
-
-    old_karma = user_data.get('karma', 0)
+    old_karma = (await get_karma_data(reaction.message.guild.id, receiver_id)).get('karma', 0)
     new_karma = max(0, old_karma + karma_change)  # Don't allow negative karma
-    user_data['karma'] = new_karma
-
-    await db.karma.update_one(
-        {'user_id': str(receiver_id), 'guild_id': str(reaction.message.guild.id)},
-        {'$set': user_data},
-        upsert=True
-    )
+    if new_karma != old_karma:
+        counter_buffer.add('karma', karma_filter(reaction.message.guild.id, receiver_id), {'karma': new_karma - old_karma})
 
     # Check for level up only on positive karma
     if karma_change > 0: